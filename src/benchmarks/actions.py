@@ -0,0 +1,88 @@
+"""
+Action scheduling benchmark.
+
+Scales the number of idle NPC behaviors, each waiting a random time between 1
+and 3 seconds before walking a bit, from 100 to 100,000, and reports the mean
+time of running the pending actions at each step: by polling all of them, as
+a list, versus with the `ActionScheduler`, which only calls the due ones, for
+behaviors made of action objects and of coroutine actions.
+
+    python -m benchmarks.actions
+"""
+import random
+import time
+
+from ucs.clock import clock_init
+from ucs.foundation import Action, ActionScheduler, coroutine_action
+from ucs.game.actions import SequenceAction, WaitAction
+from ucs.game.config import TIME_STEP
+
+COUNTS = (100, 1000, 10000, 100000)
+STEPS = 240
+
+
+class StepAction(Action):
+    """
+    Stand-in for a walk, taking a few steps.
+    """
+
+    def __init__(self, steps: int) -> None:
+        super().__init__()
+        self.steps = steps
+
+    def __call__(self) -> bool:
+        self.steps -= 1
+        return self.steps <= 0
+
+
+def make_actions(count: int):
+    return [
+        SequenceAction([WaitAction(random.uniform(1.0, 3.0)), StepAction(16)])
+        for _ in range(count)
+    ]
+
+
+@coroutine_action
+def wander(seconds: float):
+    yield WaitAction(seconds)
+    yield StepAction(16)
+
+
+def make_coroutines(count: int):
+    return [wander(random.uniform(1.0, 3.0)) for _ in range(count)]
+
+
+def run_polling(actions):
+    for action in actions:
+        action.finished = action()
+    return [action for action in actions if not action.finished]
+
+
+def main():
+    print(f'{"actions":>8} {"polling":>12} {"scheduler":>12} {"coroutines":>12}')
+    for count in COUNTS:
+        random.seed(count)
+        clock = clock_init()
+        actions = make_actions(count)
+        start = time.perf_counter()
+        for _ in range(STEPS):
+            actions = run_polling(actions)
+            clock.advance(TIME_STEP)
+        polling = (time.perf_counter() - start) / STEPS
+
+        timings = [polling]
+        for make in (make_actions, make_coroutines):
+            random.seed(count)
+            clock = clock_init()
+            scheduler = ActionScheduler(make(count))
+            start = time.perf_counter()
+            for _ in range(STEPS):
+                scheduler.run(clock.time)
+                clock.advance(TIME_STEP)
+            timings.append((time.perf_counter() - start) / STEPS)
+
+        print(f'{count:>8}', *(f'{t * 1000:9.3f} ms' for t in timings))
+
+
+if __name__ == '__main__':
+    main()
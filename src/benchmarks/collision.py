@@ -0,0 +1,105 @@
+"""
+Collision broad phase benchmark.
+
+Scales the number of colliders from 10 to 10,000, spread over an area growing
+with their count (so that the density stays the same), and reports the mean
+time of a `collision_update()` step for each collision mode, with a fraction
+of the actors moving between steps. Two densities are measured: one similar
+to an actual level and a crowded one, where most colliders overlap several
+others and the spatial hash cells fill up.
+
+    python -m benchmarks.collision
+"""
+import random
+import time
+
+from ucs.components.collision import (CollisionComponent, CollisionMode,
+                                      collision_init, collision_update)
+from ucs.components.soa import numpy
+from ucs.foundation import Actor
+
+COUNTS = (10, 100, 1000, 10000)
+STEPS = 20
+#: Area in pixels reserved for each collider, by scenario.
+SCENARIOS = {
+    'level': 48 * 48,
+    'crowd': 8 * 8,
+}
+#: Exhaustive checks get too slow past this count.
+REFERENCE_MAX_COUNT = 1000
+
+#: Collision system configurations to compare, as `collision_init()` args.
+MODES = {
+    'broad phase': {},
+}
+if numpy is not None:
+    MODES['soa'] = {'soa': True}
+    MODES['matrix'] = {'mode': CollisionMode.MATRIX}
+    MODES['soa matrix'] = {'soa': True, 'mode': CollisionMode.MATRIX}
+
+
+class Dummy(Actor):
+
+    def tick(self):
+        return None
+
+
+def reference_update(colliders):
+    for col in colliders:
+        col.contacts.clear()
+
+    for col in colliders:
+        x0, y0, s0 = col.actor.x, col.actor.y, col.size
+        for other in colliders:
+            if col is other:
+                continue
+            if col.actor.state is Actor.State.INACTIVE and other.actor.state is Actor.State.INACTIVE:
+                continue
+            x1, y1, s1 = other.actor.x, other.actor.y, other.size
+            if x0 < x1 + s1 and x0 + s0 > x1 and y0 < y1 + s1 and y0 + s0 > y1:
+                col.contacts.add(other.actor)
+
+
+def populate(count, area, rnd, **kwargs):
+    side = int((count * area) ** 0.5)
+    collision_init(**kwargs)
+    return [
+        CollisionComponent(Dummy(rnd.randrange(side), rnd.randrange(side)), rnd.choice((16, 30)))
+        for _ in range(count)
+    ]
+
+
+def run(update, colliders, rnd):
+    elapsed = 0.0
+    for _ in range(STEPS):
+        for col in rnd.sample(colliders, max(1, len(colliders) // 10)):
+            col.actor.x += rnd.randint(-1, 1)
+            col.actor.y += rnd.randint(-1, 1)
+
+        start = time.perf_counter()
+        update()
+        elapsed += time.perf_counter() - start
+    return elapsed / STEPS
+
+
+def main():
+    for scenario, area in SCENARIOS.items():
+        print(f'{scenario:>10}', *(f'{name:>14}' for name in MODES), f'{"exhaustive":>14}')
+        for count in COUNTS:
+            timings = []
+            for kwargs in MODES.values():
+                colliders = populate(count, area, random.Random(count), **kwargs)
+                timings.append(run(collision_update, colliders, random.Random(0)))
+
+            if count <= REFERENCE_MAX_COUNT:
+                colliders = populate(count, area, random.Random(count))
+                timings.append(run(lambda: reference_update(colliders), colliders, random.Random(0)))
+            else:
+                timings.append(None)
+
+            print(f'{count:>10}', *(f'{"-":>14}' if t is None else f'{t * 1000:11.3f} ms' for t in timings))
+        print()
+
+
+if __name__ == '__main__':
+    main()
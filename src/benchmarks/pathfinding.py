@@ -0,0 +1,63 @@
+"""
+Pathfinding benchmark.
+
+Scales the number of mobs chasing a target from 10 to 1,000, on a grid with
+random walls, and compares the time of one step of chasing: with one A*
+search per mob, versus one flow field update shared by all mobs and one
+lookup per mob. The target moves by one tile every step, invalidating both
+the cached paths and the field.
+
+    python -m benchmarks.pathfinding
+"""
+import random
+import time
+
+from ucs.pathfinding import DEFAULT_FIELD_RADIUS, FlowField, find_path
+from ucs.tilegrid import TileGrid
+
+COUNTS = (10, 100, 1000)
+STEPS = 10
+GRID_SIZE = 64
+#: Fraction of the tiles being walls.
+WALLS = 0.2
+
+
+def make_grid() -> TileGrid:
+    walkable = bytes(random.random() >= WALLS for _ in range(GRID_SIZE * GRID_SIZE))
+    return TileGrid(GRID_SIZE, GRID_SIZE, walkable)
+
+
+def main():
+    random.seed(0)
+    grid = make_grid()
+    center = GRID_SIZE // 2
+    radius = DEFAULT_FIELD_RADIUS // 2
+    targets = [(center + step % 2, center) for step in range(STEPS)]
+
+    print(f'{"mobs":>8} {"a*":>12} {"flow field":>12}')
+    for count in COUNTS:
+        # mobs within reach of the field
+        mobs = [
+            (center + random.randint(-radius, radius), center + random.randint(-radius, radius))
+            for _ in range(count)
+        ]
+
+        start = time.perf_counter()
+        for target in targets:
+            for mob in mobs:
+                find_path(grid, mob, target)
+        astar = (time.perf_counter() - start) / STEPS
+
+        field = FlowField(grid, DEFAULT_FIELD_RADIUS)
+        start = time.perf_counter()
+        for target in targets:
+            field.update(target)
+            for mob in mobs:
+                field.next_tile(*mob)
+        flow = (time.perf_counter() - start) / STEPS
+
+        print(f'{count:>8} {astar * 1000:9.3f} ms {flow * 1000:9.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Reactive props benchmark.
+
+Applies bursts of changes to the props of a reactive state, an `extend()`
+followed by several `append()` and value changes, observed by 1 to 1,000
+listeners, each with a handler observing all the props. Reports the handler
+invocations per burst and the mean time of a burst, with the changes
+notified right away and batched with `batch_changes()`.
+
+Then reports the mean time of spawning and collecting a listener with
+several reactions, as done by reactive NPC behaviors.
+
+    python -m benchmarks.reactivity
+"""
+import time
+
+from ucs.foundation import Reactive, ReactiveListener, batch_changes, react
+
+COUNTS = (1, 10, 100, 1000)
+BURSTS = 100
+APPENDS = 8
+
+
+class State(metaclass=Reactive):
+
+    hp: int = 0
+    score: int = 0
+    items: list[str]
+
+
+class Listener(metaclass=ReactiveListener):
+
+    calls = 0
+
+    @react(hp=State.hp, score=State.score, items=State.items)
+    def on_changed(self, hp, score, items):
+        Listener.calls += 1
+
+
+class Behavior(metaclass=ReactiveListener):
+
+    def __init__(self) -> None:
+        self.alive = True
+
+    @react(hp=State.hp)
+    def on_hp(self, hp):
+        self.alive = hp > 0
+
+    @react(score=State.score)
+    def on_score(self, score):
+        pass
+
+    @react(items=State.items, hp=State.hp)
+    def on_items(self, items, hp):
+        pass
+
+
+def burst(i: int):
+    State.items.extend(['sword', 'shield'])
+    for _ in range(APPENDS):
+        State.items.append('arrow')
+    State.hp.value = i
+    State.score.value = i
+    State.items.clear()
+
+
+def batched_burst(i: int):
+    with batch_changes():
+        burst(i)
+
+
+def main():
+    print(f'{"listeners":>10} {"calls":>8} {"immediate":>12} {"calls":>8} {"batched":>12}')
+    for count in COUNTS:
+        listeners = [Listener() for _ in range(count)]
+        row = []
+        for run in (burst, batched_burst):
+            Listener.calls = 0
+            start = time.perf_counter()
+            for i in range(1, BURSTS + 1):
+                run(i)
+            elapsed = (time.perf_counter() - start) / BURSTS
+            row.append(f'{Listener.calls // BURSTS:>8} {elapsed * 1000:9.3f} ms')
+
+        print(f'{count:>10}', *row)
+        del listeners
+
+    spawns = 10000
+    start = time.perf_counter()
+    behaviors = [Behavior() for _ in range(spawns)]
+    spawn = (time.perf_counter() - start) / spawns
+    start = time.perf_counter()
+    del behaviors
+    collect = (time.perf_counter() - start) / spawns
+    print(f'\nlistener spawn {spawn * 1e6:.2f} us, collection {collect * 1e6:.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Simulation step benchmark.
+
+Runs scripted scenes of 10 to 10,000 mobs on a generated map, chasing a
+player walking in circles driven by scripted input, or wandering around when
+out of reach, on the headless simulation driver and the null rendering
+backend. Reports the simulation steps run per second and the mean time per
+step spent in each system.
+
+    python -m benchmarks.simulation
+"""
+import math
+import pathlib
+import random
+import tempfile
+import time
+
+from ucs.clock import clock_init
+from ucs.components.collision import collision_init
+from ucs.components.movement import movement_init
+from ucs.components.sprite import sprite_init
+from ucs.components.walk import walk_init
+from ucs.foundation import Game
+from ucs.game.config import PLAYER_CONTROLS_MAP, TIME_STEP
+from ucs.game.consts import ActorTeamBit
+from ucs.game.entities import Player
+from ucs.game.entities.npc import NPC
+from ucs.game.tutorial import CAVE_BRUTE, CAVE_DUDE, MobNPCBehavior
+from ucs.gfx import gfx_init
+from ucs.gfx.backend import NullBackend
+from ucs.input import ScriptedInput, input_init
+from ucs.pathfinding import pathfinding_add_target, pathfinding_init
+from ucs.simulation import SYSTEMS, Simulation
+from ucs.tilemap import TileMap, tilemap_set_active
+
+COUNTS = (10, 100, 1000, 10000)
+STEPS = 240
+#: Tiles of floor for each mob.
+TILES_PER_MOB = 4
+TILE_SIZE = 16
+
+FLOOR = 1
+WALL = 2
+
+MAP_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.5" orientation="orthogonal" renderorder="right-down" width="{size}" height="{size}" tilewidth="{tile}" tileheight="{tile}" infinite="0" nextlayerid="3" nextobjectid="2">
+ <tileset firstgid="1" name="tiles" tilewidth="{tile}" tileheight="{tile}" tilecount="2" columns="2">
+  <image source="tiles.png" width="{tiles_width}" height="{tile}"/>
+  <tile id="{wall_id}" type="obstacle"/>
+ </tileset>
+ <layer id="1" name="ground" width="{size}" height="{size}">
+  <data encoding="csv">
+{data}
+  </data>
+ </layer>
+ <objectgroup id="2" name="meta">
+  <object id="1" name="entry" x="{tile}" y="{tile}">
+   <point/>
+  </object>
+ </objectgroup>
+</map>
+'''
+
+
+def write_map(directory: pathlib.Path, size: int) -> pathlib.Path:
+    # floor surrounded by walls
+    rows = []
+    for row in range(size):
+        border = row in (0, size - 1)
+        rows.append(','.join(
+            str(WALL if border or col in (0, size - 1) else FLOOR)
+            for col in range(size)))
+
+    path = directory.joinpath(f'map_{size}.tmx')
+    path.write_text(MAP_TEMPLATE.format(
+        size=size,
+        tile=TILE_SIZE,
+        tiles_width=TILE_SIZE * 2,
+        wall_id=WALL - 1,
+        data=',\n'.join(rows)))
+    return path
+
+
+def populate(directory: pathlib.Path, count: int) -> Simulation:
+    random.seed(count)
+    clock_init()
+    up, down, left, right, _, _ = PLAYER_CONTROLS_MAP[0]
+    input_init(ScriptedInput({0: {right}, 60: {down}, 120: {left}, 180: {up}}))
+    walk_init()
+    sprite_init()
+    movement_init()
+    collision_init()
+    pathfinding_init()
+
+    size = math.isqrt(count * TILES_PER_MOB) + 3
+    tilemap = TileMap(write_map(directory, size))
+    tilemap_set_active(tilemap)
+
+    game = Game()
+    player = Player(tilemap.entry, 0, CAVE_DUDE)
+    game.scene.append(player)
+    pathfinding_add_target(player)
+
+    # mobs on distinct floor tiles, away from the player
+    tiles = random.sample(range((size - 2) ** 2), count + 1)
+    for tile in tiles:
+        col = tile % (size - 2) + 1
+        row = tile // (size - 2) + 1
+        if (col, row) == (1, 1) or len(game.scene) > count:
+            continue
+        position = col * TILE_SIZE, row * TILE_SIZE
+        game.scene.append(NPC(position, CAVE_BRUTE, MobNPCBehavior, ActorTeamBit.ENEMY, ActorTeamBit.PLAYER))
+
+    return Simulation(game, TIME_STEP, profile=True)
+
+
+def main():
+    gfx_init('simulation', (800, 600), backend=NullBackend())
+
+    print(f'{"actors":>8} {"steps/s":>10}', *(f'{name:>12}' for name in SYSTEMS))
+    with tempfile.TemporaryDirectory() as directory:
+        for count in COUNTS:
+            simulation = populate(pathlib.Path(directory), count)
+            start = time.perf_counter()
+            simulation.run(STEPS)
+            elapsed = time.perf_counter() - start
+
+            timings = (simulation.timings[name] / STEPS * 1000 for name in SYSTEMS)
+            print(f'{count:>8} {STEPS / elapsed:10.1f}', *(f'{t:9.3f} ms' for t in timings))
+
+
+if __name__ == '__main__':
+    main()
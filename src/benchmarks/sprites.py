@@ -0,0 +1,96 @@
+"""
+Sprite submission benchmark.
+
+Builds and draws frames of 10 to 10,000 sprites on the recording backend,
+so that it runs without a window. One masked command per sprite is compared
+against the pooled sprite batches used by `sprite_update()`, both doing the
+same interpolation and culling, reporting per frame the uniform uploads, the
+memory blocks allocated while building the frame and the time spent building
+it. Time is measured in separate frames, without tracing allocations.
+
+    python -m benchmarks.sprites
+"""
+import random
+import time
+import tracemalloc
+
+from ucs import gfx
+from ucs.components import sprite
+from ucs.components.sprite import (SPRITE_ORDER, SpriteComponent, sprite_init,
+                                   sprite_update)
+from ucs.foundation import Actor
+from ucs.gfx.backend import Op, RecordingBackend
+
+COUNTS = (10, 100, 1000, 10000)
+FRAMES = 20
+#: Side of the world area the sprites are spread over, all in view.
+WORLD_SIZE = 1000
+FRAMES_SIZES = ((0, 0, 16, 16), (0, 0, 16, 14), (0, 0, 5, 10))
+
+
+class Dummy(Actor):
+
+    def tick(self):
+        return None
+
+
+def build_unbatched(ctx, alpha=1.0):
+    # one command per sprite, as done before batching, for the same work as
+    # sprite_update() otherwise
+    view_x0, view_y0, view_w, view_h = gfx.gfx_get_view_rect()
+    view_x1 = view_x0 + view_w
+    view_y1 = view_y0 + view_h
+    for comp in sprite._sprite_components:
+        actor = comp.actor
+        if actor.state is Actor.State.INACTIVE:
+            continue
+        off_x, off_y = comp.offset
+        prev_x, prev_y = comp.previous
+        x = prev_x + (actor.x - prev_x) * alpha + off_x
+        y = prev_y + (actor.y - prev_y) * alpha + off_y
+        frame = comp.frame
+        _, _, w, h = frame
+        if x >= view_x1 or x + w <= view_x0 or y >= view_y1 or y + h <= view_y0:
+            continue
+        ctx.append(gfx.DrawMaskedTextureRectCommand(SPRITE_ORDER + comp.layer, sprite._sheet, frame, (x, y)))
+
+
+def run(build, backend):
+    elapsed = 0.0
+    for _ in range(FRAMES):
+        with gfx.gfx_frame() as ctx:
+            start = time.perf_counter()
+            build(ctx)
+            elapsed += time.perf_counter() - start
+
+    backend.reset()
+    blocks = 0
+    for _ in range(FRAMES):
+        with gfx.gfx_frame() as ctx:
+            tracemalloc.start()
+            build(ctx)
+            blocks += sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+            tracemalloc.stop()
+
+    return backend.count(Op.UNIFORM) / FRAMES, blocks / FRAMES, elapsed / FRAMES
+
+
+def main():
+    backend = RecordingBackend()
+    gfx.gfx_init('sprites', (WORLD_SIZE, WORLD_SIZE), backend=backend)
+
+    print(f'{"sprites":>8} {"path":>10} {"uploads":>10} {"blocks":>10} {"time":>12}')
+    for count in COUNTS:
+        rnd = random.Random(count)
+        sprite_init()
+        for _ in range(count):
+            actor = Dummy(rnd.randrange(WORLD_SIZE - 16), rnd.randrange(WORLD_SIZE - 16))
+            SpriteComponent(actor, rnd.choice(FRAMES_SIZES), layer=rnd.randrange(2))
+
+        for name, build in (('commands', build_unbatched), ('batches', sprite_update)):
+            uploads, blocks, elapsed = run(build, backend)
+            print(f'{count:>8} {name:>10} {uploads:>10.0f} {blocks:>10.0f} {elapsed * 1000:9.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
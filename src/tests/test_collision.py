@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from ucs.components import collision
+from ucs.components.collision import (CollisionComponent, CollisionMode,
+                                      collision_init, collision_update)
+from ucs.foundation import Actor
+
+
+class Dummy(Actor):
+
+    def tick(self):
+        return None
+
+
+@pytest.fixture(
+    params=[
+        {},
+        {'soa': True},
+        {'mode': CollisionMode.MATRIX},
+        {'soa': True, 'mode': CollisionMode.MATRIX},
+    ],
+    ids=['objects', 'soa', 'matrix', 'soa-matrix'])
+def config(request, monkeypatch):
+    if request.param:
+        pytest.importorskip('numpy')
+    # split the overlap mask in several blocks, even for few colliders
+    monkeypatch.setattr(collision, 'MATRIX_BLOCK_SIZE', 1000)
+    return request.param
+
+
+def reference_contacts(colliders):
+    """
+    Exhaustive O(n²) check, pairing every collider with every other one.
+    """
+    result = {col: set() for col in colliders}
+    for col in colliders:
+        x0, y0, s0 = col.actor.x, col.actor.y, col.size
+        for other in colliders:
+            if col is other:
+                continue
+            if col.actor.state is Actor.State.INACTIVE and other.actor.state is Actor.State.INACTIVE:
+                continue
+            x1, y1, s1 = other.actor.x, other.actor.y, other.size
+            if x0 < x1 + s1 and x0 + s0 > x1 and y0 < y1 + s1 and y0 + s0 > y1:
+                result[col].add(other.actor)
+    return result
+
+
+def test_overlap(config):
+    collision_init(**config)
+    a = CollisionComponent(Dummy(0, 0), 16)
+    b = CollisionComponent(Dummy(15, 15), 16)
+    c = CollisionComponent(Dummy(16, 0), 16)
+
+    collision_update()
+    assert a.contacts == {b.actor}
+    assert b.contacts == {a.actor, c.actor}
+    assert c.contacts == {b.actor}
+
+    # moving across cell boundaries re-indexes the collider
+    c.actor.x = 100
+    collision_update()
+    assert a.contacts == {b.actor}
+    assert b.contacts == {a.actor}
+    assert c.contacts == set()
+
+    b.destroy()
+    assert b.size == 16
+    collision_update()
+    assert a.contacts == set()
+
+
+def test_contact_events(config):
+    collision_init(**config)
+    a = CollisionComponent(Dummy(0, 0), 16)
+    b = CollisionComponent(Dummy(100, 0), 16)
+
+    collision_update()
+    assert (a.entered, a.stayed, a.exited) == ([], [], [])
+
+    b.actor.x = 10
+    collision_update()
+    assert (a.entered, a.stayed, a.exited) == ([b.actor], [], [])
+    assert (b.entered, b.stayed, b.exited) == ([a.actor], [], [])
+
+    collision_update()
+    assert (a.entered, a.stayed, a.exited) == ([], [b.actor], [])
+
+    # contacts with inactive actors are kept, unless both are inactive
+    a.actor.state = Actor.State.INACTIVE
+    collision_update()
+    assert a.stayed == [b.actor]
+
+    b.actor.state = Actor.State.INACTIVE
+    collision_update()
+    assert (a.entered, a.stayed, a.exited) == ([], [], [b.actor])
+    assert (b.entered, b.stayed, b.exited) == ([], [], [a.actor])
+
+
+def test_matches_exhaustive_check(config):
+    rnd = random.Random(1234)
+    collision_init(**config)
+    colliders = [
+        CollisionComponent(Dummy(rnd.randrange(-64, 256), rnd.randrange(-64, 256)), rnd.choice((0, 5, 16, 30)))
+        for _ in range(200)
+    ]
+
+    for _ in range(20):
+        previous = {col: set(col.contacts) for col in colliders}
+        for col in colliders:
+            col.actor.x += rnd.randint(-3, 3)
+            col.actor.y += rnd.randint(-3, 3)
+            if rnd.random() < 0.05:
+                col.actor.state = Actor.State(1 - col.actor.state)
+
+        collision_update()
+        expected = reference_contacts(colliders)
+        for col in colliders:
+            assert col.contacts == expected[col]
+            assert set(col.entered) == expected[col] - previous[col]
+            assert set(col.stayed) == expected[col] & previous[col]
+            assert set(col.exited) == previous[col] - expected[col]
+            # in a stable order, unlike sets
+            assert col.entered == sorted(col.entered, key=lambda actor: actor.serial)
+            assert col.exited == sorted(col.exited, key=lambda actor: actor.serial)
@@ -0,0 +1,78 @@
+from ucs.gfx import (DrawCommand, DrawTextureRectCommand, RenderContext,
+                     StageID, get_camera, gfx_frame, gfx_get_sprite_batch,
+                     gfx_get_view_rect, gfx_init, gfx_load_texture)
+from ucs.gfx.backend import Op, RecordingBackend
+
+
+class Command(DrawCommand):
+
+    def __init__(self, stage: StageID, order: int) -> None:
+        self.stage = stage
+        self.order = order
+
+    def draw(self):
+        pass
+
+
+def test_render_context_order():
+    ctx = RenderContext()
+    ui = Command(StageID.UI, 0)
+    sprites = [Command(StageID.MASKED, order) for order in (3, 1, 2)]
+    ctx.append(ui)
+    ctx.extend(sprites)
+
+    # consecutive sorted runs are merged
+    tiles = [Command(StageID.DEFAULT, order) for order in range(10)]
+    ctx.extend_sorted(tiles[:4])
+    ctx.extend_sorted(tiles[4:])
+    assert len(ctx.buckets[StageID.DEFAULT].runs) == 1
+
+    # while the ones going back are kept apart and merged when drawing
+    overlay = [Command(StageID.DEFAULT, order) for order in (2, 5)]
+    ctx.extend_sorted(overlay)
+    assert len(ctx.buckets[StageID.DEFAULT].runs) == 2
+
+    assert len(ctx) == 16
+    assert list(ctx) == [
+        *tiles[:3], overlay[0], *tiles[3:6], overlay[1], *tiles[6:],
+        sprites[1], sprites[2], sprites[0],
+        ui,
+    ]
+
+
+def test_recording_backend():
+    backend = RecordingBackend()
+    gfx_init('test', (100, 100), backend=backend)
+    texture = gfx_load_texture('sheet.png')
+
+    with gfx_frame() as ctx:
+        for x in range(3):
+            gfx_get_sprite_batch(ctx, 0).add(texture, (0, 0, 16, 16), (x, 0))
+        gfx_get_sprite_batch(ctx, 0).add(texture, (16, 16, 16, 16), (3, 0))
+        ctx.append(DrawTextureRectCommand(0, texture, (16, 0, 8, 8), (1, 2)))
+
+    assert backend.frames == 1
+    assert list(backend.stages) == [StageID.DEFAULT, StageID.MASKED]
+    assert backend.count(Op.DRAW_TEXTURE) == 5
+    # tilemap and tile sizes on entering the masked stage, then the sprite
+    # size once for the whole batch, also for different frames of that size
+    assert backend.count(Op.UNIFORM) == 3
+    assert list(backend.draws[:RecordingBackend.DRAW_STRIDE]) == [texture.id, 16, 0, 8, 8, 1, 2]
+
+    backend.reset()
+    with gfx_frame() as ctx:
+        pass
+    assert list(backend.ops) == [Op.BEGIN_DRAWING, Op.END_DRAWING]
+
+
+def test_view_rect():
+    gfx_init('test', (800, 600), 2.0, backend=RecordingBackend())
+    camera = get_camera()
+    camera.offset = (400, 300)
+    camera.target = (1000, 500)
+    # the target is at the offset on screen, and the view is scaled down
+    assert gfx_get_view_rect() == (800, 350, 400, 300)
+
+    camera.zoom = 0.5
+    camera.offset = (0, 0)
+    assert gfx_get_view_rect() == (1000, 500, 1600, 1200)
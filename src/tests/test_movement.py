@@ -0,0 +1,87 @@
+import pytest
+
+from ucs.components.movement import (MovementComponent, movement_init,
+                                     movement_update)
+from ucs.foundation import Actor
+from ucs.tilegrid import TileGrid
+
+TILE = 16
+
+# 4x4 grid, with walls on the right and at the bottom
+WALKABLE = bytes([
+    1, 1, 1, 0,
+    1, 1, 1, 0,
+    1, 1, 1, 0,
+    0, 0, 0, 0,
+])
+
+
+class GridMap:
+    """
+    Tilemap over a grid, at the origin.
+    """
+
+    x = 0
+    y = 0
+    tile_width = TILE
+    tile_height = TILE
+
+    def __init__(self, grid: TileGrid) -> None:
+        self.grid = grid
+
+
+class Mover(Actor):
+
+    def tick(self):
+        return None
+
+
+@pytest.fixture(params=[False, True], ids=['objects', 'soa'])
+def tilemap(request):
+    if request.param:
+        pytest.importorskip('numpy')
+    movement_init(soa=request.param)
+    return GridMap(TileGrid(4, 4, WALKABLE))
+
+
+def make_mover(x, y, vel_x, vel_y):
+    actor = Mover(x, y)
+    mov = MovementComponent(actor, (0, 0, TILE, TILE))
+    mov.vel_x = vel_x
+    mov.vel_y = vel_y
+    return actor
+
+
+def test_free_movement(tilemap):
+    actor = make_mover(0, 0, 3, 5)
+    movement_update(tilemap)
+    assert actor.position == (3, 5)
+
+
+def test_stop_against_walls(tilemap):
+    # moving by more than a tile still stops at the first wall
+    right = make_mover(10, 0, 40, 0)
+    down = make_mover(0, 10, 0, 40)
+    left = make_mover(10, 0, -20, 0)
+    movement_update(tilemap)
+    assert right.position == (2 * TILE, 0)
+    assert down.position == (0, 2 * TILE)
+    assert left.position == (0, 0)
+
+
+def test_slide_along_walls(tilemap):
+    # blocked on the X axis, still moving on the Y axis and vice versa
+    actor = make_mover(2 * TILE, 0, 4, 4)
+    movement_update(tilemap)
+    assert actor.position == (2 * TILE, 4)
+
+    actor.x, actor.y = 4, 2 * TILE
+    movement_update(tilemap)
+    assert actor.position == (8, 2 * TILE)
+
+
+def test_inactive_actors(tilemap):
+    actor = make_mover(0, 0, 3, 5)
+    actor.state = Actor.State.INACTIVE
+    movement_update(tilemap)
+    assert actor.position == (0, 0)
@@ -0,0 +1,131 @@
+import pytest
+
+from ucs.foundation import Actor, Scene
+from ucs.pathfinding import (UNREACHED, FlowField, find_path,
+                             pathfinding_add_target, pathfinding_find_path,
+                             pathfinding_get_distance,
+                             pathfinding_get_next_tile, pathfinding_init,
+                             pathfinding_update)
+from ucs.tilegrid import TileGrid
+
+# 5x4 grid, with a wall open at the bottom
+WALKABLE = bytes([
+    1, 1, 0, 1, 1,
+    1, 1, 0, 1, 1,
+    1, 1, 0, 1, 1,
+    1, 1, 1, 1, 1,
+])
+
+
+class GridMap:
+    """
+    Tilemap of 1x1 pixel tiles over a grid.
+    """
+
+    def __init__(self, grid: TileGrid) -> None:
+        self.grid = grid
+
+    def pixels_to_coords(self, position):
+        return int(position[0]), int(position[1])
+
+
+class Target(Actor):
+
+    def tick(self):
+        return None
+
+
+def test_find_path():
+    grid = TileGrid(5, 4, WALKABLE)
+    path = find_path(grid, (0, 0), (4, 0))
+    assert path[-1] == (4, 0)
+    assert (2, 3) in path
+    assert len(path) == 10
+
+    # occupants don't block paths, walls do
+    grid.set_occupant_at(2, 3, object())
+    assert len(find_path(grid, (0, 0), (4, 0))) == 10
+    grid.set_walkable_at(2, 3, False)
+    assert find_path(grid, (0, 0), (4, 0)) is None
+    assert find_path(grid, (0, 0), (2, 0)) is None
+
+
+def test_flow_field():
+    grid = TileGrid(5, 4, WALKABLE)
+    field = FlowField(grid, radius=9)
+    field.update((4, 0))
+    assert field.distance_at(4, 0) == 0
+    assert field.distance_at(1, 0) == 9
+    assert field.distance_at(0, 0) == UNREACHED
+    assert field.next_tile(1, 1) == (1, 2)
+    assert field.next_tile(4, 0) is None
+
+    # occupied tiles are skipped, and so is the occupied target tile
+    grid.set_occupant_at(1, 2, object())
+    assert field.next_tile(1, 1) is None
+    grid.set_occupant_at(4, 0, object())
+    assert field.next_tile(3, 0) is None
+
+
+def test_flow_field_invalidation():
+    grid = TileGrid(5, 4, WALKABLE)
+    field = FlowField(grid, radius=2)
+    field.update((4, 0))
+    distances = field.distances
+
+    # changes out of reach don't trigger a recomputation
+    field.distances = None
+    grid.set_walkable_at(0, 3, False)
+    field.update((4, 0))
+    assert field.distances is None
+
+    # changes within reach do
+    field.distances = distances
+    grid.set_walkable_at(4, 1, False)
+    field.update((4, 0))
+    assert field.distance_at(4, 1) == UNREACHED
+    assert field.distance_at(3, 1) == 2
+
+    # and so do target moves
+    field.update((3, 3))
+    assert field.distance_at(4, 0) == UNREACHED
+    assert field.distance_at(2, 3) == 1
+
+
+def test_pathfinding_system():
+    pathfinding_init(field_radius=8)
+    with pytest.raises(RuntimeError):
+        pathfinding_find_path((0, 0), (4, 0))
+
+    grid = TileGrid(5, 4, WALKABLE)
+    tilemap = GridMap(grid)
+    target = Target(4, 0)
+    scene = Scene([target])
+    pathfinding_add_target(target)
+    pathfinding_update(tilemap)
+
+    assert pathfinding_get_next_tile(3, 3) == ((4, 3), target)
+    assert pathfinding_get_next_tile(0, 0) is None
+    assert pathfinding_get_distance(3, 3) == 4
+    assert pathfinding_get_distance(0, 0) == UNREACHED
+
+    # tiles within reach still have a distance when the way is blocked
+    grid.set_occupant_at(4, 3, object())
+    grid.set_occupant_at(3, 2, object())
+    assert pathfinding_get_next_tile(3, 3) is None
+    assert pathfinding_get_distance(3, 3) == 4
+    grid.set_occupant_at(4, 3, None)
+    grid.set_occupant_at(3, 2, None)
+
+    # cached paths are dropped on walkability changes
+    path = pathfinding_find_path((0, 0), (4, 0))
+    assert pathfinding_find_path((0, 0), (4, 0)) is path
+    grid.set_walkable_at(2, 3, False)
+    pathfinding_update(tilemap)
+    assert pathfinding_find_path((0, 0), (4, 0)) is None
+
+    # targets are dropped once out of their scene
+    target.state = Actor.State.INACTIVE
+    list(scene.tick())
+    pathfinding_update(tilemap)
+    assert pathfinding_get_next_tile(3, 3) is None
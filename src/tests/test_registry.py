@@ -0,0 +1,37 @@
+import pytest
+
+from ucs.components.registry import Registry
+
+
+def test_add_remove():
+    registry = Registry()
+    handles = [registry.add(name) for name in 'abcd']
+    assert list(registry) == ['a', 'b', 'c', 'd']
+
+    # removal moves the last component in place of the removed one
+    assert registry.remove(handles[1]) == 'b'
+    assert list(registry) == ['a', 'd', 'c']
+    assert registry.get(handles[3]) == 'd'
+    assert registry.index(handles[3]) == 1
+
+    assert registry.remove(handles[2]) == 'c'
+    assert registry.remove(handles[0]) == 'a'
+    assert list(registry) == ['d']
+    assert len(registry) == 1
+
+
+def test_stale_handles():
+    registry = Registry()
+    handle = registry.add('a')
+    registry.remove(handle)
+    assert not registry.is_alive(handle)
+
+    # the slot is reused, but the old handle still doesn't resolve
+    new_handle = registry.add('b')
+    assert new_handle.slot == handle.slot
+    assert registry.is_alive(new_handle)
+    with pytest.raises(ValueError):
+        registry.get(handle)
+    with pytest.raises(ValueError):
+        registry.remove(handle)
+    assert list(registry) == ['b']
@@ -0,0 +1,70 @@
+from ucs.foundation import Actor, Scene
+
+
+class Dummy(Actor):
+
+    def tick(self):
+        return None
+
+
+class Hero(Dummy):
+    team_bit = 1
+    enemy_mask = 4
+
+
+class Mob(Dummy):
+    team_bit = 4
+    enemy_mask = 1
+
+
+def test_indexes():
+    hero = Hero(0, 0, 'hero')
+    mobs = [Mob(10 * i, 0) for i in range(1, 4)]
+    scene = Scene([hero])
+    scene.extend(mobs)
+
+    assert set(scene.of_type(Mob)) == set(mobs)
+    assert set(scene.of_type(Dummy)) == {hero, *mobs}
+    assert not scene.of_type(Scene)
+    assert scene.find('hero') is hero
+    assert list(scene.enemies_of(mobs[0])) == [hero]
+    assert list(scene.enemies_within(hero, 20)) == mobs[:2]
+
+    # removals are reflected by the indexes, whichever the way
+    scene.remove(mobs[0])
+    del scene[-1]
+    assert list(scene.of_type(Mob)) == [mobs[1]]
+    assert mobs[0].scene is None and mobs[2].scene is None
+    mobs[1].state = Actor.State.INACTIVE
+    list(scene.tick())
+    assert not scene.of_type(Mob)
+    assert not list(scene.enemies_of(hero))
+
+    scene.clear()
+    assert scene.find('hero') is None
+    assert hero.scene is None
+
+
+def test_duplicate_names():
+    first = Dummy(0, 0, 'guard')
+    second = Dummy(0, 0, 'guard')
+    scene = Scene([first, second])
+    assert scene.find('guard') is first
+
+    # actors sharing a name stay indexed until all of them are removed
+    scene.remove(first)
+    assert scene.find('guard') is second
+    scene.append(first)
+    scene.remove(second)
+    assert scene.find('guard') is first
+    scene.remove(first)
+    assert scene.find('guard') is None
+
+
+def test_multiple_teams():
+    both = Dummy(0, 0)
+    both.team_bit = 1 | 2
+    scene = Scene([both, Hero(0, 0)])
+    # actors in several teams are yielded once
+    assert len(list(scene.in_teams(1 | 2))) == 2
+    assert list(scene.in_teams(2)) == [both]
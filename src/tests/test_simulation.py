@@ -0,0 +1,319 @@
+import pathlib
+
+import pytest
+
+from ucs.clock import clock_init
+from ucs.components.collision import collision_init
+from ucs.components.movement import movement_init
+from ucs.components.sprite import (SpriteComponent, sprite_init,
+                                   sprite_store_positions, sprite_update)
+from ucs.components.walk import WalkComponent, WalkDirection, walk_init
+from ucs.foundation import (Action, ActionScheduler, Actor, CoroutineAction,
+                            Game, WaitCondition, coroutine_action)
+from ucs.game.actions import WaitAction, walker_arrived
+from ucs.game.config import PLAYER_CONTROLS_MAP
+from ucs.game.entities import Player
+from ucs.game.entities.npc import NPC, NPCBehavior
+from ucs.gfx import (get_camera, gfx_frame, gfx_get_backend, gfx_init,
+                     gfx_store_camera)
+from ucs.gfx.backend import NullBackend, Op, RecordingBackend
+from ucs.input import ScriptedInput, input_init
+from ucs.pathfinding import pathfinding_init
+from ucs.simulation import Simulation, StepScheduler
+from ucs.tilemap import TileMap, tilemap_get_active, tilemap_set_active
+
+MAP = pathlib.Path(__file__).parents[2].joinpath('assets', 'test_indoor.tmx')
+UP, DOWN, LEFT, RIGHT, PRIMARY, SECONDARY = PLAYER_CONTROLS_MAP[0]
+
+
+@pytest.fixture
+def game():
+    gfx_init('test', (800, 600), backend=NullBackend())
+    clock_init()
+    walk_init()
+    sprite_init()
+    movement_init()
+    collision_init()
+    pathfinding_init()
+    tilemap_set_active(TileMap(MAP, use_cache=False))
+    return Game()
+
+
+def test_scripted_input():
+    source = ScriptedInput({0: {UP}, 2: {UP, PRIMARY}, 3: ()})
+    input_init(source)
+
+    states = []
+    for _ in range(5):
+        source.update()
+        states.append((source.is_key_down(UP), source.is_key_pressed(PRIMARY), source.get_key_pressed()))
+
+    assert states == [
+        (True, False, UP),
+        (True, False, 0),
+        (True, True, PRIMARY),
+        (False, False, 0),
+        (False, False, 0),
+    ]
+
+
+def test_wait_action(game):
+    input_init(ScriptedInput())
+    wait = WaitAction(0.5)
+    game.actions.append(wait)
+
+    simulation = Simulation(game, 0.1)
+    simulation.run(5)
+    assert game.actions == [wait]
+    simulation.run(1)
+    assert game.actions == []
+
+
+def test_sleeping_actions():
+    calls = []
+
+    class Sleeper(Action):
+
+        def __init__(self, wake_at):
+            super().__init__()
+            self.wake_at = wake_at
+
+        def __call__(self):
+            calls.append(self)
+            return calls.count(self) == 2
+
+    early, late = Sleeper(1.0), Sleeper(2.0)
+    scheduler = ActionScheduler([late, early])
+    scheduler.run(0.0)
+    assert calls == [late, early]
+    assert list(scheduler) == [early, late]
+
+    # sleeping actions aren't called until due
+    scheduler.run(0.5)
+    assert len(calls) == 2
+    scheduler.run(1.0)
+    assert calls[2:] == [early]
+    scheduler.run(3.0)
+    assert calls[3:] == [late]
+    assert len(scheduler) == 0
+
+
+def test_coroutine_actions(game):
+    input_init(ScriptedInput())
+    flag = []
+    steps = []
+
+    @coroutine_action
+    def generator():
+        yield WaitAction(0.5)
+        steps.append('waited')
+        yield lambda: bool(flag)
+        steps.append('flagged')
+
+    async def coroutine():
+        await WaitAction(0.2)
+        steps.append('awaited')
+        await WaitCondition(lambda: len(flag) > 1)
+
+    simulation = Simulation(game, 0.1)
+    game.actions.extend([generator(), CoroutineAction(coroutine())])
+    simulation.run(1)
+    # both actions sleep as long as their wait
+    assert len(game.actions.sleeping) == 2
+    simulation.run(5)
+    assert steps == ['awaited', 'waited']
+
+    flag.append(True)
+    simulation.run(1)
+    assert steps == ['awaited', 'waited', 'flagged']
+    assert len(game.actions) == 1
+    flag.append(True)
+    simulation.run(1)
+    assert len(game.actions) == 0
+
+
+def test_walker_arrived(game):
+    input_init(ScriptedInput())
+    tilemap = tilemap_get_active()
+    x, y = tilemap.entry
+
+    class Walker(Actor):
+
+        def __init__(self, x, y):
+            super().__init__(x, y)
+            self.walker = WalkComponent(self, 2)
+
+        def tick(self):
+            return None
+
+    actor = Walker(x, y)
+    game.scene.append(actor)
+    arrivals = []
+
+    @coroutine_action
+    def step_east():
+        actor.walker.direction = WalkDirection.EAST
+        yield None
+        actor.walker.direction = WalkDirection.STOP
+        yield walker_arrived(actor.walker)
+        arrivals.append(actor.position)
+
+    game.actions.append(step_east())
+    simulation = Simulation(game, 1 / 60)
+    simulation.run(2)
+    assert arrivals == []
+    simulation.run(60)
+    assert arrivals == [(x + tilemap.tile_width, y)]
+    assert len(game.actions) == 0
+
+
+def test_deterministic_runs(game):
+    entry = tilemap_get_active().entry
+    positions = []
+    for _ in range(2):
+        input_init(ScriptedInput({0: {RIGHT}, 40: {DOWN}, 80: ()}))
+        clock_init()
+        walk_init()
+        collision_init()
+        tilemap_set_active(TileMap(MAP, use_cache=False))
+        game.scene.clear()
+        game.actions.clear()
+        player = Player(entry, 0, (0, 0, 16, 16))
+        game.scene.append(player)
+
+        simulation = Simulation(game, 1 / 60, profile=True)
+        simulation.run(120)
+        positions.append(player.position)
+        assert simulation.steps == 120
+        assert simulation.timings['walk'] > 0
+
+    assert positions[0] == positions[1]
+    assert positions[0] != entry
+
+
+def test_npc_sight(game):
+    input_init(ScriptedInput())
+    x, y = tilemap_get_active().entry
+
+    class Watcher(NPCBehavior):
+
+        def __init__(self, npc):
+            super().__init__(npc)
+            self.sights = []
+
+        def on_sight(self, seen):
+            self.sights.append(seen)
+
+        def on_idle(self):
+            return WaitAction(1.0)
+
+    npc = NPC((x, y), (0, 0, 16, 16), Watcher)
+    game.scene.append(npc)
+    simulation = Simulation(game, 0.1)
+    simulation.run(2)
+
+    # actors coming into sight while busy are reacted to once idle
+    player = Player((x + 4, y), 0, (0, 0, 16, 16))
+    game.scene.append(player)
+    simulation.run(2)
+    assert npc.behavior.sights == []
+    simulation.run(10)
+    assert npc.behavior.sights == [player]
+
+    # and only once
+    player.x += 100
+    simulation.run(2)
+    player.x -= 100
+    simulation.run(20)
+    assert npc.behavior.sights == [player]
+
+
+def test_step_scheduler():
+    scheduler = StepScheduler(0.1, 3)
+    assert scheduler.advance(0.05) == 0
+    assert scheduler.alpha == pytest.approx(0.5)
+    assert scheduler.advance(0.1) == 1
+    assert scheduler.alpha == pytest.approx(0.5)
+
+    # a long frame runs at most the maximum number of steps, keeping the
+    # fraction of step left over
+    assert scheduler.advance(1.02) == 3
+    assert scheduler.alpha == pytest.approx(0.7)
+    assert scheduler.advance(0.0) == 0
+
+
+@pytest.mark.parametrize('soa', [False, True], ids=['objects', 'soa'])
+def test_sprite_interpolation(soa):
+    if soa:
+        pytest.importorskip('numpy')
+    gfx_init('test', (800, 600), backend=RecordingBackend())
+    sprite_init(soa=soa)
+    player = Player((100, 100), 0, (0, 0, 16, 16))
+    get_camera().target = player.position
+
+    sprite_store_positions()
+    gfx_store_camera()
+    player.x += 10
+    get_camera().target = player.position
+
+    backend = gfx_get_backend()
+    with gfx_frame(0.25) as ctx:
+        sprite_update(ctx, 0.25)
+        assert get_camera().target == (102.5, 100)
+
+    x, y = backend.draws[5:7]
+    assert (x, y) == (102.5, 100)
+    assert get_camera().target == (110, 100)
+
+
+@pytest.mark.parametrize('soa', [False, True], ids=['objects', 'soa'])
+def test_frameless_sprites(soa):
+    if soa:
+        pytest.importorskip('numpy')
+    gfx_init('test', (800, 600), backend=RecordingBackend())
+    sprite_init(soa=soa)
+
+    class Prop(Actor):
+
+        def tick(self):
+            return None
+
+    # sprites without a frame are skipped
+    SpriteComponent(Prop(100, 100))
+    SpriteComponent(Prop(100, 100), (0, 0, 16, 16))
+    get_camera().target = (100, 100)
+    sprite_store_positions()
+
+    backend = gfx_get_backend()
+    with gfx_frame() as ctx:
+        sprite_update(ctx)
+    assert backend.count(Op.DRAW_TEXTURE) == 1
+
+
+@pytest.mark.parametrize('soa', [False, True], ids=['objects', 'soa'])
+def test_sprite_culling(soa):
+    if soa:
+        pytest.importorskip('numpy')
+    backend = RecordingBackend()
+    gfx_init('test', (200, 100), backend=backend)
+    sprite_init(soa=soa)
+
+    class Prop(Actor):
+
+        def tick(self):
+            return None
+
+    # view of (100, 100, 200, 100); sprites overlapping it by a pixel are
+    # still drawn
+    get_camera().target = (100, 100)
+    inside = [(100, 100), (85, 185), (299, 150)]
+    outside = [(84, 150), (300, 150), (150, 84), (150, 200), (0, 0)]
+    for position in inside + outside:
+        SpriteComponent(Prop(*position), (0, 0, 16, 16))
+    sprite_store_positions()
+
+    with gfx_frame() as ctx:
+        sprite_update(ctx)
+    stride = RecordingBackend.DRAW_STRIDE
+    drawn = {tuple(backend.draws[i + 5:i + 7]) for i in range(0, len(backend.draws), stride)}
+    assert drawn == set(inside)
@@ -1,4 +1,6 @@
-from ucs.foundation import Reactive, ReactiveListener, react
+from ucs.foundation import (ListChange, ListDelta, ListProp, Reactive,
+                            ReactiveListener, batch_changes, computed, react,
+                            react_deltas)
 
 
 def test_basic_types_reactivity():
@@ -96,3 +98,303 @@ def test_list_reactivity():
 
     del listener
     assert not State.items.on_changed.subscribers
+
+
+def test_batched_changes():
+    class State(metaclass=Reactive):
+
+        hp: int = 50
+        score: int = 0
+        items: list[str]
+
+    class Listener(metaclass=ReactiveListener):
+
+        def __init__(self):
+            self.calls = []
+
+        @react(hp=State.hp, score=State.score)
+        def on_stats(self, hp, score):
+            self.calls.append((hp, score))
+            # changes made by handlers are flushed in turn
+            if score == 100 and 'trophy' not in State.items:
+                State.items.append('trophy')
+
+        @react(items=State.items)
+        def on_items(self, items):
+            self.calls.append(list(items))
+
+    listener = Listener()
+    with batch_changes():
+        State.hp.value = 40
+        State.score.value = 10
+        State.items.extend(['sword', 'shield'])
+        with batch_changes():
+            State.items.append('bow')
+        State.hp.value = 30
+        assert listener.calls == []
+
+    # each handler runs once, with the final values
+    assert listener.calls == [(30, 10), ['sword', 'shield', 'bow']]
+
+    listener.calls.clear()
+    with batch_changes():
+        State.score.value = 100
+    assert listener.calls == [(30, 100), ['sword', 'shield', 'bow', 'trophy']]
+
+    # outside of batches, changes are notified right away
+    listener.calls.clear()
+    State.hp.value = 20
+    assert listener.calls == [(20, 100)]
+
+    del listener
+    assert not State.items.on_changed.subscribers
+
+
+def test_computed_props():
+    evaluations = []
+
+    class State(metaclass=Reactive):
+
+        score: int = 0
+        bonus: int = 0
+        items: list[str]
+
+        @computed
+        def total(cls):
+            evaluations.append('total')
+            return cls.score.value + cls.bonus.value
+
+        @computed
+        def progress(cls):
+            evaluations.append('progress')
+            return min(cls.total.value / 50.0, 1.0)
+
+        @computed
+        def armed(cls):
+            return 'sword' in cls.items.value
+
+    # evaluation is lazy and memoized
+    assert evaluations == []
+    assert State.progress.value == 0.0
+    assert State.progress.value == 0.0
+    assert evaluations == ['progress', 'total']
+
+    # dependencies are tracked, also through other computed props
+    evaluations.clear()
+    State.score.value = 25
+    assert evaluations == []
+    assert State.progress.value == 0.5
+    assert evaluations == ['progress', 'total']
+
+    class Listener(metaclass=ReactiveListener):
+
+        def __init__(self):
+            self.calls = []
+
+        @react(progress=State.progress, armed=State.armed)
+        def check(self, progress, armed):
+            self.calls.append((progress, armed))
+
+    listener = Listener()
+    State.items.append('sword')
+    assert listener.calls == [(0.5, True)]
+
+    # within a batch, intermediate values aren't computed, and handlers run
+    # only if the result changed
+    listener.calls.clear()
+    evaluations.clear()
+    with batch_changes():
+        State.score.value = 40
+        State.bonus.value = 20
+        State.score.value = 30
+    assert listener.calls == [(1.0, True)]
+    assert evaluations == ['progress', 'total']
+
+    listener.calls.clear()
+    with batch_changes():
+        State.bonus.value = 30
+    assert listener.calls == []
+
+    del listener
+
+
+def test_computed_props_within_batch():
+
+    class State(metaclass=Reactive):
+
+        a: int = 0
+
+        @computed
+        def double(cls):
+            return cls.a.value * 2
+
+        @computed
+        def quadruple(cls):
+            return cls.double.value * 2
+
+    class Listener(metaclass=ReactiveListener):
+
+        def __init__(self):
+            self.calls = []
+
+        @react(quadruple=State.quadruple)
+        def check(self, quadruple):
+            self.calls.append(quadruple)
+
+    listener = Listener()
+    assert State.double.value == 0
+
+    # reads within a batch see the changes, handlers run at its end
+    with batch_changes():
+        State.a.value = 5
+        assert State.double.value == 10
+        assert State.quadruple.value == 20
+        assert listener.calls == []
+        State.a.value = 6
+        assert State.quadruple.value == 24
+    assert listener.calls == [24]
+
+    # and only if the result changed since the batch started
+    listener.calls.clear()
+    with batch_changes():
+        State.a.value = 7
+        assert State.double.value == 14
+        State.a.value = 6
+    assert listener.calls == []
+
+    del listener
+
+
+def test_computed_props_diamond():
+
+    class State(metaclass=Reactive):
+
+        a: int = 0
+
+        @computed
+        def double(cls):
+            return cls.a.value * 2
+
+        @computed
+        def total(cls):
+            return cls.a.value + (cls.double.value if cls.a.value > 0 else 0)
+
+    class Listener(metaclass=ReactiveListener):
+
+        def __init__(self):
+            self.calls = []
+
+        @react(total=State.total)
+        def check(self, total):
+            self.calls.append(total)
+
+    # dependents are all marked stale before any is evaluated, so handlers
+    # never see intermediate results
+    listener = Listener()
+    State.a.value = 2
+    assert listener.calls == [6]
+    State.a.value = 3
+    assert listener.calls == [6, 9]
+
+    del listener
+
+
+def test_listener_inheritance():
+    class State(metaclass=Reactive):
+
+        hp: int = 50
+
+    class Listener(metaclass=ReactiveListener):
+
+        def __init__(self):
+            self.calls = []
+
+        @react(hp=State.hp)
+        def on_hp(self, hp):
+            self.calls.append(hp)
+
+    class Derived(Listener):
+
+        def __init__(self):
+            super().__init__()
+
+    # inherited reactions are subscribed once
+    derived = Derived()
+    assert len(State.hp.on_changed.subscribers) == 1
+    State.hp.value = 10
+    assert derived.calls == [10]
+
+    del derived
+    assert not State.hp.on_changed.subscribers
+
+
+def test_list_deltas():
+    items = ListProp()
+    deltas = []
+    items.on_delta += deltas.append
+
+    items.extend(['a', 'b', 'c'])
+    items.append('d')
+    items.insert(-1, 'x')
+    items[0] = 'z'
+    items.remove('b')
+    assert items.pop() == 'd'
+    assert items.pop(0) == 'z'
+    del items[-1]
+    items.sort(reverse=True)
+    items.clear()
+    assert deltas == [
+        ListDelta(ListChange.INSERT, 0, ('a', 'b', 'c')),
+        ListDelta(ListChange.INSERT, 3, ('d',)),
+        ListDelta(ListChange.INSERT, 3, ('x',)),
+        ListDelta(ListChange.SET, 0, ('z',), ('a',)),
+        ListDelta(ListChange.REMOVE, 1, ('b',)),
+        ListDelta(ListChange.REMOVE, 3, ('d',)),
+        ListDelta(ListChange.REMOVE, 0, ('z',)),
+        ListDelta(ListChange.REMOVE, 1, ('x',)),
+        ListDelta(ListChange.REORDER, 0),
+        ListDelta(ListChange.CLEAR, 0, ('c',)),
+    ]
+
+
+def test_delta_reactions():
+    class State(metaclass=Reactive):
+
+        pickups: list[str]
+
+    class Inventory(metaclass=ReactiveListener):
+
+        def __init__(self):
+            self.counts = {}
+            self.changes = 0
+
+        @react_deltas(State.pickups)
+        def on_pickups_delta(self, delta):
+            # keep an incremental count of the pickups
+            for item in delta.old_items if delta.change is ListChange.SET else ():
+                self.counts[item] -= 1
+            sign = -1 if delta.change in (ListChange.REMOVE, ListChange.CLEAR) else 1
+            for item in delta.items:
+                self.counts[item] = self.counts.get(item, 0) + sign
+
+        @react(pickups=State.pickups)
+        def on_pickups(self, pickups):
+            self.changes += 1
+
+    inventory = Inventory()
+    State.pickups.extend(['sword', 'arrow', 'arrow'])
+    State.pickups[0] = 'arrow'
+    State.pickups.remove('arrow')
+    assert inventory.counts == {'sword': 0, 'arrow': 2}
+    assert inventory.changes == 3
+
+    # deltas aren't batched
+    with batch_changes():
+        State.pickups.append('shield')
+        State.pickups.clear()
+        assert inventory.counts == {'sword': 0, 'arrow': 0, 'shield': 0}
+    assert inventory.changes == 4
+
+    del inventory
+    assert not State.pickups.on_delta.subscribers
+    assert not State.pickups.on_changed.subscribers
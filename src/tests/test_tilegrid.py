@@ -0,0 +1,72 @@
+import pytest
+
+from ucs.tilegrid import TileGrid
+
+# 4x3 grid, with a wall in the middle column
+WALKABLE = bytes([
+    1, 0, 1, 1,
+    1, 0, 1, 1,
+    1, 1, 1, 1,
+])
+
+
+def test_occupants():
+    grid = TileGrid(4, 3, WALKABLE)
+    a, b = object(), object()
+
+    # an occupant can hold several tiles
+    grid.set_occupant_at(0, 0, a)
+    grid.set_occupant_at(0, 1, a)
+    grid.set_occupant_at(3, 2, b)
+    assert grid.get_occupant_at(0, 1) is a
+    assert not grid.is_walkable_at(0, 0)
+    assert grid.is_walkable_at(2, 0)
+    assert not grid.is_walkable_at(1, 0)
+    assert grid.get_occupant_at(-1, 0) is None
+
+    # ids are reused once no tile references their occupant
+    grid.set_occupant_at(0, 0, None)
+    assert len(grid.occupants) == 2
+    grid.set_occupant_at(0, 1, None)
+    c = object()
+    grid.set_occupant_at(2, 2, c)
+    assert len(grid.occupants) == 2
+    assert grid.occupants_at((0, 2, 3, 4), (1, 2, 2, 0)) == [None, c, b, None]
+
+
+def test_batch_queries():
+    grid = TileGrid(4, 3, WALKABLE)
+    grid.set_occupant_at(2, 1, object())
+
+    cols = [0, 1, 2, 3, 4, -1]
+    rows = [0, 0, 1, 1, 0, 2]
+    expected = [True, False, False, True, False, False]
+    assert grid.are_walkable_at(cols, rows) == expected
+
+    numpy = pytest.importorskip('numpy')
+    result = grid.are_walkable_at(numpy.array(cols), numpy.array(rows))
+    assert result.tolist() == expected
+
+
+def test_area_walkable():
+    grid = TileGrid(4, 3, WALKABLE)
+    assert grid.is_area_walkable(2, 0, 3, 2)
+    assert grid.is_area_walkable(0, 2, 3, 2)
+    assert not grid.is_area_walkable(0, 0, 2, 0)
+    assert not grid.is_area_walkable(3, 0, 4, 0)
+
+
+def test_areas_walkable():
+    grid = TileGrid(4, 3, WALKABLE)
+    areas = [(2, 0, 3, 2), (0, 2, 3, 2), (0, 0, 2, 0), (3, 0, 4, 0), (0, 0, 0, 2)]
+    expected = [True, True, False, False, True]
+    assert grid.are_areas_walkable(*zip(*areas)) == expected
+
+    numpy = pytest.importorskip('numpy')
+    result = grid.are_areas_walkable(*(numpy.array(values) for values in zip(*areas)))
+    assert result.tolist() == expected
+
+    # walkability changes are taken into account
+    grid.set_walkable_at(0, 1, False)
+    result = grid.are_areas_walkable(*(numpy.array(values) for values in zip(*areas)))
+    assert result.tolist() == expected[:-1] + [False]
@@ -0,0 +1,163 @@
+import pathlib
+import random
+import shutil
+
+import pytest
+
+from ucs import tilemap as tilemap_module
+from ucs.gfx import RenderContext, get_camera, gfx_get_view_rect, gfx_init
+from ucs.gfx.backend import NullBackend, RecordingBackend
+from ucs.mapcache import TILE_STRIDE, pack_bits, unpack_bits
+from ucs.tilemap import CHUNK_SIZE, TileMap
+
+ASSETS = pathlib.Path(__file__).parents[2].joinpath('assets')
+
+
+@pytest.fixture
+def map_path(tmp_path):
+    gfx_init('test', (800, 600), backend=NullBackend())
+    for name in ('test_indoor.tmx', 'roguelike.tsx'):
+        shutil.copy(ASSETS.joinpath(name), tmp_path)
+    return tmp_path.joinpath('test_indoor.tmx')
+
+
+def test_pack_bits():
+    values = bytes([1, 0, 0, 1, 1, 1, 0, 1, 1, 0, 1])
+    bits = pack_bits(values)
+    assert bits == bytes([0b10111001, 0b101])
+    assert unpack_bits(bits, len(values)) == values
+
+
+def test_cached_load(map_path, monkeypatch):
+    parsed = TileMap(map_path, use_cache=False)
+    assert not map_path.parent.joinpath('__mapcache__').exists()
+
+    first = TileMap(map_path)
+    cache_files = list(map_path.parent.joinpath('__mapcache__').iterdir())
+    assert len(cache_files) == 1
+
+    # later loads don't parse the map
+    def parse(filename):
+        raise AssertionError('map parsed again')
+
+    monkeypatch.setattr(tilemap_module, '_parse_map', parse)
+    cached = TileMap(map_path)
+
+    for tilemap in (first, cached):
+        assert (tilemap.width, tilemap.height) == (parsed.width, parsed.height)
+        assert (tilemap.tile_width, tilemap.tile_height) == (parsed.tile_width, parsed.tile_height)
+        assert tilemap.entry == parsed.entry
+        assert tilemap.grid.walkable == parsed.grid.walkable
+        assert list(tilemap.tiles) == list(parsed.tiles)
+    assert 0 in cached.grid.walkable
+
+
+def test_cache_invalidation(map_path):
+    TileMap(map_path)
+    cache_dir = map_path.parent.joinpath('__mapcache__')
+    old_files = set(cache_dir.iterdir())
+
+    # changing the tileset content changes the cache file
+    tileset = map_path.parent.joinpath('roguelike.tsx')
+    tileset.write_text(tileset.read_text().replace('type="obstacle"', ''))
+    tilemap = TileMap(map_path)
+
+    new_files = set(cache_dir.iterdir())
+    assert len(new_files) == 1
+    assert not new_files & old_files
+    assert 0 not in tilemap.grid.walkable
+
+
+def test_parse_without_numpy(map_path, monkeypatch):
+    pytest.importorskip('numpy')
+    vectorized = tilemap_module._parse_map(map_path)
+    monkeypatch.setattr(tilemap_module, 'numpy', None)
+    fallback = tilemap_module._parse_map(map_path)
+
+    assert bytes(vectorized.walkable) == bytes(fallback.walkable)
+    assert bytes(vectorized.mask) == bytes(fallback.mask)
+    assert vectorized.tiles == fallback.tiles
+    assert 0 in vectorized.mask and 0 in vectorized.walkable
+
+
+def test_view_culling():
+    gfx_init('test', (320, 240), backend=RecordingBackend())
+    tilemap = TileMap(ASSETS.joinpath('test_indoor.tmx'), use_cache=False)
+    tile_width, tile_height = tilemap.tile_width, tilemap.tile_height
+    chunk_width = tile_width * CHUNK_SIZE
+    tile_count = len(tilemap.tiles) // TILE_STRIDE
+    rnd = random.Random(1234)
+    camera = get_camera()
+    culled = 0
+
+    for _ in range(20):
+        camera.zoom = rnd.choice((0.5, 1.0, 2.0, 3.0))
+        camera.target = (
+            rnd.uniform(-100, tilemap.width * tile_width + 100),
+            rnd.uniform(-100, tilemap.height * tile_height + 100))
+        view_x, view_y, view_w, view_h = gfx_get_view_rect()
+
+        ctx = RenderContext()
+        tilemap.draw(ctx)
+        commands = list(ctx)
+        orders = [cmd.order for cmd in commands]
+        assert orders == sorted(orders)
+        drawn = set(map(id, commands))
+        assert len(drawn) == len(commands) <= tile_count
+        culled += tile_count - len(commands)
+        for cmd in commands:
+            x, y = cmd.position
+            # emitted tiles are in the visible rows and chunk columns
+            assert y + tile_height >= view_y and y <= view_y + view_h
+            chunk_x = x - x % chunk_width
+            assert chunk_x + chunk_width >= view_x and chunk_x <= view_x + view_w
+
+        # and no visible tile is left out
+        for chunk in tilemap.chunks:
+            for row in chunk:
+                for cmd in row:
+                    x, y = cmd.position
+                    if (x < view_x + view_w and x + tile_width > view_x and
+                            y < view_y + view_h and y + tile_height > view_y):
+                        assert id(cmd) in drawn
+
+    assert culled > 0
+
+
+def test_bake():
+    gfx_init('test', (800, 600), backend=NullBackend())
+    tilemap = TileMap(ASSETS.joinpath('test_indoor.tmx'), use_cache=False)
+    tiles = tilemap.tiles
+
+    def baked():
+        commands = {}
+        for index, chunk in enumerate(tilemap.chunks):
+            assert len(chunk) == CHUNK_SIZE
+            for chunk_row, row in enumerate(chunk):
+                orders = [cmd.order for cmd in row]
+                assert orders == sorted(orders)
+                for cmd in row:
+                    commands[id(cmd)] = index, chunk_row, cmd
+        return list(commands.values())
+
+    # every tile record ends up in its chunk and row, once
+    commands = baked()
+    assert len(commands) == len(tiles) // TILE_STRIDE
+    expected = sorted(
+        (tiles[i + 6] * tilemap.width + tiles[i + 5], tuple(tiles[i + 1:i + 5]), (tiles[i + 5], tiles[i + 6]))
+        for i in range(0, len(tiles), TILE_STRIDE))
+    found = []
+    for index, chunk_row, cmd in commands:
+        col = cmd.position[0] // tilemap.tile_width
+        row = cmd.position[1] // tilemap.tile_height
+        assert index == (row // CHUNK_SIZE) * tilemap.chunks_width + col // CHUNK_SIZE
+        assert chunk_row == row % CHUNK_SIZE
+        found.append((cmd.order, cmd.rect, (col, row)))
+    assert sorted(found) == expected
+
+    # baking again after moving the map moves the commands
+    positions = sorted(cmd.position for _, _, cmd in commands)
+    tilemap.x, tilemap.y = 40, -24
+    tilemap.bake()
+    moved = sorted(cmd.position for _, _, cmd in baked())
+    assert moved == [(x + 40, y - 24) for x, y in positions]
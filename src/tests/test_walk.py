@@ -0,0 +1,108 @@
+import pathlib
+
+import pytest
+
+from ucs.components import walk
+from ucs.components.walk import WalkComponent, WalkDirection, walk_init, walk_update
+from ucs.foundation import Actor
+from ucs.gfx import gfx_init
+from ucs.gfx.backend import NullBackend
+from ucs.tilemap import TileMap
+
+MAP = pathlib.Path(__file__).parents[2].joinpath('assets', 'test_indoor.tmx')
+
+
+class Walker(Actor):
+
+    def tick(self):
+        return None
+
+
+@pytest.fixture(params=[False, True], ids=['objects', 'soa'])
+def tilemap(request):
+    if request.param:
+        pytest.importorskip('numpy')
+    gfx_init('test', (800, 600), backend=NullBackend())
+    walk_init(soa=request.param)
+    return TileMap(MAP, use_cache=False)
+
+
+def test_occupancy(tilemap):
+    x, y = tilemap.entry
+    col, row = tilemap.pixels_to_coords((x, y))
+    actor = Walker(x, y)
+    walker = WalkComponent(actor, 4)
+
+    # new walkers occupy their tile, then stand still for free
+    walk_update(tilemap)
+    assert tilemap.get_occupant_at(col, row) is actor
+    assert walker not in walk._moving
+
+    # walking reserves the destination tile and frees the current one
+    walker.direction = WalkDirection.EAST
+    walk_update(tilemap)
+    assert walker.dst == (col + 1, row)
+    assert tilemap.get_occupant_at(col + 1, row) is actor
+    assert tilemap.get_occupant_at(col, row) is None
+
+    # the tile the walker stopped at stays occupied
+    walker.direction = WalkDirection.STOP
+    while walker.dst is not None:
+        walk_update(tilemap)
+    assert actor.position == (x + tilemap.tile_width, y)
+    assert tilemap.get_occupant_at(col + 1, row) is actor
+    assert walker not in walk._moving
+
+    walker.destroy()
+    walk_update(tilemap)
+    assert tilemap.get_occupant_at(col + 1, row) is None
+
+
+def test_inactive_walkers_resume(tilemap):
+    x, y = tilemap.entry
+    actor = Walker(x, y)
+    walker = WalkComponent(actor, 4)
+    walk_update(tilemap)
+
+    # inactive walkers don't move, but walk once active again
+    actor.state = Actor.State.INACTIVE
+    walker.direction = WalkDirection.EAST
+    walk_update(tilemap)
+    walk_update(tilemap)
+    assert actor.position == (x, y)
+
+    actor.state = Actor.State.ACTIVE
+    walk_update(tilemap)
+    assert actor.position != (x, y)
+
+    # walkers deactivated mid-walk finish it once active again
+    walker.direction = WalkDirection.STOP
+    actor.state = Actor.State.INACTIVE
+    walk_update(tilemap)
+    assert walker in walk._moving
+    actor.state = Actor.State.ACTIVE
+    while walker.dst is not None:
+        walk_update(tilemap)
+    assert actor.position == (x + tilemap.tile_width, y)
+    assert walker not in walk._moving
+
+
+def test_destroyed_walkers_stay_asleep(tilemap):
+    x, y = tilemap.entry
+    col, row = tilemap.pixels_to_coords((x, y))
+    actor = Walker(x, y)
+    walker = WalkComponent(actor, 4)
+    walker.direction = WalkDirection.EAST
+    walk_update(tilemap)
+    assert tilemap.get_occupant_at(col + 1, row) is actor
+
+    # pending actions may still set the direction of destroyed walkers
+    actor.state = Actor.State.INACTIVE
+    walker.destroy()
+    walker.direction = WalkDirection.EAST
+    for _ in range(5):
+        walk_update(tilemap)
+    assert walker not in walk._moving
+    assert walker.tile is None
+    assert tilemap.get_occupant_at(col, row) is None
+    assert tilemap.get_occupant_at(col + 1, row) is None
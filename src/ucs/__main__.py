@@ -1,12 +1,18 @@
-from raylibpy.spartan import close_window, get_time, window_should_close
-
-from ucs.components.collision import collision_init, collision_update
-from ucs.components.movement import movement_init, movement_update
-from ucs.components.sprite import sprite_init, sprite_update
-from ucs.components.walk import walk_init, walk_update
-from ucs.game.config import TIME_STEP
+from time import perf_counter
+
+from ucs.clock import clock_init
+from ucs.components.collision import collision_init
+from ucs.components.movement import movement_init
+from ucs.components.sprite import (sprite_init, sprite_store_positions,
+                                   sprite_update)
+from ucs.components.walk import walk_init
+from ucs.game.config import MAX_STEPS_PER_FRAME, TIME_STEP, USE_SOA
 from ucs.game.tutorial import Tutorial
-from ucs.gfx import get_camera, gfx_frame, gfx_init
+from ucs.gfx import (get_camera, gfx_close, gfx_frame, gfx_init,
+                     gfx_store_camera, gfx_window_should_close)
+from ucs.input import input_init, input_poll
+from ucs.pathfinding import pathfinding_init
+from ucs.simulation import Simulation, StepScheduler
 from ucs.tilemap import tilemap_get_active
 from ucs.ui import ui_get_instance, ui_init
 
@@ -17,53 +23,48 @@ DRAW_SCALE = 2.0
 
 if __name__ == '__main__':
     gfx_init("Cave dudes", (SCREEN_WIDTH, SCREEN_HEIGHT), DRAW_SCALE)
+    input_init()
+    clock_init()
     ui_init(SCREEN_WIDTH, SCREEN_HEIGHT)
-    walk_init()
-    sprite_init()
-    movement_init()
-    collision_init()
+    walk_init(soa=USE_SOA)
+    sprite_init(soa=USE_SOA)
+    movement_init(soa=USE_SOA)
+    collision_init(soa=USE_SOA)
+    pathfinding_init()
 
     camera = get_camera()
     camera.offset = (SCREEN_WIDTH / 2 - 8, SCREEN_HEIGHT / 2 - 8)
 
-    # time vars
-    time_acc = 0
-    last_update = get_time()
-
     ui = ui_get_instance()
 
     game = Tutorial()
     game.enter()
 
+    simulation = Simulation(game, TIME_STEP, ui)
+    scheduler = StepScheduler(TIME_STEP, MAX_STEPS_PER_FRAME)
+    last_update = perf_counter()
+
     # main loop
-    while not window_should_close():
-        now = get_time()
-        time_acc += now - last_update
+    while not gfx_window_should_close():
+        now = perf_counter()
+        steps = scheduler.advance(now - last_update)
         last_update = now
 
-        # fixed-frame time step
-        while time_acc >= TIME_STEP:
-            time_acc -= TIME_STEP
-
-            # update the UI
-            pause = ui.update()
-
-            # tick actors and update components if not in pause
-            if not pause:
-                collision_update()
-                movement_update(tilemap_get_active())
-                walk_update(tilemap_get_active())
+        input_poll()
 
-                game.actions.extend(game.scene.tick())
-                for action in game.actions:
-                    action.finished = action()
-                game.actions = [action for action in game.actions if not action.finished]
+        # fixed-frame time steps, as many as fit the elapsed time
+        for _ in range(steps):
+            sprite_store_positions()
+            gfx_store_camera()
+            simulation.step()
 
-            with gfx_frame() as ctx:
-                tilemap_get_active().draw(ctx)
-                sprite_update(ctx)
-                ui.draw(ctx)
+        # render once per frame, in between the last two steps
+        alpha = scheduler.alpha
+        with gfx_frame(alpha) as ctx:
+            tilemap_get_active().draw(ctx)
+            sprite_update(ctx, alpha)
+            ui.draw(ctx)
 
     game.exit()
 
-    close_window()
+    gfx_close()
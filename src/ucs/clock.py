@@ -0,0 +1,37 @@
+from typing import Optional
+
+
+class Clock:
+    """
+    Simulation time, in seconds, advanced by the simulation steps.
+
+    Game code reads the time from the clock instead of the wall clock, so
+    that it behaves the same regardless of how fast steps are run.
+    """
+
+    def __init__(self, time: float=0.0) -> None:
+        self.time = time
+
+    def advance(self, dt: float):
+        self.time += dt
+
+
+_clock: Clock = Clock()
+
+
+def clock_init(clock: Optional[Clock]=None) -> Clock:
+    """
+    Initialize the clock system, with the given clock or a new one starting
+    at 0 seconds.
+    """
+    global _clock
+    _clock = clock if clock is not None else Clock()
+    return _clock
+
+
+def clock_get() -> Clock:
+    return _clock
+
+
+def clock_get_time() -> float:
+    return _clock.time
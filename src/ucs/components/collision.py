@@ -1,50 +1,356 @@
-from typing import List, Optional
+from enum import Enum
+from operator import attrgetter
+from typing import Dict, List, Optional, Set, Tuple
 
+from ucs.components.registry import Handle, Registry
+from ucs.components.soa import (ColumnField, Columns, get_size, get_state,
+                                get_x, get_y, numpy, require_numpy)
 from ucs.foundation import Actor, Component
+from ucs.tilemap import TileMap
+
+#: Default broad phase cell size, used until a tilemap is activated.
+DEFAULT_CELL_SIZE = 16
+
+Cell = Tuple[int, int]
+CellBounds = Tuple[int, int, int, int]
+
+#: Upper bound to the number of elements of the overlap mask, which the
+#: matrix mode computes one block of rows at a time.
+MATRIX_BLOCK_SIZE = 1 << 18
+
+#: Cell bounds never matching actual ones, for colliders yet to be indexed.
+_UNINDEXED = (0, 0, -1, -1)
+
+_by_serial = attrgetter('serial')
+
+
+class CollisionMode(Enum):
+    #: Test the colliders sharing a spatial hash cell, in pure Python.
+    SPATIAL_HASH = 'spatial_hash'
+    #: Test all the colliders against each other, with NumPy.
+    MATRIX = 'matrix'
 
 
 class CollisionComponent(Component):
-    size: int
-    collision: Optional[Actor] = None
+    """
+    Square collision area attached to an actor.
+
+    Overlaps are computed once per step by `collision_update()`, which fills
+    the set of actors currently in contact, along with the lists of contacts
+    which started, persisted and ended during the last step. The containers
+    are owned by the component and reused across steps. `entered` and
+    `exited` are sorted by actor serial, to be processed in the same order
+    on every run.
+    """
+
+    size: int = ColumnField()
+    contacts: Set[Actor]
+    entered: List[Actor]
+    stayed: List[Actor]
+    exited: List[Actor]
+
+    handle: Handle
+
+    _row: Optional[int] = None
+    _columns: Optional[Columns] = None
 
     def __init__(self, actor: Actor, size: int) -> None:
         super().__init__(actor)
-        self.size = size
-        self.collision = None
-        _colliders.append(self)
+        self.contacts = set()
+        self.entered = []
+        self.stayed = []
+        self.exited = []
+        self._previous_contacts: Set[Actor] = set()
+
+        if _columns is not None:
+            cx0, cy0, cx1, cy1 = _UNINDEXED
+            self.handle = _columns.add(self, size=size, cx0=cx0, cy0=cy0, cx1=cx1, cy1=cy1)
+        else:
+            self.size = size
+            self.handle = _colliders.add(self)
 
     def destroy(self) -> None:
-        _colliders.remove(self)
+        _colliders.remove(self.handle)
+        _grid.remove(self)
+
+
+class SpatialHash:
+    """
+    Uniform grid broad phase.
+
+    Each collider is indexed in all the cells its box touches, and re-indexed
+    only when it moves across a cell boundary.
+    """
+
+    def __init__(self, cell_size: int) -> None:
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, Set[CollisionComponent]] = {}
+        self.bounds: Dict[CollisionComponent, CellBounds] = {}
 
+    def update(self, col: CollisionComponent) -> None:
+        """
+        Update the cells of the given collider, if it moved.
+        """
+        cs = self.cell_size
+        x, y = col.actor.x, col.actor.y
+        s = col.size
+        # the upper bounds are inclusive, so that colliders touching a cell
+        # boundary from the inside are still tested against their neighbours
+        self.move(col, (int(x // cs), int(y // cs), int((x + s) // cs), int((y + s) // cs)))
 
-_colliders: List[CollisionComponent] = None
+    def move(self, col: CollisionComponent, bounds: CellBounds) -> None:
+        """
+        Index the given collider in the cells within given bounds.
+        """
+        old_bounds = self.bounds.get(col)
+        if old_bounds == bounds:
+            return
 
+        if old_bounds is not None:
+            self._unlink(col, old_bounds)
+        self._link(col, bounds)
+        self.bounds[col] = bounds
 
-def collision_init():
+    def remove(self, col: CollisionComponent) -> None:
+        bounds = self.bounds.pop(col, None)
+        if bounds is not None:
+            self._unlink(col, bounds)
+
+    def query(self, col: CollisionComponent) -> Set[CollisionComponent]:
+        """
+        Return the colliders sharing at least one cell with the given one,
+        including the collider itself.
+        """
+        cx0, cy0, cx1, cy1 = self.bounds[col]
+        if cx0 == cx1 and cy0 == cy1:
+            return self.cells[cx0, cy0]
+
+        found = set()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                found.update(self.cells[cx, cy])
+        return found
+
+    def _link(self, col: CollisionComponent, bounds: CellBounds) -> None:
+        cx0, cy0, cx1, cy1 = bounds
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    cell = self.cells[cx, cy] = set()
+                cell.add(col)
+
+    def _unlink(self, col: CollisionComponent, bounds: CellBounds) -> None:
+        cx0, cy0, cx1, cy1 = bounds
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = self.cells[cx, cy]
+                cell.discard(col)
+                if not cell:
+                    del self.cells[cx, cy]
+
+
+_colliders: Registry[CollisionComponent] = None
+_columns: Optional[Columns] = None
+_grid: SpatialHash = None
+_mode: CollisionMode = CollisionMode.SPATIAL_HASH
+
+
+def collision_init(
+        cell_size: int=DEFAULT_CELL_SIZE,
+        soa: bool=False,
+        mode: CollisionMode=CollisionMode.SPATIAL_HASH):
+    """
+    Initialize the collision system.
+
+    With `soa`, collider sizes and broad phase bounds are kept in columns and
+    the broad phase is updated by a vectorized pass. The `mode` selects how
+    overlaps are searched for, yielding the same contacts in any case.
+    Both the `soa` storage and the `CollisionMode.MATRIX` mode require NumPy.
+    """
     global _colliders
-    _colliders = []
+    global _columns
+    global _grid
+    global _mode
+
+    if mode is CollisionMode.MATRIX:
+        require_numpy('the matrix collision mode')
+    _mode = mode
+
+    if soa:
+        require_numpy()
+        _columns = Columns(size='i', cx0='l', cy0='l', cx1='l', cy1='l')
+        _colliders = _columns
+    else:
+        _columns = None
+        _colliders = Registry()
+
+    _grid = SpatialHash(cell_size)
 
 
-def collision_update():
-    # reset collisions
+def collision_update(tilemap: Optional[TileMap]=None):
+    global _grid
+
+    # key the broad phase cells on the tile size of the given tilemap
+    if tilemap is not None and tilemap.tile_width != _grid.cell_size:
+        _grid = SpatialHash(tilemap.tile_width)
+        if _columns is not None:
+            for name, value in zip(('cx0', 'cy0', 'cx1', 'cy1'), _UNINDEXED):
+                _columns.view(name)[:] = value
+
+    # swap the contact sets
     for col in _colliders:
-        col.collision = None
+        col._previous_contacts, col.contacts = col.contacts, col._previous_contacts
+        col.contacts.clear()
+
+    if _mode is CollisionMode.MATRIX:
+        _update_contacts_matrix()
+    elif _columns is not None:
+        _update_contacts_soa()
+    else:
+        _update_contacts()
 
-    # check for new ones
+    # sort the contacts by their status with respect to the previous step
     for col in _colliders:
-        if col.actor.state is Actor.State.INACTIVE:
-            continue
+        _diff_contacts(col)
 
+
+def _update_contacts():
+    # update the broad phase for the colliders which moved since the last
+    # update
+    for col in _colliders:
+        _grid.update(col)
+
+    # check for contacts among the colliders in neighbouring cells; a pair of
+    # inactive actors never collides
+    for col in _colliders:
+        is_active = col.actor.state is not Actor.State.INACTIVE
         x0, y0 = col.actor.x, col.actor.y
         s0 = col.size
+        contacts = col.contacts
 
-        for other in _colliders:
-            if col == other:
+        for other in _grid.query(col):
+            if col is other:
+                continue
+
+            if not is_active and other.actor.state is Actor.State.INACTIVE:
                 continue
 
             x1, y1 = other.actor.x, other.actor.y
             s1 = other.size
 
             if x0 < x1 + s1 and x0 + s0 > x1 and y0 < y1 + s1 and y0 + s0 > y1:
-                col.collision = other.actor
-                other.collision = col.actor
+                contacts.add(other.actor)
+
+
+def _update_contacts_soa():
+    xs, ys = _columns.actors_positions()
+    sizes = _columns.view('size')
+
+    # compute the cell bounds of all the colliders at once, and re-index only
+    # the ones which differ from the last update
+    cs = _grid.cell_size
+    bounds = (xs // cs, ys // cs, (xs + sizes) // cs, (ys + sizes) // cs)
+    indexed = [_columns.view(name) for name in ('cx0', 'cy0', 'cx1', 'cy1')]
+    moved = numpy.zeros(len(_columns), dtype=bool)
+    for new, old in zip(bounds, indexed):
+        moved |= new != old
+        old[:] = new
+
+    cx0, cy0, cx1, cy1 = (column.tolist() for column in indexed)
+    for row in numpy.flatnonzero(moved).tolist():
+        _grid.move(_colliders.components[row], (cx0[row], cy0[row], cx1[row], cy1[row]))
+
+    # narrow phase, over plain lists extracted from the columns
+    xs = xs.tolist()
+    ys = ys.tolist()
+    sizes = sizes.tolist()
+    inactive = [state is Actor.State.INACTIVE for state in map(get_state, _columns.actors)]
+
+    for row, col in enumerate(_colliders):
+        is_inactive = inactive[row]
+        x0, y0, s0 = xs[row], ys[row], sizes[row]
+        contacts = col.contacts
+
+        for other in _grid.query(col):
+            if col is other:
+                continue
+
+            i = other._row
+            if is_inactive and inactive[i]:
+                continue
+
+            x1, y1, s1 = xs[i], ys[i], sizes[i]
+
+            if x0 < x1 + s1 and x0 + s0 > x1 and y0 < y1 + s1 and y0 + s0 > y1:
+                contacts.add(other.actor)
+
+
+def _update_contacts_matrix():
+    colliders = _colliders.components
+    count = len(colliders)
+    if _columns is not None:
+        actors = _columns.actors
+        xs, ys = _columns.actors_positions()
+        sizes = _columns.view('size')
+    else:
+        actors = [col.actor for col in colliders]
+        xs = numpy.fromiter(map(get_x, actors), dtype=float, count=count)
+        ys = numpy.fromiter(map(get_y, actors), dtype=float, count=count)
+        sizes = numpy.fromiter(map(get_size, colliders), dtype=float, count=count)
+
+    inactive = numpy.fromiter(
+        (state is Actor.State.INACTIVE for state in map(get_state, actors)),
+        dtype=bool,
+        count=count)
+    right = xs + sizes
+    bottom = ys + sizes
+
+    # compute the overlap mask of a block of colliders against all the others
+    # at a time, to keep memory usage bounded
+    block = max(1, MATRIX_BLOCK_SIZE // max(count, 1))
+    for start in range(0, count, block):
+        stop = min(start + block, count)
+        rows = slice(start, stop)
+
+        mask = xs[rows, None] < right[None, :]
+        mask &= right[rows, None] > xs[None, :]
+        mask &= ys[rows, None] < bottom[None, :]
+        mask &= bottom[rows, None] > ys[None, :]
+        # a pair of inactive actors never collides
+        mask &= ~(inactive[rows, None] & inactive[None, :])
+        # nor does a collider with itself
+        diagonal = numpy.arange(stop - start)
+        mask[diagonal, diagonal + start] = False
+
+        found, others = numpy.nonzero(mask)
+        for row, other in zip((found + start).tolist(), others.tolist()):
+            colliders[row].contacts.add(actors[other])
+
+
+def _diff_contacts(col: CollisionComponent):
+    contacts = col.contacts
+    previous = col._previous_contacts
+    entered = col.entered
+    stayed = col.stayed
+    exited = col.exited
+    entered.clear()
+    stayed.clear()
+    exited.clear()
+
+    for actor in contacts:
+        if actor in previous:
+            stayed.append(actor)
+        else:
+            entered.append(actor)
+
+    if len(stayed) != len(previous):
+        for actor in previous:
+            if actor not in contacts:
+                exited.append(actor)
+
+    # sets iterate in id order, which changes from run to run
+    if len(entered) > 1:
+        entered.sort(key=_by_serial)
+    if len(exited) > 1:
+        exited.sort(key=_by_serial)
@@ -1,47 +1,202 @@
-from typing import List
+from typing import Optional, Tuple
 
-from ucs.tilemap import TileMap
+from ucs.components.registry import Handle, Registry
+from ucs.components.soa import (ColumnField, Columns, ColumnVector, numpy,
+                                require_numpy)
 from ucs.foundation import Actor, Component, Rect
+from ucs.tilegrid import TileGrid
+from ucs.tilemap import TileMap
+
+X_AXIS = 0
+Y_AXIS = 1
 
 
 class MovementComponent(Component):
-    vel_x: int
-    vel_y: int
-    rect: Rect
+    vel_x: int = ColumnField()
+    vel_y: int = ColumnField()
+    rect: Rect = ColumnVector('rect_x', 'rect_y', 'rect_w', 'rect_h')
+
+    handle: Handle
+
+    _row: Optional[int] = None
+    _columns: Optional[Columns] = None
 
     def __init__(self, actor: Actor, rect: Rect) -> None:
         super().__init__(actor)
-        self.vel_x = 0
-        self.vel_y = 0
-        self.rect = rect
-        _movement_components.append(self)
+        if _columns is not None:
+            x, y, w, h = rect
+            self.handle = _columns.add(self, vel_x=0, vel_y=0, rect_x=x, rect_y=y, rect_w=w, rect_h=h)
+        else:
+            self.vel_x = 0
+            self.vel_y = 0
+            self.rect = rect
+            self.handle = _movement_components.add(self)
 
     def destroy(self) -> None:
-        _movement_components.remove(self)
+        _movement_components.remove(self.handle)
+
 
+_movement_components: Registry[MovementComponent] = None
+_columns: Optional[Columns] = None
 
-_movement_components: List[MovementComponent] = None
 
+def movement_init(soa: bool=False):
+    """
+    Initialize the movement system.
 
-def movement_init():
+    With `soa`, velocities and rects are kept in columns and all the moving
+    components are processed in a batch, testing their tiles at once;
+    NumPy is required.
+    """
     global _movement_components
-    _movement_components = []
+    global _columns
+
+    if soa:
+        require_numpy()
+        _columns = Columns(vel_x='i', vel_y='i', rect_x='i', rect_y='i', rect_w='i', rect_h='i')
+        _movement_components = _columns
+    else:
+        _columns = None
+        _movement_components = Registry()
 
 
 def movement_update(tilemap: TileMap):
+    """
+    Move the actors by their velocity, stopping them against the obstacles of
+    the tilemap.
+
+    The rect of each component is swept along the X axis first, then along
+    the Y axis, hence actors moving diagonally into a wall keep sliding along
+    it. Swept areas are converted to ranges of tiles, which are tested in a
+    single query, and only blocked moves are resolved tile by tile.
+    """
+    if _columns is not None:
+        _movement_update_soa(tilemap)
+        return
+
+    grid = tilemap.grid
     for mov in _movement_components:
-        if mov.actor.state is Actor.State.INACTIVE:
+        actor = mov.actor
+        if actor.state is Actor.State.INACTIVE or not (mov.vel_x or mov.vel_y):
             continue
-        x = mov.actor.x + mov.vel_x
-        y = mov.actor.y + mov.vel_y
-        x0, y0, w, h = mov.rect
-        x0 += x
-        y0 += y
-        x1 = x0 + w
-        y1 = y0 + h
-        # top-left, top-right, bottom-left, bottom-right
-        points = [ (x0, y0), (x0, y1), (x1, y1), (x1, y0), ]
-        collision = any(not tilemap.is_walkable_at(point) for point in points)
-        if not collision:
-            mov.actor.x = x
-            mov.actor.y = y
+        rect_x, rect_y, rect_w, rect_h = mov.rect
+
+        if mov.vel_x:
+            # the rows covered by the rect are swept along the X axis
+            rows = _tile_range(actor.y + rect_y, rect_h, tilemap.y, tilemap.tile_height)
+            actor.x = _sweep(
+                grid, X_AXIS, rows, actor.x, mov.vel_x, rect_x, rect_w, tilemap.x, tilemap.tile_width)
+
+        if mov.vel_y:
+            cols = _tile_range(actor.x + rect_x, rect_w, tilemap.x, tilemap.tile_width)
+            actor.y = _sweep(
+                grid, Y_AXIS, cols, actor.y, mov.vel_y, rect_y, rect_h, tilemap.y, tilemap.tile_height)
+
+
+def _movement_update_soa(tilemap: TileMap):
+    vel_x = _columns.view('vel_x')
+    vel_y = _columns.view('vel_y')
+
+    # standing components can't end up anywhere else, skip them
+    rows = numpy.flatnonzero((vel_x != 0) | (vel_y != 0))
+    if not rows.size:
+        return
+
+    actors = _columns.actors
+    active = numpy.fromiter(
+        (actors[row].state is not Actor.State.INACTIVE for row in rows.tolist()),
+        dtype=bool, count=rows.size)
+    rows = rows[active]
+    if not rows.size:
+        return
+
+    grid = tilemap.grid
+    xs, ys = _columns.actors_positions()
+    xs = xs[rows]
+    ys = ys[rows]
+    vxs = vel_x[rows]
+    vys = vel_y[rows]
+    rect_x = _columns.view('rect_x')[rows]
+    rect_y = _columns.view('rect_y')[rows]
+    rect_w = _columns.view('rect_w')[rows]
+    rect_h = _columns.view('rect_h')[rows]
+    tile_w = tilemap.tile_width
+    tile_h = tilemap.tile_height
+
+    # sweep all the rects along the X axis, then along the Y axis, testing the
+    # swept areas at once and resolving the blocked ones one by one
+    for axis in (X_AXIS, Y_AXIS):
+        if axis == X_AXIS:
+            pos, vel, offset, size, origin, tile = xs, vxs, rect_x, rect_w, tilemap.x, tile_w
+            cross0, cross1 = _tile_ranges(ys + rect_y, rect_h, tilemap.y, tile_h)
+        else:
+            pos, vel, offset, size, origin, tile = ys, vys, rect_y, rect_h, tilemap.y, tile_h
+            cross0, cross1 = _tile_ranges(xs + rect_x, rect_w, tilemap.x, tile_w)
+
+        start = pos + offset
+        lo = numpy.minimum(start, start + vel)
+        hi = numpy.maximum(start, start + vel) + numpy.maximum(size, 1) - 1
+        lo = (lo - origin) // tile
+        hi = (hi - origin) // tile
+        if axis == X_AXIS:
+            free = grid.are_areas_walkable(lo.astype(int), cross0, hi.astype(int), cross1)
+        else:
+            free = grid.are_areas_walkable(cross0, lo.astype(int), cross1, hi.astype(int))
+
+        moved = pos + vel
+        for i in numpy.flatnonzero(~free & (vel != 0)).tolist():
+            cross = int(cross0[i]), int(cross1[i])
+            moved[i] = _sweep(
+                grid, axis, cross, pos[i].item(), int(vel[i]), int(offset[i]), int(size[i]), origin, tile)
+        pos[:] = moved
+
+    for row, x, y in zip(rows.tolist(), xs.tolist(), ys.tolist()):
+        actor = actors[row]
+        actor.x = int(x)
+        actor.y = int(y)
+
+
+def _tile_range(start: float, size: int, origin: float, tile: int) -> Tuple[int, int]:
+    """
+    Return the first and last tiles covered by a pixel span.
+    """
+    return int((start - origin) // tile), int((start + max(size, 1) - 1 - origin) // tile)
+
+
+def _tile_ranges(starts: 'numpy.ndarray', sizes: 'numpy.ndarray', origin: float, tile: int):
+    first = (starts - origin) // tile
+    last = (starts + numpy.maximum(sizes, 1) - 1 - origin) // tile
+    return first.astype(int), last.astype(int)
+
+
+def _sweep(
+        grid: TileGrid, axis: int, cross: Tuple[int, int], pos: float, vel: int, offset: int, size: int,
+        origin: float, tile: int) -> float:
+    """
+    Return the position reached moving along an axis by `vel` pixels, and
+    stopping against the first obstacle, for a rect covering the `cross`
+    range of tiles on the other axis.
+    """
+    start, end = _tile_range(pos + offset, size, origin, tile)
+    if vel > 0:
+        target = int((pos + offset + max(size, 1) - 1 + vel - origin) // tile)
+        if target == end or _is_free(grid, axis, cross, end + 1, target):
+            return pos + vel
+        # move tile by tile up to the blocked one, and stick to its edge
+        for blocked in range(end + 1, target + 1):
+            if not _is_free(grid, axis, cross, blocked, blocked):
+                return origin + blocked * tile - max(size, 1) - offset
+    else:
+        target = int((pos + offset + vel - origin) // tile)
+        if target == start or _is_free(grid, axis, cross, target, start - 1):
+            return pos + vel
+        for blocked in range(start - 1, target - 1, -1):
+            if not _is_free(grid, axis, cross, blocked, blocked):
+                return origin + (blocked + 1) * tile - offset
+    return pos + vel
+
+
+def _is_free(grid: TileGrid, axis: int, cross: Tuple[int, int], first: int, last: int) -> bool:
+    if axis == X_AXIS:
+        return grid.is_area_walkable(first, cross[0], last, cross[1])
+    return grid.is_area_walkable(cross[0], first, cross[1], last)
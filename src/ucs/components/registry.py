@@ -0,0 +1,95 @@
+from typing import Generic, Iterator, List, NamedTuple, TypeVar
+
+C = TypeVar('C')
+
+
+class Handle(NamedTuple):
+    """
+    Reference to a registered component.
+
+    The slot of a removed component is reused for the next ones, with an
+    increased generation, so that handles outliving their component are
+    detected as stale instead of silently referencing another one.
+    """
+
+    slot: int
+    generation: int
+
+
+class Registry(Generic[C]):
+    """
+    Densely packed set of components, with O(1) addition and removal.
+
+    Components are kept in `components` for systems to iterate over, in no
+    particular order: removing one moves the last component in its place.
+    """
+
+    def __init__(self) -> None:
+        self.components: List[C] = []
+        self._generations: List[int] = []
+        # slot -> index in `components` and vice versa
+        self._indices: List[int] = []
+        self._slots: List[int] = []
+        self._free_slots: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def __iter__(self) -> Iterator[C]:
+        return iter(self.components)
+
+    def add(self, component: C) -> Handle:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._generations)
+            self._generations.append(0)
+            self._indices.append(0)
+
+        self._indices[slot] = len(self.components)
+        self._slots.append(slot)
+        self.components.append(component)
+        return Handle(slot, self._generations[slot])
+
+    def remove(self, handle: Handle) -> C:
+        """
+        Remove the component referenced by the handle, returning it.
+        """
+        index = self.index(handle)
+        component = self.components[index]
+
+        last = len(self.components) - 1
+        if index != last:
+            self._move(last, index)
+            slot = self._slots[last]
+            self._slots[index] = slot
+            self._indices[slot] = index
+
+        self.components.pop()
+        self._slots.pop()
+        self._generations[handle.slot] += 1
+        self._free_slots.append(handle.slot)
+        return component
+
+    def get(self, handle: Handle) -> C:
+        return self.components[self.index(handle)]
+
+    def is_alive(self, handle: Handle) -> bool:
+        slot, generation = handle
+        return slot < len(self._generations) and self._generations[slot] == generation
+
+    def index(self, handle: Handle) -> int:
+        """
+        Return the current position in `components` of the referenced
+        component.
+        """
+        if not self.is_alive(handle):
+            raise ValueError(f'stale component handle {handle}')
+        return self._indices[handle.slot]
+
+    def _move(self, src: int, dst: int) -> None:
+        """
+        Move the component at `src` index into `dst` index, overwriting the
+        latter.
+        """
+        self.components[dst] = self.components[src]
@@ -0,0 +1,164 @@
+"""
+Structure-of-arrays storage for component data.
+
+Systems initialized with `soa=True` keep the fields of their components in
+contiguous columns, one row per component, so that their update passes can
+run over whole columns at once with NumPy. Components keep exposing their
+fields as plain attributes, which become views over their own row.
+"""
+from array import array
+from operator import attrgetter
+from typing import Any, Dict, List, Sequence
+
+from ucs.components.registry import Handle, Registry
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: Typecode of columns holding arbitrary Python objects.
+OBJECT = 'O'
+
+get_x = attrgetter('x')
+get_y = attrgetter('y')
+get_state = attrgetter('state')
+get_size = attrgetter('size')
+
+
+def require_numpy(feature: str='the structure-of-arrays backend'):
+    if numpy is None:
+        raise RuntimeError(f'{feature} requires NumPy')
+
+
+class Columns(Registry):
+    """
+    Registry of components storing their fields column by column.
+
+    Numeric fields are stored in `array.array` columns, which NumPy views
+    without copying, while the `OBJECT` ones are stored in plain lists.
+    The row of a component is its index in `components`, which is kept in
+    its `_row` attribute.
+    """
+
+    def __init__(self, **fields: str) -> None:
+        super().__init__()
+        self.actors: List[Any] = []
+        self.data: Dict[str, Any] = {
+            name: [] if typecode == OBJECT else array(typecode)
+            for name, typecode in fields.items()
+        }
+
+    def add(self, component: Any, **values: Any) -> Handle:
+        component._columns = self
+        component._row = len(self.components)
+        self.actors.append(component.actor)
+        for name, column in self.data.items():
+            column.append(values[name])
+        return super().add(component)
+
+    def remove(self, handle: Handle) -> Any:
+        # keep the field values in the component itself, as it may still be
+        # accessed after being removed from the table
+        component = self.get(handle)
+        values = [(field, field.__get__(component)) for field in _fields_of(type(component))]
+
+        super().remove(handle)
+        self.actors.pop()
+        for column in self.data.values():
+            column.pop()
+
+        component._row = None
+        for field, value in values:
+            field.__set__(component, value)
+        return component
+
+    def _move(self, src: int, dst: int) -> None:
+        super()._move(src, dst)
+        self.components[dst]._row = dst
+        self.actors[dst] = self.actors[src]
+        for column in self.data.values():
+            column[dst] = column[src]
+
+    def view(self, name: str) -> 'numpy.ndarray':
+        """
+        Return a NumPy array sharing memory with the given numeric column.
+
+        The column can't grow or shrink while the view is alive, hence views
+        are meant to be short-lived, within a single update pass.
+        """
+        column = self.data[name]
+        return numpy.frombuffer(column, dtype=column.typecode)
+
+    def actors_positions(self) -> Sequence['numpy.ndarray']:
+        """
+        Gather the positions of the actors owning the components in two
+        arrays, without running any Python code per component.
+        """
+        actors = self.actors
+        count = len(actors)
+        xs = numpy.fromiter(map(get_x, actors), dtype=float, count=count)
+        ys = numpy.fromiter(map(get_y, actors), dtype=float, count=count)
+        return xs, ys
+
+
+class ColumnField:
+    """
+    Component attribute stored in a column, for components having a row, or
+    in the instance dictionary otherwise.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, comp, owner=None):
+        if comp is None:
+            return self
+        if comp._row is None:
+            return comp.__dict__[self.name]
+        return comp._columns.data[self.name][comp._row]
+
+    def __set__(self, comp, value):
+        if comp._row is None:
+            comp.__dict__[self.name] = value
+        else:
+            comp._columns.data[self.name][comp._row] = value
+
+
+class ColumnVector:
+    """
+    Tuple-like component attribute, stored as one column per element.
+    """
+
+    def __init__(self, *names: str) -> None:
+        self.names = names
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, comp, owner=None):
+        if comp is None:
+            return self
+        if comp._row is None:
+            return comp.__dict__[self.name]
+        data = comp._columns.data
+        row = comp._row
+        return tuple(data[name][row] for name in self.names)
+
+    def __set__(self, comp, value):
+        if comp._row is None:
+            comp.__dict__[self.name] = value
+        else:
+            data = comp._columns.data
+            row = comp._row
+            for name, v in zip(self.names, value):
+                data[name][row] = v
+
+
+def _fields_of(cls: type) -> List[Any]:
+    return [
+        attr
+        for klass in cls.__mro__
+        for attr in vars(klass).values()
+        if isinstance(attr, (ColumnField, ColumnVector))
+    ]
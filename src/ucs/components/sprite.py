@@ -1,38 +1,172 @@
 import pathlib
-from typing import Optional, Tuple, List
+from typing import Any, Optional, Tuple
 
-from raylibpy.spartan import Texture2D, load_texture
-from ucs.gfx import DrawMaskedTextureRectCommand, RenderContext
+from ucs.components.registry import Handle, Registry
+from ucs.components.soa import (OBJECT, ColumnField, Columns, ColumnVector,
+                                numpy, require_numpy)
+from ucs.gfx import (RenderContext, gfx_get_sprite_batch, gfx_get_view_rect,
+                     gfx_load_texture)
 from ucs.foundation import Actor, Component, Rect, Position
 
 
+#: Draw order of the sprites on the lowest layer.
+SPRITE_ORDER = 1e6
+
+
 class SpriteComponent(Component):
-    frame: Optional[Rect]
-    offset: Tuple[int, int]
+    """
+    Sprite drawn at the actor position.
+
+    Sprites on higher layers are drawn on top of the ones on lower layers,
+    while the order of sprites on the same layer is unspecified.
+
+    The actor position before the last simulation step is kept in `previous`,
+    for drawing the sprite in between the last two steps.
+    """
+
+    frame: Optional[Rect] = ColumnField()
+    offset: Tuple[int, int] = ColumnVector('offset_x', 'offset_y')
+    layer: int = ColumnField()
+    previous: Position = ColumnVector('previous_x', 'previous_y')
+
+    handle: Handle
+
+    _row: Optional[int] = None
+    _columns: Optional[Columns] = None
 
-    def __init__(self, actor: Actor, frame: Optional[Rect]=None, offset: Position=(0, 0)) -> None:
+    def __init__(self, actor: Actor, frame: Optional[Rect]=None, offset: Position=(0, 0), layer: int=0) -> None:
         super().__init__(actor)
-        self.frame = frame
-        self.offset = offset
-        _sprite_components.append(self)
+        if _columns is not None:
+            off_x, off_y = offset
+            self.handle = _columns.add(
+                self, frame=frame, offset_x=off_x, offset_y=off_y, layer=layer,
+                previous_x=actor.x, previous_y=actor.y)
+        else:
+            self.frame = frame
+            self.offset = offset
+            self.layer = layer
+            self.previous = actor.position
+            self.handle = _sprite_components.add(self)
 
     def destroy(self) -> None:
-        _sprite_components.remove(self)
+        _sprite_components.remove(self.handle)
 
 
-_sprite_components: List[SpriteComponent] = []
-_sheet: Texture2D = None
+_sprite_components: Registry[SpriteComponent] = Registry()
+_columns: Optional[Columns] = None
+_sheet: Any = None
 
+def _get_width(frame: Optional[Rect]) -> int:
+    return 0 if frame is None else frame[2]
 
-def sprite_init():
+
+def _get_height(frame: Optional[Rect]) -> int:
+    return 0 if frame is None else frame[3]
+
+
+def sprite_init(soa: bool=False):
+    """
+    Initialize the sprite system.
+
+    With `soa`, frames and offsets are kept in columns and sprite positions
+    are computed by a vectorized pass; NumPy is required.
+    """
+    global _sprite_components
+    global _columns
     global _sheet
-    _sheet = load_texture(str(pathlib.Path('assets', 'characters_sheet.png')))
 
+    if soa:
+        require_numpy()
+        _columns = Columns(
+            frame=OBJECT, offset_x='d', offset_y='d', layer='i',
+            previous_x='d', previous_y='d')
+        _sprite_components = _columns
+    else:
+        _columns = None
+        _sprite_components = Registry()
+
+    _sheet = gfx_load_texture(str(pathlib.Path('assets', 'characters_sheet.png')))
+
+
+def sprite_store_positions():
+    """
+    Remember the current actor positions, to be called before each
+    simulation step.
+    """
+    if _columns is not None:
+        xs, ys = _columns.actors_positions()
+        _columns.view('previous_x')[:] = xs
+        _columns.view('previous_y')[:] = ys
+        return
 
-def sprite_update(ctx: RenderContext):
     for sprite in _sprite_components:
-        if sprite.actor.state is Actor.State.INACTIVE:
+        sprite.previous = sprite.actor.position
+
+
+def sprite_update(ctx: RenderContext, alpha: float=1.0):
+    """
+    Draw the sprites, at `alpha` of the way between the actor positions
+    before and after the last simulation step.
+    """
+    if _columns is not None:
+        _sprite_update_soa(ctx, alpha)
+        return
+
+    view_x0, view_y0, view_w, view_h = gfx_get_view_rect()
+    view_x1 = view_x0 + view_w
+    view_y1 = view_y0 + view_h
+    # batch adders by layer, looked up once per call
+    adders = {}
+
+    for sprite in _sprite_components:
+        actor = sprite.actor
+        if actor.state is Actor.State.INACTIVE:
+            continue
+        frame = sprite.frame
+        if frame is None:
             continue
         off_x, off_y = sprite.offset
-        position = sprite.actor.x + off_x, sprite.actor.y + off_y
-        ctx.append(DrawMaskedTextureRectCommand(1e6, _sheet, sprite.frame, position))
+        prev_x, prev_y = sprite.previous
+        x = prev_x + (actor.x - prev_x) * alpha + off_x
+        y = prev_y + (actor.y - prev_y) * alpha + off_y
+
+        # skip sprites out of the camera view
+        _, _, w, h = frame
+        if x >= view_x1 or x + w <= view_x0 or y >= view_y1 or y + h <= view_y0:
+            continue
+
+        layer = sprite.layer
+        add = adders.get(layer)
+        if add is None:
+            add = adders[layer] = gfx_get_sprite_batch(ctx, SPRITE_ORDER + layer).add
+        add(_sheet, frame, (x, y))
+
+
+def _sprite_update_soa(ctx: RenderContext, alpha: float):
+    xs, ys = _columns.actors_positions()
+    prev_xs = _columns.view('previous_x')
+    prev_ys = _columns.view('previous_y')
+    xs = prev_xs + (xs - prev_xs) * alpha + _columns.view('offset_x')
+    ys = prev_ys + (ys - prev_ys) * alpha + _columns.view('offset_y')
+
+    # select the sprites having a frame, within the camera view
+    view_x, view_y, view_w, view_h = gfx_get_view_rect()
+    frames = _columns.data['frame']
+    has_frame = numpy.fromiter((frame is not None for frame in frames), dtype=bool, count=len(frames))
+    widths = numpy.fromiter(map(_get_width, frames), dtype=float, count=len(frames))
+    heights = numpy.fromiter(map(_get_height, frames), dtype=float, count=len(frames))
+    rows = numpy.flatnonzero(
+        has_frame &
+        (xs < view_x + view_w) & (xs + widths > view_x) &
+        (ys < view_y + view_h) & (ys + heights > view_y))
+
+    orders = (_columns.view('layer')[rows] + SPRITE_ORDER).tolist()
+    actors = _columns.actors
+    adders = {}
+    for row, order, x, y in zip(rows.tolist(), orders, xs[rows].tolist(), ys[rows].tolist()):
+        if actors[row].state is Actor.State.INACTIVE:
+            continue
+        add = adders.get(order)
+        if add is None:
+            add = adders[order] = gfx_get_sprite_batch(ctx, order).add
+        add(_sheet, frames[row], (x, y))
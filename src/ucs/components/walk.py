@@ -1,7 +1,9 @@
 from enum import Enum
-from typing import List
+from typing import Dict, List, Optional
 
 from raylibpy.spartan import clamp
+from ucs.components.registry import Handle, Registry
+from ucs.components.soa import OBJECT, ColumnField, Columns, require_numpy
 from ucs.foundation import Actor, Component, Position
 from ucs.tilemap import TileMap
 
@@ -14,99 +16,159 @@ class WalkDirection(Enum):
     WEST = 'west'
 
 
+class DirectionField(ColumnField):
+    """
+    Walk direction field, which wakes the walker up when set to walk, unless
+    it was destroyed.
+    """
+
+    def __set__(self, comp, value):
+        super().__set__(comp, value)
+        if value is not WalkDirection.STOP and _moving is not None and _walk_components.is_alive(comp.handle):
+            _moving[comp] = None
+
+
 class WalkComponent(Component):
 
-    direction: WalkDirection
-    speed: int
+    direction: WalkDirection = DirectionField()
+    speed: int = ColumnField()
+    dst: Optional[Position] = ColumnField()
+    # tile currently marked as occupied by the walker
+    tile: Optional[Position] = ColumnField()
+
+    handle: Handle
+
+    _row: Optional[int] = None
+    _columns: Optional[Columns] = None
 
     def __init__(self, actor: Actor, speed: int) -> None:
         super().__init__(actor)
-        self.direction = WalkDirection.STOP
-        self.speed = speed
-        self.dst = None
+        if _columns is not None:
+            self.handle = _columns.add(self, direction=WalkDirection.STOP, speed=speed, dst=None, tile=None)
+        else:
+            self.direction = WalkDirection.STOP
+            self.speed = speed
+            self.dst = None
+            self.tile = None
+            self.handle = _walk_components.add(self)
 
-        _walk_components.append(self)
+        # occupy the initial tile on the next update
+        _moving[self] = None
 
     def destroy(self) -> None:
-        _walk_components.remove(self)
+        _walk_components.remove(self.handle)
+        _moving.pop(self, None)
         _to_remove.append(self)
 
 
-_walk_components: List[WalkComponent] = None
+_walk_components: Registry[WalkComponent] = None
 _to_remove: List[WalkComponent] = None
+_columns: Optional[Columns] = None
+# walkers to update, in insertion order for the tile reservations to be
+# reproducible
+_moving: Dict[WalkComponent, None] = None
 
 
-def walk_init():
+def walk_init(soa: bool=False):
+    """
+    Initialize the walk system.
+
+    With `soa`, walker state is kept in columns; NumPy is required.
+
+    Only the walkers which are walking, or were just created, are updated:
+    the occupancy of the tiles is changed only when a walker changes tile,
+    hence standing walkers cost nothing. Walkers are expected to be moved by
+    this system only.
+    """
     global _walk_components
     global _to_remove
-    _walk_components = []
+    global _columns
+    global _moving
+
+    if soa:
+        require_numpy()
+        _columns = Columns(direction=OBJECT, speed='i', dst=OBJECT, tile=OBJECT)
+        _walk_components = _columns
+    else:
+        _columns = None
+        _walk_components = Registry()
+
     _to_remove = []
+    _moving = {}
 
 
 def walk_update(tilemap: TileMap):
     for garbage in _to_remove:
-        col, row = tilemap.pixels_to_coords(garbage.actor.position)
-        tilemap.set_occupant_at(col, row, None)
-        if garbage.dst is not None:
-            tilemap.set_occupant_at(*garbage.dst, None)
+        if garbage.tile is not None:
+            _release_tile(tilemap, garbage.tile, garbage.actor)
+            garbage.tile = None
 
     _to_remove.clear()
 
-    for walker in _walk_components:
-        col, row = tilemap.pixels_to_coords(walker.actor.position)
-
-        if walker.actor.state is Actor.State.INACTIVE:
-            # no movement performed, just set the tile as occupied
-            tilemap.set_occupant_at(col, row, walker.actor)
-            continue
-
-        # clear current tile
-        tilemap.set_occupant_at(col, row, None)
-
-        if walker.dst is None and walker.direction is not WalkDirection.STOP:
-            # compute the current tile coordinate from absolute position in
-            # pixels
-            dst_col, dst_row = _get_adjacent_tile((col, row), walker.direction, tilemap)
-
-            # set the destination, if it's walkable
-            if (col, row) != (dst_col, dst_row) and tilemap.is_walkable_at(dst_col, dst_row):
-                walker.dst = (dst_col, dst_row)
-
-        energy = walker.speed
-        while walker.dst is not None and energy > 0:
-            # compute the destination position in pixels from tile coordinates
-            dst_x, dst_y = walker.dst
-            dst_x = dst_x * tilemap.map.tilewidth + tilemap.x
-            dst_y = dst_y * tilemap.map.tileheight + tilemap.y
-
-            # clamp the movement delta to not overshoot the destination position
-            x, y = walker.actor.position
-            dx = min(abs(dst_x - x), energy)
-            dy = min(abs(dst_y - y), energy)
-
-            # update the actor position
-            walker.actor.x += dx if dst_x > x else -dx
-            walker.actor.y += dy if dst_y > y else -dy
-
-            # consume the energy spent for walking the delta
-            energy -= dx + dy
-
-            # check if current destination is reached
-            if x == dst_x and y == dst_y:
-                if energy == 0 or walker.direction is WalkDirection.STOP:
-                    # stop, if requested
-                    walker.dst = None
-                else:
-                    # pick the next destination
-                    tile = _get_adjacent_tile(walker.dst, walker.direction, tilemap)
-                    walker.dst = tile if tilemap.is_walkable_at(*tile) else None
-
-        # if there's a destination tile, mark it as occupied
-        if walker.dst is not None:
-            tilemap.set_occupant_at(*walker.dst, walker.actor)
-        # otherwise, mark the tile at which the walker stopped as occupied
-        else:
-            tilemap.set_occupant_at(*tilemap.pixels_to_coords(walker.actor.position), walker.actor)
+    for walker in list(_moving):
+        actor = walker.actor
+        col, row = tilemap.pixels_to_coords(actor.position)
+        tile = (col, row)
+
+        if actor.state is not Actor.State.INACTIVE:
+            if walker.dst is None and walker.direction is not WalkDirection.STOP:
+                # set the destination, if it's walkable
+                dst = _get_adjacent_tile(tile, walker.direction, tilemap)
+                if dst != tile and tilemap.is_walkable_at(*dst):
+                    walker.dst = dst
+
+            energy = walker.speed
+            while walker.dst is not None and energy > 0:
+                # compute the destination position in pixels from tile coordinates
+                dst_x, dst_y = walker.dst
+                dst_x = dst_x * tilemap.tile_width + tilemap.x
+                dst_y = dst_y * tilemap.tile_height + tilemap.y
+
+                # clamp the movement delta to not overshoot the destination position
+                x, y = actor.position
+                dx = min(abs(dst_x - x), energy)
+                dy = min(abs(dst_y - y), energy)
+
+                # update the actor position
+                actor.x += dx if dst_x > x else -dx
+                actor.y += dy if dst_y > y else -dy
+
+                # consume the energy spent for walking the delta
+                energy -= dx + dy
+
+                # check if current destination is reached
+                if x == dst_x and y == dst_y:
+                    tile = walker.dst
+                    if energy == 0 or walker.direction is WalkDirection.STOP:
+                        # stop, if requested
+                        walker.dst = None
+                    else:
+                        # pick the next destination
+                        next_tile = _get_adjacent_tile(tile, walker.direction, tilemap)
+                        walker.dst = next_tile if tilemap.is_walkable_at(*next_tile) else None
+
+            # the destination tile is reserved, otherwise the tile the walker
+            # stopped at is occupied
+            if walker.dst is not None:
+                tile = walker.dst
+            elif walker.direction is WalkDirection.STOP:
+                del _moving[walker]
+        elif walker.direction is WalkDirection.STOP and walker.dst is None:
+            # no movement performed, just keep the tile occupied; walkers
+            # still told to walk are kept, to resume once active again
+            del _moving[walker]
+
+        if tile != walker.tile:
+            if walker.tile is not None:
+                _release_tile(tilemap, walker.tile, actor)
+            tilemap.set_occupant_at(*tile, actor)
+            walker.tile = tile
+
+
+def _release_tile(tilemap: TileMap, tile: Position, actor: Actor):
+    # the tile may have been taken over already
+    if tilemap.get_occupant_at(*tile) is actor:
+        tilemap.set_occupant_at(*tile, None)
 
 
 def _get_adjacent_tile(coord: Position, direction: WalkDirection, tilemap: TileMap) -> Position:
@@ -122,7 +184,7 @@ def _get_adjacent_tile(coord: Position, direction: WalkDirection, tilemap: TileM
         dst_col += 1
 
     # ensure the tile coordinate is within the tilemap bounds
-    dst_row = int(clamp(dst_row, 0, tilemap.map.height))
-    dst_col = int(clamp(dst_col, 0, tilemap.map.width))
+    dst_row = int(clamp(dst_row, 0, tilemap.height))
+    dst_col = int(clamp(dst_col, 0, tilemap.width))
 
     return dst_col, dst_row
@@ -1,10 +1,13 @@
-import inspect
+import heapq
 import weakref
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
 from enum import IntEnum
 from functools import partial, wraps
-from typing import (Callable, Generic, GenericAlias, Iterable, List, Optional,
-                    Sequence, Tuple, TypeVar)
+from itertools import count
+from typing import (Any, Callable, Collection, Coroutine, Dict, Generator,
+                    Generic, GenericAlias, Iterable, Iterator, List,
+                    NamedTuple, Optional, Sequence, Tuple, TypeVar, Union)
 
 Rect = Tuple[int, int, int, int]
 Size = Tuple[int, int]
@@ -15,9 +18,13 @@ Offset = Tuple[int, int]
 class Action(metaclass=ABCMeta):
     """
     An object representing an abstract action performed by an actor.
+
+    An action which has nothing to do until a given time can set `wake_at`
+    to that time, in simulation seconds, for not being called again before.
     """
 
     finished: bool
+    wake_at: Optional[float] = None
 
     def __init__(self) -> None:
         self.finished = False
@@ -32,6 +39,76 @@ class Action(metaclass=ABCMeta):
         """
         return True
 
+    def __await__(self):
+        # awaited by coroutine actions, which run it until finished
+        yield self
+
+
+class WaitCondition:
+    """
+    Condition awaited by coroutine actions, fulfilled once `predicate`
+    returns `True`.
+
+    Coroutine actions can wait on any callable returning whether it's
+    fulfilled; wrapping it in a `WaitCondition` makes it awaitable too.
+    Conditions are polled, the predicate being called on every step until
+    fulfilled, hence it should be cheap: only actions setting `wake_at`
+    actually sleep.
+    """
+
+    def __init__(self, predicate: Callable[[], bool]) -> None:
+        self.predicate = predicate
+
+    def __call__(self) -> bool:
+        return self.predicate()
+
+    def __await__(self):
+        yield self
+
+
+class CoroutineAction(Action):
+    """
+    Action running a generator, or an `async def` coroutine.
+
+    Generators yield what they wait for, and coroutines await it: either an
+    action, which is run until finished, or a condition, as a callable
+    returning whether it's fulfilled. The coroutine is resumed only once
+    that's the case, and the action sleeps as long as the awaited action
+    does. Yielding `None` resumes on the next step.
+    """
+
+    def __init__(self, coroutine: Union[Generator, Coroutine]) -> None:
+        super().__init__()
+        self.coroutine = coroutine
+        self.waiting: Optional[Callable[[], bool]] = None
+
+    def __call__(self) -> bool:
+        waiting = self.waiting
+        while waiting is None or waiting():
+            try:
+                waiting = self.waiting = self.coroutine.send(None)
+            except StopIteration:
+                return True
+            if waiting is None:
+                self.wake_at = None
+                return False
+
+        self.wake_at = getattr(waiting, 'wake_at', None)
+        return False
+
+
+def coroutine_action(f: Callable[..., Union[Generator, Coroutine]]) -> Callable[..., CoroutineAction]:
+    """
+    Decorator turning a generator or coroutine function into a function
+    returning the corresponding `CoroutineAction`.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return CoroutineAction(f(*args, **kwargs))
+
+    return wrapper
+
 
 class Actor(metaclass=ABCMeta):
     """
@@ -39,6 +116,13 @@ class Actor(metaclass=ABCMeta):
 
     An actor is made up of components, that define it's actual capabilities.
     All interaction with other actors is done via actions.
+
+    `team_bit` is the team the actor belongs to, and `enemy_mask` the teams
+    it's hostile to, as bit masks. They're indexed by the scene, along with
+    the name, hence they should be set before adding the actor to a scene.
+
+    `serial` orders actors by creation, for systems to process them in the
+    same order on every run, unlike ids.
     """
 
     class State(IntEnum):
@@ -46,7 +130,13 @@ class Actor(metaclass=ABCMeta):
         INACTIVE = 0
         ACTIVE = 1
 
+    team_bit: int = 0
+    enemy_mask: int = 0
+
+    _serials = count()
+
     def __init__(self, x: int, y: int, name: str='') -> None:
+        self.serial = next(Actor._serials)
         self.x = x
         self.y = y
         self.state = Actor.State.ACTIVE
@@ -69,12 +159,20 @@ class Actor(metaclass=ABCMeta):
 class Scene(list):
     """
     A scene for actors.
+
+    Actors are indexed by class, including their base classes, by name and
+    by team bit, as they're added to and removed from the scene, for
+    queries not to scan the whole scene.
     """
 
     def __init__(self, actors: Optional[Iterable[Actor]]=None):
-        super().__init__(actors)
+        super().__init__(actors or ())
+        self._by_class: Dict[type, Dict[Actor, None]] = {}
+        # names may be shared, by several actors
+        self._by_name: Dict[str, Dict[Actor, None]] = {}
+        self._by_team: Dict[int, Dict[Actor, None]] = {}
         for actor in self:
-            actor.scene = self
+            self._add(actor)
 
     def tick(self) -> Sequence[Action]:
         to_remove = []
@@ -86,19 +184,132 @@ class Scene(list):
                 if actor.state == Actor.State.INACTIVE:
                     to_remove.append(actor)
 
+        if to_remove:
+            # filter the removed actors out in a single pass, instead of
+            # searching each of them in the list
+            removed = set(to_remove)
+            super().__setitem__(slice(None), [actor for actor in self if actor not in removed])
+
         for actor in to_remove:
-            self.remove(actor)
             actor.destroy()
-            actor.scene = None
+            self._discard(actor)
 
     def append(self, actor: Actor) -> None:
         super().append(actor)
-        actor.scene = self
+        self._add(actor)
 
     def extend(self, iterable: Iterable[Actor]) -> None:
-        super().extend(iterable)
-        for actor in iterable:
-            actor.scene = self
+        actors = list(iterable)
+        super().extend(actors)
+        for actor in actors:
+            self._add(actor)
+
+    def insert(self, index: int, actor: Actor) -> None:
+        super().insert(index, actor)
+        self._add(actor)
+
+    def remove(self, actor: Actor) -> None:
+        super().remove(actor)
+        self._discard(actor)
+
+    def pop(self, index: int=-1) -> Actor:
+        actor = super().pop(index)
+        self._discard(actor)
+        return actor
+
+    def clear(self) -> None:
+        for actor in self:
+            self._discard(actor)
+        super().clear()
+
+    def __setitem__(self, key, value):
+        old = self[key] if isinstance(key, slice) else [self[key]]
+        new = list(value) if isinstance(key, slice) else [value]
+        super().__setitem__(key, new if isinstance(key, slice) else value)
+        for actor in old:
+            self._discard(actor)
+        for actor in new:
+            self._add(actor)
+
+    def __delitem__(self, key):
+        old = self[key] if isinstance(key, slice) else [self[key]]
+        super().__delitem__(key)
+        for actor in old:
+            self._discard(actor)
+
+    def __iadd__(self, iterable: Iterable[Actor]):
+        self.extend(iterable)
+        return self
+
+    def of_type(self, cls: type) -> Collection[Actor]:
+        """
+        Return the actors being instances of the given class, as a view.
+        """
+        return self._by_class.get(cls, _EMPTY).keys()
+
+    def find(self, name: str) -> Optional[Actor]:
+        """
+        Return the actor with the given name, if any, the first one added if
+        several share it.
+        """
+        actors = self._by_name.get(name)
+        return next(iter(actors)) if actors else None
+
+    def in_teams(self, mask: int) -> Iterator[Actor]:
+        """
+        Yield the actors belonging to any of the teams of the mask.
+        """
+        for bit, actors in self._by_team.items():
+            if bit & mask:
+                for actor in actors:
+                    # actors in several of the teams are yielded for the
+                    # lowest one only
+                    common = actor.team_bit & mask
+                    if common & -common == bit:
+                        yield actor
+
+    def enemies_of(self, actor: Actor) -> Iterator[Actor]:
+        return self.in_teams(actor.enemy_mask)
+
+    def enemies_within(self, actor: Actor, radius: float) -> Iterator[Actor]:
+        """
+        Yield the enemies of the actor whose position is within the radius.
+        """
+        x, y = actor.x, actor.y
+        radius_sq = radius * radius
+        for enemy in self.in_teams(actor.enemy_mask):
+            dx = enemy.x - x
+            dy = enemy.y - y
+            if dx * dx + dy * dy <= radius_sq:
+                yield enemy
+
+    def _add(self, actor: Actor):
+        actor.scene = self
+        for cls in type(actor).__mro__:
+            self._by_class.setdefault(cls, {})[actor] = None
+        self._by_name.setdefault(actor.name, {})[actor] = None
+        team_bit = actor.team_bit
+        while team_bit:
+            bit = team_bit & -team_bit
+            self._by_team.setdefault(bit, {})[actor] = None
+            team_bit ^= bit
+
+    def _discard(self, actor: Actor):
+        actor.scene = None
+        for cls in type(actor).__mro__:
+            actors = self._by_class.get(cls)
+            if actors is not None:
+                actors.pop(actor, None)
+        actors = self._by_name.get(actor.name)
+        if actors is not None:
+            actors.pop(actor, None)
+            if not actors:
+                del self._by_name[actor.name]
+        for actors in self._by_team.values():
+            actors.pop(actor, None)
+
+
+_EMPTY: Dict[Actor, None] = {}
 
 
 class Component:
@@ -119,33 +330,114 @@ class Component:
 
 
 class Event:
+    """
+    Event notifying its subscribers when called.
+
+    Events called with no arguments within `batch_changes()` are coalesced:
+    each of their subscribers is notified only once, when the batch ends.
+
+    Subscribers are kept in an insertion ordered dict, for unsubscribing to
+    take constant time however many listeners there are.
+    """
 
     def __init__(self) -> None:
         super().__init__()
-        self.subscribers = []
+        self.subscribers: Dict[Callable[..., None], None] = {}
 
     def __iadd__(self, listener: Callable[..., None]):
-        self.subscribers.append(listener)
+        self.subscribers[listener] = None
         return self
 
     def __isub__(self, listener: Callable[..., None]):
-        self.subscribers.remove(listener)
+        self.subscribers.pop(listener, None)
         return self
 
     def __call__(self, *args):
-        for listener in self.subscribers:
+        if _batch_depth and not args:
+            _pending_events[self] = None
+            return
+        # listeners may unsubscribe while being notified
+        for listener in tuple(self.subscribers):
             listener(*args)
 
 
+_batch_depth = 0
+# events called within the current batch, in call order
+_pending_events: Dict[Event, None] = {}
+
+
+@contextmanager
+def batch_changes():
+    """
+    Context deferring the change notifications of props until it ends.
+
+    Subscribers of several changed props, or of a prop changed several
+    times, are notified once, with the final values. Batches can be nested,
+    changes are flushed at the end of the outermost one.
+    """
+    global _batch_depth
+    _batch_depth += 1
+    try:
+        yield
+    finally:
+        _batch_depth -= 1
+        if not _batch_depth:
+            flush_changes()
+
+
+def flush_changes():
+    """
+    Notify the subscribers of the events called within a batch, each once.
+
+    Changes made by the subscribers themselves are batched too, and flushed
+    in turn, until there are none left.
+    """
+    global _batch_depth
+    while _pending_events:
+        # deduplicate the subscribers, keeping the order of notification
+        subscribers = dict.fromkeys(
+            listener for event in _pending_events for listener in event.subscribers)
+        _pending_events.clear()
+
+        _batch_depth += 1
+        try:
+            for listener in subscribers:
+                listener()
+        finally:
+            _batch_depth -= 1
+
+
+# props read by the computed prop being evaluated, if any, by id as list
+# props aren't hashable
+_dependencies: Optional[Dict[int, object]] = None
+
+
+def _notify_change(prop: Union['Prop', 'ListProp']):
+    if not prop.dependents:
+        prop.on_changed()
+        return
+    # the whole graph of dependent computed props is marked stale before any
+    # of them is evaluated, for subscribers not to see intermediate results
+    with batch_changes():
+        prop.on_changed()
+        for dependent in list(prop.dependents):
+            dependent._invalidate()
+
+
 T = TypeVar('T')
 class Prop(Generic[T]):
 
     def __init__(self, default_value: T) -> None:
         self.on_changed = Event()
+        # computed props depending on this one, invalidated right away even
+        # within batches
+        self.dependents: Dict[ComputedProp, None] = {}
         self.__v = default_value
 
     @property
     def value(self) -> T:
+        if _dependencies is not None:
+            _dependencies[id(self)] = self
         return self.__v
 
     @value.setter
@@ -153,54 +445,241 @@ class Prop(Generic[T]):
         changed = self.__v != v
         self.__v = v
         if changed:
-            self.on_changed()
+            _notify_change(self)
+
+
+class ListChange(IntEnum):
+    """
+    Kind of change of a list prop.
+    """
+
+    INSERT = 0
+    REMOVE = 1
+    SET = 2
+    CLEAR = 3
+    REORDER = 4
+
+
+class ListDelta(NamedTuple):
+    """
+    Change of a list prop.
+
+    `items` are the inserted, removed or new items, starting at `index`, and
+    `old_items` the replaced ones, for `SET` changes, whose index is a slice
+    when setting a slice. `CLEAR` deltas hold all the removed items, while
+    `REORDER` ones, for sorting and reversing, hold none.
+    """
+
+    change: ListChange
+    index: Union[int, slice]
+    items: Tuple[Any, ...] = ()
+    old_items: Tuple[Any, ...] = ()
 
 
 _T = TypeVar('_T')
 class ListProp(List[_T]):
+    """
+    Reactive list.
+
+    Besides `on_changed`, every change emits a `ListDelta` describing it,
+    via `on_delta`, for listeners to keep their own data up to date
+    incrementally, instead of scanning the whole list. Deltas are never
+    batched.
+    """
 
     def __init__(self):
         super().__init__()
-        self.value = self
         self.on_changed = Event()
+        self.on_delta = Event()
+        # computed props depending on this one
+        self.dependents: Dict[ComputedProp, None] = {}
+
+    @property
+    def value(self) -> List[_T]:
+        if _dependencies is not None:
+            _dependencies[id(self)] = self
+        return self
 
     def __setitem__(self, key, value):
-        super().__setitem__(key, value)
-        self.on_changed()
+        if isinstance(key, slice):
+            old_items = tuple(self[key])
+            value = list(value)
+            super().__setitem__(key, value)
+            self._changed(ListChange.SET, key, tuple(value), old_items)
+        else:
+            old_item = self[key]
+            super().__setitem__(key, value)
+            self._changed(ListChange.SET, self._normalize(key), (value,), (old_item,))
+
+    def __delitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            old_items = tuple(self[key])
+            super().__delitem__(key)
+            if step == 1:
+                self._changed(ListChange.REMOVE, start, old_items)
+            else:
+                self._changed(ListChange.SET, key, (), old_items)
+        else:
+            index = self._normalize(key)
+            old_item = self[index]
+            super().__delitem__(index)
+            self._changed(ListChange.REMOVE, index, (old_item,))
+
+    def __iadd__(self, __iterable: Iterable[_T]):
+        self.extend(__iterable)
+        return self
 
     def remove(self, __value: _T):
-        elem = super().remove(__value)
-        self.on_changed()
-        return elem
-
-    def pop(self, __index: int) -> _T:
-        elem = super().pop(__index=__index)
-        self.on_changed()
+        index = self.index(__value)
+        super().__delitem__(index)
+        self._changed(ListChange.REMOVE, index, (__value,))
+
+    def pop(self, __index: int=-1) -> _T:
+        index = self._normalize(__index)
+        elem = super().pop(index)
+        self._changed(ListChange.REMOVE, index, (elem,))
         return elem
 
     def append(self, __object: _T):
         super().append(__object)
-        self.on_changed()
+        self._changed(ListChange.INSERT, len(self) - 1, (__object,))
 
     def extend(self, __iterable: Iterable[_T]):
-        super().extend(__iterable)
-        self.on_changed()
+        items = tuple(__iterable)
+        index = len(self)
+        super().extend(items)
+        self._changed(ListChange.INSERT, index, items)
 
     def insert(self, __index: int, __object: _T):
-        super().insert(__index, __object)
-        self.on_changed()
+        # clamp the index like list.insert() does
+        length = len(self)
+        index = min(max(__index + length if __index < 0 else __index, 0), length)
+        super().insert(index, __object)
+        self._changed(ListChange.INSERT, index, (__object,))
 
     def reverse(self):
         super().reverse()
-        self.on_changed()
+        self._changed(ListChange.REORDER, 0)
 
-    def sort(self):
-        super().sort()
-        self.on_changed()
+    def sort(self, *, key=None, reverse=False):
+        super().sort(key=key, reverse=reverse)
+        self._changed(ListChange.REORDER, 0)
 
     def clear(self):
+        old_items = tuple(self)
         super().clear()
-        self.on_changed()
+        self._changed(ListChange.CLEAR, 0, old_items)
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('list index out of range')
+        return index
+
+    def _changed(self, change: ListChange, index: Union[int, slice], items: Tuple[Any, ...]=(), old_items: Tuple[Any, ...]=()):
+        if self.on_delta.subscribers:
+            self.on_delta(ListDelta(change, index, items, old_items))
+        _notify_change(self)
+
+
+class _ComputedEvent(Event):
+    """
+    Change event of a computed prop, which evaluates it on subscription, for
+    its dependencies to be tracked from then on.
+    """
+
+    def __init__(self, prop: 'ComputedProp') -> None:
+        super().__init__()
+        self.prop = weakref.ref(prop)
+
+    def __iadd__(self, listener: Callable[..., None]):
+        super().__iadd__(listener)
+        self.prop().value
+        return self
+
+
+class ComputedProp(Generic[T]):
+    """
+    Prop derived from other props by a function.
+
+    The props read by the function are tracked as its dependencies, and its
+    result is memoized until one of them changes. Evaluation is lazy: a
+    change just marks the result, and the ones of the computed props
+    depending on it, as stale, and they're recomputed on the next read, also
+    within batches. Props having subscribers are recomputed right away
+    instead, or at the end of the batch for batched changes, and their
+    subscribers are notified only if the result actually changed.
+    """
+
+    def __init__(self, func: Callable[..., T]) -> None:
+        self.on_changed = _ComputedEvent(self)
+        self.func = func
+        # reactive class owning the prop, passed to the function
+        self.owner = None
+        self.dependencies: Dict[int, object] = {}
+        # computed props depending on this one
+        self.dependents: Dict[ComputedProp, None] = {}
+        self.stale = True
+        self.__v: Optional[T] = None
+        # result last seen by the subscribers, while a check is pending
+        self.__notified: Optional[T] = None
+        self.__pending = False
+        self.__check = Event()
+        self.__check += self._check
+
+    @property
+    def value(self) -> T:
+        global _dependencies
+        if _dependencies is not None:
+            _dependencies[id(self)] = self
+        if self.stale:
+            outer = _dependencies
+            _dependencies = {}
+            try:
+                self.__v = self.func() if self.owner is None else self.func(self.owner)
+            finally:
+                dependencies, _dependencies = _dependencies, outer
+            self._subscribe(dependencies)
+            self.stale = False
+        return self.__v
+
+    def _subscribe(self, dependencies: Dict[int, object]):
+        for key in self.dependencies.keys() - dependencies.keys():
+            del self.dependencies[key].dependents[self]
+        for key in dependencies.keys() - self.dependencies.keys():
+            dependencies[key].dependents[self] = None
+        self.dependencies = dependencies
+
+    def _invalidate(self):
+        if self.stale:
+            return
+        # computed props are just marked stale, and only the observed ones
+        # are evaluated
+        self.stale = True
+        for dependent in list(self.dependents):
+            dependent._invalidate()
+        if self.on_changed.subscribers and not self.__pending:
+            self.__pending = True
+            self.__notified = self.__v
+            # deferred to the end of the batch, if any
+            self.__check()
+
+    def _check(self):
+        self.__pending = False
+        old, self.__notified = self.__notified, None
+        if self.value != old:
+            self.on_changed()
+
+
+def computed(func: Callable[..., T]) -> ComputedProp[T]:
+    """
+    Decorator turning a function into a computed prop.
+
+    In the body of a reactive class, the function receives the class.
+    """
+    return ComputedProp(func)
 
 
 class Reactive(type):
@@ -216,7 +695,11 @@ class Reactive(type):
             else:
                 prop = Prop(attrs.get(propname, proptype()))
             attrs[propname] = prop
-        return super(Reactive, cls).__new__(cls, name, bases, attrs)
+        klass = super(Reactive, cls).__new__(cls, name, bases, attrs)
+        for attr in attrs.values():
+            if isinstance(attr, ComputedProp):
+                attr.owner = klass
+        return klass
 
 
 def react(**props):
@@ -234,55 +717,163 @@ def react(**props):
     return decorator
 
 
+def react_deltas(*props: ListProp):
+    """
+    Decorator for registering methods as handlers of the deltas of list
+    props, called with each `ListDelta`.
+    """
+
+    def decorator(f):
+        setattr(f, '_observed_deltas', props)
+        return f
+
+    return decorator
+
+
 class ReactiveListener(type):
     """
     Metaclass for listener classes, that react to state changes.
+
+    The `@react` and `@react_deltas` methods of a class, including the
+    inherited ones, are collected once, when the class is created, hence
+    subscribing the instances is just a loop over them.
     """
     def __init__(self, name, bases, attrs):
+        # method, observed props and observed list props deltas of each
+        # reaction, by name
+        reactions = {}
+        for klass in reversed(self.__mro__):
+            for attr_name, attr in vars(klass).items():
+                if hasattr(attr, '_observed_props') or hasattr(attr, '_observed_deltas'):
+                    reactions[attr_name] = (
+                        attr,
+                        tuple(getattr(attr, '_observed_props', {}).items()),
+                        getattr(attr, '_observed_deltas', ()))
+                elif attr_name in reactions:
+                    # overridden by a non-reactive attribute
+                    del reactions[attr_name]
+        self._reactions = tuple(reactions.values())
 
         def decorator(f):
             @wraps(f)
             def init_wrapper(self, *args, **kwargs):
                 f(self, *args, **kwargs)
 
-                subscriptions = []
+                # subscribe once, even if several classes of the hierarchy
+                # wrap their initializer
+                if '_subscriptions' in self.__dict__:
+                    return
+
+                self_ref = weakref.ref(self)
+                subscriptions = self._subscriptions = []
+                for method, props, delta_props in type(self)._reactions:
+                    if props:
+                        handler = partial(_call_reaction, self_ref, method, props)
+                        for _, prop in props:
+                            prop.on_changed += handler
+                            subscriptions.append((prop.on_changed, handler))
+                    if delta_props:
+                        handler = partial(_call_delta_reaction, self_ref, method)
+                        for prop in delta_props:
+                            prop.on_delta += handler
+                            subscriptions.append((prop.on_delta, handler))
+
+                weakref.finalize(self, _unsubscribe, subscriptions)
 
-                for _, meth in inspect.getmembers(self, inspect.ismethod):
-                    if not hasattr(meth, '_observed_props'):
-                        continue
+            return init_wrapper
 
-                    meth_ref = weakref.WeakMethod(meth)
-                    props = meth._observed_props
+        self.__init__ = decorator(self.__init__)
 
-                    def callback(method, props):
-                        method()(**{arg: prop.value for arg, prop in props.items()})
+        super(ReactiveListener, self).__init__(name, bases, attrs)
 
-                    handler = partial(callback, meth_ref, props)
-                    for prop in props.values():
-                        prop.on_changed += handler
-                        subscriptions.append((prop, handler))
 
-                def unsubscribe():
-                    for prop, handler in subscriptions:
-                        prop.on_changed -= handler
+def _call_reaction(self_ref, method, props):
+    listener = self_ref()
+    if listener is not None:
+        method(listener, **{arg: prop.value for arg, prop in props})
 
-                weakref.finalize(self, unsubscribe)
 
-            return init_wrapper
+def _call_delta_reaction(self_ref, method, delta):
+    listener = self_ref()
+    if listener is not None:
+        method(listener, delta)
 
-        self.__init__ = decorator(self.__init__)
 
-        super(ReactiveListener, self).__init__(name, bases, attrs)
+def _unsubscribe(subscriptions):
+    for event, handler in subscriptions:
+        event -= handler
+
+
+class ActionScheduler:
+    """
+    Pending actions of a game.
+
+    Actions are called once per `run()` until they're finished, except for
+    sleeping ones, which are kept in a heap ordered by their `wake_at` time,
+    and called again only once due. Hence the cost of a run is proportional
+    to the number of actions ready to run, regardless of the sleeping ones.
+
+    Iterating a scheduler yields the ready actions, followed by the sleeping
+    ones by wake up time.
+    """
+
+    def __init__(self, actions: Optional[Iterable[Action]]=None) -> None:
+        self.ready: List[Action] = list(actions or ())
+        # (wake up time, insertion counter, action)
+        self.sleeping: List[Tuple[float, int, Action]] = []
+        self._counter = count()
+
+    def __len__(self) -> int:
+        return len(self.ready) + len(self.sleeping)
+
+    def __iter__(self) -> Iterator[Action]:
+        yield from self.ready
+        for _, _, action in sorted(self.sleeping):
+            yield action
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (ActionScheduler, list)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def append(self, action: Action):
+        self.ready.append(action)
+
+    def extend(self, actions: Iterable[Action]):
+        self.ready.extend(actions)
+
+    def clear(self):
+        self.ready.clear()
+        self.sleeping.clear()
+
+    def run(self, now: float):
+        """
+        Call the ready actions and the sleeping ones due by `now`.
+        """
+        sleeping = self.sleeping
+        ready = self.ready
+        while sleeping and sleeping[0][0] <= now:
+            ready.append(heapq.heappop(sleeping)[2])
+
+        self.ready = []
+        for action in ready:
+            action.finished = action()
+            if not action.finished:
+                wake_at = getattr(action, 'wake_at', None)
+                if wake_at is not None and wake_at > now:
+                    heapq.heappush(sleeping, (wake_at, next(self._counter), action))
+                else:
+                    self.ready.append(action)
 
 
 class Game:
 
     scene: Scene
-    actions: List[Action]
+    actions: ActionScheduler
 
     def __init__(self) -> None:
         self.scene = Scene([])
-        self.actions = []
+        self.actions = ActionScheduler()
 
     def enter(self):
         pass
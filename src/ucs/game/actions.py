@@ -1,10 +1,10 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
-from raylibpy.spartan import get_time
 from ucs.anim import AnimationPlayer
+from ucs.clock import clock_get_time
 from ucs.components.walk import WalkComponent, WalkDirection
-from ucs.foundation import Action, Actor
+from ucs.foundation import Action, Actor, WaitCondition, coroutine_action
 from ucs.game.components import HumanoidComponent
 from ucs.game.config import TIME_STEP
 from ucs.game.items.item import Item
@@ -18,28 +18,52 @@ class SequenceAction(Action):
     def __init__(self, actions: List[Action]) -> None:
         super().__init__()
         self.actions = actions
+        # index of the current action
+        self.current = 0
 
     def __call__(self) -> bool:
-        while self.actions:
-            if not self.actions[0]():
+        actions = self.actions
+        while self.current < len(actions):
+            action = actions[self.current]
+            if not action():
+                # sleep as long as the current action does
+                self.wake_at = getattr(action, 'wake_at', None)
                 return False
-            self.actions.pop(0)
+            self.current += 1
         return True
 
 
-class ShowMessageAction(Action):
-    def __init__(self, message: str) -> None:
-        self.message = message
-        self.shown = False
+def prompt_cleared() -> WaitCondition:
+    """
+    Wait for the UI prompt to be dismissed, polling it every step.
+    """
+    ui = ui_get_instance()
+    return WaitCondition(lambda: not ui.prompt)
 
-    def __call__(self) -> bool:
-        ui = ui_get_instance()
-        if not self.shown:
-            ui.show_message(self.message)
-            self.shown = True
-            return False
 
-        return not ui.prompt
+def walker_arrived(walker: WalkComponent) -> WaitCondition:
+    """
+    Wait for a walker to reach its destination tile, polling it every step.
+    """
+    return WaitCondition(lambda: walker.dst is None)
+
+
+def animation_finished(anim: AnimationPlayer) -> WaitCondition:
+    """
+    Play an animation by one time step per simulation step, until finished.
+    """
+
+    def play():
+        anim.play(TIME_STEP)
+        return anim.is_finished
+
+    return WaitCondition(play)
+
+
+@coroutine_action
+def show_message(message: str):
+    ui_get_instance().show_message(message)
+    yield prompt_cleared()
 
 
 @dataclass
@@ -55,35 +79,23 @@ class WieldItemAction(Action):
         return True
 
 
-class MeleeAttackAction(Action):
-
-    def __init__(self, actor: Actor, damage: int, pre_anim: Optional[AnimationPlayer]=None, post_anim: Optional[AnimationPlayer]=None) -> None:
-        self.actor = actor
-        self.damage = damage
-        self.pre_anim = pre_anim
-        self.post_anim = post_anim
-
-    def __call__(self) -> bool:
-        is_anim_finished = True
-        if self.pre_anim is not None:
-            self.pre_anim.play(TIME_STEP)
-            is_anim_finished &= self.pre_anim.is_finished
-            if is_anim_finished:
-                self.__do_damage()
+@coroutine_action
+def melee_attack(actor: Actor, damage: int, pre_anim: Optional[AnimationPlayer]=None, post_anim: Optional[AnimationPlayer]=None):
+    if pre_anim is not None:
+        yield animation_finished(pre_anim)
+        _do_damage(actor, damage)
 
-        if is_anim_finished and self.post_anim is not None:
-            self.post_anim.play(TIME_STEP)
-            is_anim_finished &= self.post_anim.is_finished
+    if post_anim is not None:
+        yield animation_finished(post_anim)
 
-        return is_anim_finished
 
-    def __do_damage(self):
-        tilemap = tilemap_get_active()
-        col, row = tilemap.pixels_to_coords(self.actor.position)
-        nearby_actors = list(tilemap.get_nearest_occupants(col, row))
-        for actor in nearby_actors:
-            if actor != self.actor and self.actor.metadata.get('team_bit', 0) & actor.metadata.get('enemy_mask', 0):
-                actor.state = Actor.State.INACTIVE
+def _do_damage(actor: Actor, damage: int):
+    tilemap = tilemap_get_active()
+    col, row = tilemap.pixels_to_coords(actor.position)
+    nearby_actors = list(tilemap.get_nearest_occupants(col, row))
+    for nearby in nearby_actors:
+        if nearby is not actor and actor.team_bit & nearby.enemy_mask:
+            nearby.state = Actor.State.INACTIVE
 
 
 class WalkAction(Action):
@@ -113,6 +125,6 @@ class WaitAction(Action):
 
     def __call__(self) -> bool:
         if self.started_at is None:
-            self.started_at = get_time()
-        self.seconds -= get_time() - self.started_at
-        return self.seconds <= 0
+            self.started_at = clock_get_time()
+            self.wake_at = self.started_at + self.seconds
+        return clock_get_time() >= self.wake_at
@@ -3,6 +3,13 @@ import raylibpy.consts as keys
 
 TIME_STEP = 1 / 60.0
 
+#: Simulation steps run at most per rendered frame, when catching up.
+MAX_STEPS_PER_FRAME = 5
+
+#: Keep component data in structure-of-arrays columns, updated by vectorized
+#: passes (requires NumPy).
+USE_SOA = False
+
 
 #: Key configurations for each player:
 #: (up, down, left, right, primary, secondary)
@@ -23,29 +23,37 @@ class NPC(Actor):
 
     def __init__(self, position: Position, body_frame: Rect, behavior: Type[NPCBehavior], team_bit: ActorTeamBit=0, enemy_mask: int=0):
         super().__init__(*position)
-        self.metadata.update({
-            'team_bit': team_bit,
-            'enemy_mask': enemy_mask,
-        })
+        self.team_bit = team_bit
+        self.enemy_mask = enemy_mask
 
         self.humanoid = HumanoidComponent(self, body_frame)
         self.behavior = behavior(self)
         self.sight_area = CollisionComponent(self, 30)
         self.walker = WalkComponent(self, 1)
-        self.seen_actors = []
+        self.seen_actors = set()
+        # actors in sight yet to be reacted to, in the order they came
+        self.unseen_actors = {}
         self.current_action = None
 
     def tick(self) -> Optional[Action]:
+        # keep track of the actors coming into sight also while busy
+        for actor in self.sight_area.exited:
+            self.unseen_actors.pop(actor, None)
+        for actor in self.sight_area.entered:
+            if actor not in self.seen_actors:
+                self.unseen_actors[actor] = None
+
         if self.current_action is not None and not self.current_action.finished:
             return None
 
         self.current_action = None
 
-        seen_actor = self.sight_area.collision
-        if seen_actor is not None:
-            if seen_actor not in self.seen_actors:
-                self.seen_actors.append(seen_actor)
-                self.current_action = self.behavior.on_sight(seen_actor)
+        # react to the first actor in sight which wasn't seen before
+        while self.unseen_actors and self.current_action is None:
+            seen_actor = next(iter(self.unseen_actors))
+            del self.unseen_actors[seen_actor]
+            self.seen_actors.add(seen_actor)
+            self.current_action = self.behavior.on_sight(seen_actor)
 
         if self.current_action is None:
             self.current_action = self.behavior.on_idle()
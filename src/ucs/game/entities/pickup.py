@@ -1,3 +1,4 @@
+from operator import attrgetter
 from typing import Optional, Tuple
 
 from ucs.components import CollisionComponent, SpriteComponent
@@ -17,10 +18,10 @@ class Pickup(Actor):
         self.name = name
 
     def tick(self) -> Optional[Action]:
-        if self.collider.collision is not None and isinstance(self.collider.collision, Player):
-            self.state = Actor.State.INACTIVE
-            target = self.collider.collision
-            return WieldItemAction(target.humanoid, self.item, self.name)
+        for target in sorted(self.collider.contacts, key=attrgetter('serial')):
+            if isinstance(target, Player):
+                self.state = Actor.State.INACTIVE
+                return WieldItemAction(target.humanoid, self.item, self.name)
 
         return None
 
@@ -8,16 +8,15 @@ from ucs.game.components import HumanoidComponent
 from ucs.game.config import PLAYER_CONTROLS_MAP
 from ucs.game.consts import ActorTeamBit
 from ucs.gfx import get_camera
-from raylibpy.spartan import is_key_down, is_key_pressed
+from ucs.input import input_is_key_down, input_is_key_pressed
+
 
 class Player(Actor):
 
     def __init__(self, position: Position, gamepad: int, body_frame: Rect):
         super().__init__(*position)
-        self.metadata.update({
-            'team_bit': ActorTeamBit.PLAYER,
-            'enemy_mask': ActorTeamBit.ENEMY,
-        })
+        self.team_bit = ActorTeamBit.PLAYER
+        self.enemy_mask = ActorTeamBit.ENEMY
         self.gamepad = gamepad
         self.humanoid = HumanoidComponent(self, body_frame)
         self.collider = CollisionComponent(self, 16)
@@ -47,13 +46,13 @@ class Player(Actor):
         up, down, left, right, primary, secondary = PLAYER_CONTROLS_MAP[self.gamepad]
 
         direction = WalkDirection.STOP
-        if is_key_down(up):
+        if input_is_key_down(up):
             direction = WalkDirection.NORTH
-        elif is_key_down(down):
+        elif input_is_key_down(down):
             direction = WalkDirection.SOUTH
-        elif is_key_down(left):
+        elif input_is_key_down(left):
             direction = WalkDirection.WEST
-        elif is_key_down(right):
+        elif input_is_key_down(right):
             direction = WalkDirection.EAST
 
         # start new walk action
@@ -64,10 +63,10 @@ class Player(Actor):
         elif self.walk_action is not None:
             self.walk_action.direction = direction
 
-        if self.primary_action is None and is_key_pressed(primary) and self.humanoid.primary_item is not None:
+        if self.primary_action is None and input_is_key_pressed(primary) and self.humanoid.primary_item is not None:
             self.primary_action = self.humanoid.primary_item.use()
             return self.primary_action
 
-        if self.secondary_action is None and is_key_pressed(secondary) and self.humanoid.secondary_item is not None:
+        if self.secondary_action is None and input_is_key_pressed(secondary) and self.humanoid.secondary_item is not None:
             self.secondary_action = self.humanoid.secondary_item.use()
             return self.secondary_action
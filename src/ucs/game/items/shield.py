@@ -17,7 +17,8 @@ class Shield(Item):
         off_x, off_y = equip_offset
         off_x += _OFFSET[0]
         off_y += _OFFSET[1]
-        self.sprite = SpriteComponent(actor, _SPRITE, (off_x, off_y))
+        # drawn over the body of the actor
+        self.sprite = SpriteComponent(actor, _SPRITE, (off_x, off_y), layer=1)
 
     def unequip(self):
         self.sprite.destroy()
@@ -1,7 +1,7 @@
 from ucs.anim import AnimationPlayer, VectorPropertyAnimation
 from ucs.components.sprite import SpriteComponent
 from ucs.foundation import Action, Actor, Offset
-from ucs.game.actions import MeleeAttackAction
+from ucs.game.actions import melee_attack
 
 from .item import BodyPart, Item
 
@@ -20,7 +20,8 @@ class Sword(Item):
         off_x, off_y = equip_offset
         off_x += _OFFSET[0]
         off_y += _OFFSET[1]
-        self.sprite = SpriteComponent(actor, _SPRITE, (off_x, off_y))
+        # drawn over the body of the actor
+        self.sprite = SpriteComponent(actor, _SPRITE, (off_x, off_y), layer=1)
         self.equipped_by = actor
 
     def unequip(self):
@@ -57,4 +58,4 @@ class Sword(Item):
                     ]),
                 ])
 
-        return MeleeAttackAction(self.equipped_by, 3, pre_anim=pre_anim, post_anim=post_anim)
+        return melee_attack(self.equipped_by, 3, pre_anim=pre_anim, post_anim=post_anim)
@@ -1,6 +1,10 @@
-from ucs.foundation import Reactive
+from ucs.foundation import Reactive, computed
 
 
 class State(metaclass=Reactive):
 
     pickups: list[str]
+
+    @computed
+    def armed(cls) -> bool:
+        return 'sword' in cls.pickups.value and 'shield' in cls.pickups.value
@@ -3,21 +3,27 @@ import random
 from typing import Optional
 
 from ucs.components.walk import WalkDirection
-from ucs.foundation import Action, Game, ReactiveListener, react
-from ucs.game.actions import (SequenceAction, ShowMessageAction, WaitAction,
-                              WalkAction)
+from ucs.foundation import (Action, Game, ReactiveListener, coroutine_action,
+                            react)
+from ucs.game.actions import WaitAction, WalkAction, show_message
 from ucs.game.consts import ActorTeamBit
 from ucs.game.entities import Pickup, Player
 from ucs.game.entities.npc import NPC, NPCBehavior
 from ucs.game.items.shield import Shield
 from ucs.game.items.sword import Sword
 from ucs.game.state import State
-from ucs.tilemap import TileMap, tilemap_set_active
+from ucs.pathfinding import (UNREACHED, pathfinding_add_target,
+                             pathfinding_get_distance,
+                             pathfinding_get_next_tile)
+from ucs.tilemap import TileMap, tilemap_get_active, tilemap_set_active
 
 CAVE_DUDE = (0, 104, 16, 16)
 CAVE_BABE = (17, 86, 16, 16)
 CAVE_BRUTE = (17, 172, 16, 14)
 
+#: Seconds mobs within reach of the player wait for their way to clear.
+CHASE_RETRY_TIME = 0.25
+
 
 class TutorialNPCBehavior(NPCBehavior, metaclass=ReactiveListener):
 
@@ -29,41 +35,34 @@ class TutorialNPCBehavior(NPCBehavior, metaclass=ReactiveListener):
 
     def on_sight(self, _) -> Optional[Action]:
         if not self.weapons_given:
-
-            def spawn_pickups():
-                x, y = self.npc.position
-                self.npc.scene.extend([
-                    Pickup((x - 32, y), Shield(), 'shield'),
-                    Pickup((x + 32, y), Sword(), 'sword'),
-                ])
-                self.weapons_given = True
-                return True
-
-            return SequenceAction([
-                ShowMessageAction('It\'s dangerous to go alone!\nTake these!'),
-                spawn_pickups,
-            ])
+            return self.give_weapons()
 
     def on_idle(self) -> Optional[Action]:
         if self.weapons_collected and not self.mobs_spawned:
             self.mobs_spawned = True
+            return self.spawn_mobs()
+
+    @coroutine_action
+    def give_weapons(self):
+        yield show_message('It\'s dangerous to go alone!\nTake these!')
+        x, y = self.npc.position
+        self.npc.scene.extend([
+            Pickup((x - 32, y), Shield(), 'shield'),
+            Pickup((x + 32, y), Sword(), 'sword'),
+        ])
+        self.weapons_given = True
+
+    @coroutine_action
+    def spawn_mobs(self):
+        yield show_message('Now, defeat the mobs!')
+        self.npc.scene.extend([
+            NPC((656, 656), CAVE_BRUTE, MobNPCBehavior, ActorTeamBit.ENEMY, ActorTeamBit.PLAYER),
+            NPC((880, 656), CAVE_BRUTE, MobNPCBehavior, ActorTeamBit.ENEMY, ActorTeamBit.PLAYER),
+        ])
 
-            def spawn_mobs():
-                self.npc.scene.extend([
-                    NPC((656, 656), CAVE_BRUTE, MobNPCBehavior, ActorTeamBit.ENEMY, ActorTeamBit.PLAYER),
-                    NPC((880, 656), CAVE_BRUTE, MobNPCBehavior, ActorTeamBit.ENEMY, ActorTeamBit.PLAYER),
-                ])
-                self.mobs_spawned = True
-                return True
-
-            return SequenceAction([
-                ShowMessageAction('Now, defeat the mobs!'),
-                spawn_mobs,
-            ])
-
-    @react(pickups=State.pickups)
-    def on_pickups_changed(self, pickups: list[str]):
-        if 'sword' in pickups and 'shield' in pickups:
+    @react(armed=State.armed)
+    def on_armed_changed(self, armed: bool):
+        if armed:
             self.weapons_collected = True
 
 
@@ -71,11 +70,28 @@ class TutorialNPCBehavior(NPCBehavior, metaclass=ReactiveListener):
 class MobNPCBehavior(NPCBehavior):
 
     def on_idle(self) -> Optional[Action]:
-        direction = random.choice(list(WalkDirection))
-        return SequenceAction([
-            WaitAction(1.0),
-            WalkAction(self.npc.walker, direction),
-        ])
+        # chase the closest player within reach, one tile at a time
+        col, row = tilemap_get_active().pixels_to_coords(self.npc.position)
+        chase = pathfinding_get_next_tile(col, row)
+        if chase is not None:
+            (dst_col, dst_row), _ = chase
+            if dst_col != col:
+                direction = WalkDirection.WEST if dst_col < col else WalkDirection.EAST
+            else:
+                direction = WalkDirection.NORTH if dst_row < row else WalkDirection.SOUTH
+            return WalkAction(self.npc.walker, direction)
+
+        # next to the player or blocked by other mobs, hold on and retry
+        if pathfinding_get_distance(col, row) != UNREACHED:
+            return WaitAction(CHASE_RETRY_TIME)
+
+        # otherwise, wander around
+        return self.wander(random.choice(list(WalkDirection)))
+
+    @coroutine_action
+    def wander(self, direction: WalkDirection):
+        yield WaitAction(1.0)
+        yield WalkAction(self.npc.walker, direction)
 
 
 class Tutorial(Game):
@@ -85,7 +101,11 @@ class Tutorial(Game):
         tilemap = TileMap(pathlib.Path('assets', 'test_indoor.tmx'))
         tilemap_set_active(tilemap)
 
+        player = Player(tilemap.entry, 0, CAVE_DUDE)
         self.scene.extend([
-            Player(tilemap.entry, 0, CAVE_DUDE),
+            player,
             NPC((768, 624), CAVE_BABE, TutorialNPCBehavior, ActorTeamBit.FRIEND)
         ])
+
+        # let the mobs chase the player
+        pathfinding_add_target(player)
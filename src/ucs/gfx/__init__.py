@@ -0,0 +1,445 @@
+import heapq
+import pathlib
+from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+from enum import IntEnum
+from operator import attrgetter
+from typing import (Any, ContextManager, Dict, Iterable, Iterator, List,
+                    Mapping, Optional, Sequence)
+
+from ucs.foundation import Position, Rect, Size
+from ucs.gfx.backend import Backend, Color
+
+BLACK: Color = (0, 0, 0, 255)
+WHITE: Color = (255, 255, 255, 255)
+
+_backend: Backend = None
+_camera: Any = None
+_camera_previous_target: Optional[Position] = None
+_screen_width: int = 0
+_screen_height: int = 0
+
+
+class RenderStage(metaclass=ABCMeta):
+
+    @abstractmethod
+    def enter(self):
+        pass
+
+    @abstractmethod
+    def exit(self):
+        pass
+
+
+class DefaultRenderStage(RenderStage):
+
+    def enter(self):
+        _backend.begin_mode2d(_camera)
+
+    def exit(self):
+        _backend.end_mode2d()
+
+
+class MaskedRenderStage(RenderStage):
+
+    def __init__(self) -> None:
+        self.mask_texture: Any = None
+        self.tilemap_size: Size = (0, 0)
+        self.tile_size: Size = (0, 0)
+        self.sprite_size: Size = (0, 0)
+
+        shader_dir = pathlib.Path('assets', 'shaders')
+        self.shader = _backend.load_shader(
+            str(shader_dir.joinpath('mask.vs')),
+            str(shader_dir.joinpath('mask.fs')))
+
+        self.mask_texture_loc = _backend.get_shader_location(self.shader, "texture1")
+        self.sprite_size_loc = _backend.get_shader_location(self.shader, "spriteSize")
+        self.tilemap_size_loc = _backend.get_shader_location(self.shader, "tilemapSize")
+        self.tile_size_loc = _backend.get_shader_location(self.shader, "tileSize")
+
+    def set_mask_texture(self, texture: Any):
+        self.mask_texture = texture
+
+    def set_tilemap_size(self, size: Size):
+        self.tilemap_size = size
+
+    def set_tile_size(self, size: Size):
+        self.tile_size = size
+
+    def set_sprite_size(self, size: Size):
+        self.sprite_size = size
+        _backend.set_shader_vec2(self.shader, self.sprite_size_loc, self.sprite_size)
+
+    def enter(self):
+        _backend.begin_mode2d(_camera)
+        _backend.begin_shader_mode(self.shader)
+        _backend.set_shader_texture(self.shader, self.mask_texture_loc, self.mask_texture)
+        _backend.set_shader_vec2(self.shader, self.tilemap_size_loc, self.tilemap_size)
+        _backend.set_shader_vec2(self.shader, self.tile_size_loc, self.tile_size)
+
+
+    def exit(self):
+        _backend.end_shader_mode()
+        _backend.end_mode2d()
+
+
+class UIRenderStage(RenderStage):
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+
+class StageID(IntEnum):
+
+    DEFAULT = 0
+    MASKED = 1
+    UI = 2
+
+_stages: Mapping[StageID, RenderStage] = None
+
+
+class DrawCommand(metaclass=ABCMeta):
+
+    order: int
+    stage: StageID
+
+    @abstractmethod
+    def draw(self):
+        pass
+
+
+DRAW_COMMANDS: List[DrawCommand] = []
+
+
+class DrawRectOutlineCommand(DrawCommand):
+
+    def __init__(self, order: int, rect: Rect, color: Color) -> None:
+        self.order = order
+        self.rect = rect
+        self.color = color
+        self.stage = StageID.DEFAULT
+
+    def draw(self):
+        _backend.draw_rect_outline(self.rect, self.color)
+
+
+class DrawTextureRectCommand(DrawCommand):
+
+    def __init__(
+            self,
+            order: int,
+            texture: Any,
+            rect: Rect,
+            position: Position) -> None:
+        self.order = order
+        self.texture = texture
+        self.position = position
+        self.rect = rect
+        self.stage = StageID.DEFAULT
+
+    def draw(self):
+        _backend.draw_texture_rect(self.texture, self.rect, self.position)
+
+
+class DrawMaskedTextureRectCommand(DrawCommand):
+    def __init__(
+            self,
+            order: int,
+            texture: Any,
+            rect: Rect,
+            position: Position) -> None:
+        self.order = order
+        self.texture = texture
+        self.position = position
+        self.rect = rect
+        self.stage = StageID.MASKED
+
+    def draw(self):
+        stage: MaskedRenderStage = _stages[StageID.MASKED]
+        stage.set_sprite_size(self.rect[2:])
+        _backend.draw_texture_rect(self.texture, self.rect, self.position)
+
+
+class MaskedSpriteBatch(DrawCommand):
+    """
+    Masked texture rects sharing the same draw order.
+
+    Rects are grouped by texture and size, so that the sprite size uniform is
+    set once per group, instead of once per rect. Batches are pooled and
+    reused across frames, see `gfx_get_sprite_batch()`.
+    """
+
+    def __init__(self, order: int) -> None:
+        self.order = order
+        self.stage = StageID.MASKED
+        # texture -> rect -> positions, sprites mostly sharing a few frames;
+        # rects are grouped by size only when drawing, for adding them to be
+        # cheap
+        self.groups: Dict[Any, Dict[Rect, List[Position]]] = {}
+        # whether the batch is part of the current frame
+        self.queued = False
+
+    def add(self, texture: Any, rect: Rect, position: Position):
+        rects = self.groups.get(texture)
+        if rects is None:
+            rects = self.groups[texture] = {}
+        positions = rects.get(rect)
+        if positions is None:
+            positions = rects[rect] = []
+        positions.append(position)
+
+    def clear(self):
+        for rects in self.groups.values():
+            for positions in rects.values():
+                positions.clear()
+        self.queued = False
+
+    def draw(self):
+        stage: MaskedRenderStage = _stages[StageID.MASKED]
+        draw_texture_rect = _backend.draw_texture_rect
+        for texture, rects in self.groups.items():
+            sizes: Dict[Size, List[Rect]] = {}
+            for rect, positions in rects.items():
+                if positions:
+                    sizes.setdefault(rect[2:], []).append(rect)
+            for size, same_size in sizes.items():
+                stage.set_sprite_size(size)
+                for rect in same_size:
+                    for position in rects[rect]:
+                        draw_texture_rect(texture, rect, position)
+
+
+class RenderContext:
+    """
+    Draw commands of a frame, bucketed by stage.
+
+    Commands are drawn stage by stage and by ascending order within each
+    stage. Producers emitting commands already sorted by order can add them
+    with `extend_sorted()`, which avoids sorting them again. Commands with
+    the same order are drawn in insertion order, if added to the same run or
+    one by one, otherwise runs come first.
+    """
+
+    def __init__(self) -> None:
+        self.buckets = [_StageBucket() for _ in StageID]
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def __iter__(self) -> Iterator[DrawCommand]:
+        for bucket in self.buckets:
+            yield from bucket.commands()
+
+    def append(self, cmd: DrawCommand):
+        self.buckets[cmd.stage].unsorted.append(cmd)
+
+    def extend(self, cmds: Iterable[DrawCommand]):
+        for cmd in cmds:
+            self.buckets[cmd.stage].unsorted.append(cmd)
+
+    def extend_sorted(self, cmds: Sequence[DrawCommand]):
+        """
+        Add a run of commands of the same stage, sorted by order.
+
+        A run continuing the previous one of the same stage is merged with
+        it, hence producers emitting all their commands in order end up
+        having a single run.
+        """
+        if not cmds:
+            return
+
+        runs = self.buckets[cmds[0].stage].runs
+        if runs and runs[-1][-1].order <= cmds[0].order:
+            runs[-1].extend(cmds)
+        else:
+            runs.append(list(cmds))
+
+
+class _StageBucket:
+
+    def __init__(self) -> None:
+        self.runs: List[List[DrawCommand]] = []
+        self.unsorted: List[DrawCommand] = []
+
+    def __len__(self) -> int:
+        return len(self.unsorted) + sum(len(run) for run in self.runs)
+
+    def commands(self) -> Iterable[DrawCommand]:
+        sequences = list(self.runs)
+        if self.unsorted:
+            self.unsorted.sort(key=_get_order)
+            sequences.append(self.unsorted)
+
+        if not sequences:
+            return ()
+        if len(sequences) == 1:
+            return sequences[0]
+        return heapq.merge(*sequences, key=_get_order)
+
+
+_get_order = attrgetter('order')
+
+
+_sprite_batches: Dict[int, MaskedSpriteBatch] = {}
+
+
+def gfx_init(
+        window_title: str,
+        screen_size: Size,
+        scaling_factor: float=1.0,
+        backend: Optional[Backend]=None):
+    """
+    Initialize the graphics subsystem.
+
+    Rendering calls are executed by the given backend, which defaults to
+    drawing in a raylib window. See `ucs.gfx.backend` for backends not
+    requiring a display.
+    """
+    global _backend
+    global _stages
+    global _camera
+    global _camera_previous_target
+    global _screen_width
+    global _screen_height
+
+    if backend is None:
+        from ucs.gfx.raylib_backend import RaylibBackend
+        backend = RaylibBackend()
+    _backend = backend
+
+    _screen_width, _screen_height = screen_size
+
+    _backend.open_window(screen_size, window_title)
+
+    _camera = _backend.create_camera(scaling_factor)
+    _camera_previous_target = None
+
+    _sprite_batches.clear()
+
+    _stages = {
+        StageID.DEFAULT: DefaultRenderStage(),
+        StageID.MASKED: MaskedRenderStage(),
+        StageID.UI: UIRenderStage(),
+    }
+
+
+@contextmanager
+def gfx_frame(alpha: float=1.0) -> ContextManager[RenderContext]:
+    """
+    Creates a new frame rendering context, to which draw commands can be added.
+
+    The camera is placed at `alpha` of the way between its target before and
+    after the last simulation step, see `gfx_store_camera()`.
+    """
+    target = _camera.target.x, _camera.target.y
+    if _camera_previous_target is not None:
+        prev_x, prev_y = _camera_previous_target
+        _camera.target = (
+            prev_x + (target[0] - prev_x) * alpha,
+            prev_y + (target[1] - prev_y) * alpha)
+
+    ctx = RenderContext()
+    yield ctx
+
+    _backend.begin_drawing(BLACK)
+
+    current_stage_id = None
+
+    for cmd in ctx:
+        if current_stage_id != cmd.stage:
+            if current_stage_id is not None:
+                _stages[current_stage_id].exit()
+            current_stage_id = cmd.stage
+            _backend.set_stage(current_stage_id)
+            _stages[current_stage_id].enter()
+
+        cmd.draw()
+
+    if current_stage_id is not None:
+        _stages[current_stage_id].exit()
+
+    _backend.end_drawing()
+
+    _camera.target = target
+
+    for batch in _sprite_batches.values():
+        batch.clear()
+
+
+def gfx_store_camera():
+    """
+    Remember the current camera target, to be called before each simulation
+    step.
+    """
+    global _camera_previous_target
+    _camera_previous_target = _camera.target.x, _camera.target.y
+
+
+def gfx_set_map_params(foreground_mask_texture: Any, tile_size: Size, tilemap_size: Size):
+    """
+    Update the info about the currently active tilemap, needed for rendering
+    effects such as background objects masked by foreground and others.
+    """
+    stage: MaskedRenderStage = _stages[StageID.MASKED]
+    stage.set_mask_texture(foreground_mask_texture)
+    stage.set_tile_size(tile_size)
+    stage.set_tilemap_size(tilemap_size)
+
+
+def gfx_get_sprite_batch(ctx: RenderContext, order: int) -> MaskedSpriteBatch:
+    """
+    Return the masked sprite batch for given draw order, adding it to the
+    frame context if it's not part of it yet.
+    """
+    batch = _sprite_batches.get(order)
+    if batch is None:
+        batch = _sprite_batches[order] = MaskedSpriteBatch(order)
+
+    if not batch.queued:
+        ctx.append(batch)
+        batch.queued = True
+
+    return batch
+
+
+def gfx_get_view_rect() -> Rect:
+    """
+    Return the world space rectangle visible through the camera, as
+    `(x, y, width, height)`. Camera rotation is not taken into account.
+    """
+    zoom = _camera.zoom
+    x = _camera.target.x - _camera.offset.x / zoom
+    y = _camera.target.y - _camera.offset.y / zoom
+    return x, y, _screen_width / zoom, _screen_height / zoom
+
+
+def gfx_load_texture(filename: str) -> Any:
+    return _backend.load_texture(filename)
+
+
+def gfx_load_mask_texture(size: Size, pixels: bytes) -> Any:
+    """
+    Create a mask texture of given size from 1-byte grayscale pixels, row
+    by row.
+    """
+    return _backend.load_mask_texture(size, pixels)
+
+
+def gfx_get_backend() -> Backend:
+    return _backend
+
+
+def gfx_window_should_close() -> bool:
+    return _backend.window_should_close()
+
+
+def gfx_close():
+    _backend.close_window()
+
+
+def get_camera() -> Any:
+    return _camera
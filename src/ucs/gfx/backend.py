@@ -0,0 +1,351 @@
+"""
+Backends executing the low level rendering calls issued by `ucs.gfx`.
+
+The draw commands and the render stages never call the graphics library
+directly, they go through the backend passed to `gfx_init()` instead. Besides
+the raylib one, used by the game, backends not requiring a display are
+provided, for running the rendering path in tests and benchmarks.
+"""
+from abc import ABCMeta, abstractmethod
+from array import array
+from enum import IntEnum
+from typing import Any, List, NamedTuple, Tuple
+
+from ucs.foundation import Position, Rect, Size
+
+Color = Tuple[int, int, int, int]
+
+
+class Backend(metaclass=ABCMeta):
+
+    @abstractmethod
+    def open_window(self, size: Size, title: str):
+        pass
+
+    @abstractmethod
+    def close_window(self):
+        pass
+
+    @abstractmethod
+    def window_should_close(self) -> bool:
+        pass
+
+    @abstractmethod
+    def create_camera(self, zoom: float) -> Any:
+        """
+        Return a 2D camera, having `offset`, `target` and `zoom` attributes.
+        """
+
+    @abstractmethod
+    def load_texture(self, filename: str) -> Any:
+        pass
+
+    @abstractmethod
+    def load_mask_texture(self, size: Size, pixels: bytes) -> Any:
+        """
+        Create a texture from 1-byte grayscale pixels, row by row.
+        """
+
+    @abstractmethod
+    def load_shader(self, vs_filename: str, fs_filename: str) -> Any:
+        pass
+
+    @abstractmethod
+    def get_shader_location(self, shader: Any, name: str) -> int:
+        pass
+
+    @abstractmethod
+    def set_shader_vec2(self, shader: Any, loc: int, value: Tuple[float, float]):
+        pass
+
+    @abstractmethod
+    def set_shader_texture(self, shader: Any, loc: int, texture: Any):
+        pass
+
+    @abstractmethod
+    def begin_drawing(self, clear_color: Color):
+        pass
+
+    @abstractmethod
+    def end_drawing(self):
+        pass
+
+    @abstractmethod
+    def set_stage(self, stage: int):
+        """
+        Notify the switch to another render stage, before entering it.
+        """
+
+    @abstractmethod
+    def begin_mode2d(self, camera: Any):
+        pass
+
+    @abstractmethod
+    def end_mode2d(self):
+        pass
+
+    @abstractmethod
+    def begin_shader_mode(self, shader: Any):
+        pass
+
+    @abstractmethod
+    def end_shader_mode(self):
+        pass
+
+    @abstractmethod
+    def draw_texture_rect(self, texture: Any, rect: Rect, position: Position):
+        pass
+
+    @abstractmethod
+    def draw_rect(self, rect: Rect, color: Color):
+        pass
+
+    @abstractmethod
+    def draw_rect_outline(self, rect: Rect, color: Color):
+        pass
+
+    @abstractmethod
+    def draw_text(self, text: str, position: Position, font_size: float, spacing: float, color: Color):
+        pass
+
+    @abstractmethod
+    def measure_text(self, text: str, font_size: float, spacing: float) -> Tuple[float, float]:
+        pass
+
+
+class Vector2(NamedTuple):
+
+    x: float
+    y: float
+
+
+class Camera:
+    """
+    Plain 2D camera, with the same attributes of the raylib one.
+    """
+
+    def __init__(self, zoom: float=1.0) -> None:
+        self.offset = (0, 0)
+        self.target = (0, 0)
+        self.rotation = 0.0
+        self.zoom = zoom
+
+    @property
+    def offset(self) -> Vector2:
+        return self._offset
+
+    @offset.setter
+    def offset(self, value: Position):
+        self._offset = Vector2(*value)
+
+    @property
+    def target(self) -> Vector2:
+        return self._target
+
+    @target.setter
+    def target(self, value: Position):
+        self._target = Vector2(*value)
+
+
+class Texture(NamedTuple):
+
+    id: int
+    width: int
+    height: int
+
+
+class NullBackend(Backend):
+    """
+    Backend discarding all the rendering calls, without opening any window.
+
+    Textures and shaders are just numbered handles, and measured text is
+    assumed to have glyphs half as wide as high.
+    """
+
+    def __init__(self) -> None:
+        self.textures: List[Texture] = []
+        self.shaders: List[Tuple[str, str]] = []
+
+    def open_window(self, size: Size, title: str):
+        pass
+
+    def close_window(self):
+        pass
+
+    def window_should_close(self) -> bool:
+        return False
+
+    def create_camera(self, zoom: float) -> Camera:
+        return Camera(zoom)
+
+    def load_texture(self, filename: str) -> Texture:
+        return self._add_texture((0, 0))
+
+    def load_mask_texture(self, size: Size, pixels: bytes) -> Texture:
+        width, height = size
+        if len(pixels) != width * height:
+            raise ValueError(f'expected {width * height} mask pixels, got {len(pixels)}')
+        return self._add_texture(size)
+
+    def load_shader(self, vs_filename: str, fs_filename: str) -> int:
+        self.shaders.append((vs_filename, fs_filename))
+        return len(self.shaders) - 1
+
+    def get_shader_location(self, shader: int, name: str) -> int:
+        return 0
+
+    def set_shader_vec2(self, shader: int, loc: int, value: Tuple[float, float]):
+        pass
+
+    def set_shader_texture(self, shader: int, loc: int, texture: Texture):
+        pass
+
+    def begin_drawing(self, clear_color: Color):
+        pass
+
+    def end_drawing(self):
+        pass
+
+    def set_stage(self, stage: int):
+        pass
+
+    def begin_mode2d(self, camera: Camera):
+        pass
+
+    def end_mode2d(self):
+        pass
+
+    def begin_shader_mode(self, shader: int):
+        pass
+
+    def end_shader_mode(self):
+        pass
+
+    def draw_texture_rect(self, texture: Texture, rect: Rect, position: Position):
+        pass
+
+    def draw_rect(self, rect: Rect, color: Color):
+        pass
+
+    def draw_rect_outline(self, rect: Rect, color: Color):
+        pass
+
+    def draw_text(self, text: str, position: Position, font_size: float, spacing: float, color: Color):
+        pass
+
+    def measure_text(self, text: str, font_size: float, spacing: float) -> Tuple[float, float]:
+        if not text:
+            return 0.0, font_size
+        return len(text) * (font_size / 2 + spacing) - spacing, font_size
+
+    def _add_texture(self, size: Size) -> Texture:
+        texture = Texture(len(self.textures), *size)
+        self.textures.append(texture)
+        return texture
+
+
+class Op(IntEnum):
+    """
+    Calls recorded by the `RecordingBackend`.
+    """
+
+    BEGIN_DRAWING = 0
+    END_DRAWING = 1
+    STAGE = 2
+    BEGIN_MODE2D = 3
+    END_MODE2D = 4
+    BEGIN_SHADER = 5
+    END_SHADER = 6
+    UNIFORM = 7
+    UNIFORM_TEXTURE = 8
+    DRAW_TEXTURE = 9
+    DRAW_RECT = 10
+    DRAW_RECT_OUTLINE = 11
+    DRAW_TEXT = 12
+
+
+class RecordingBackend(NullBackend):
+    """
+    Backend recording the rendering calls, without opening any window.
+
+    Every call is appended to `ops`, while the arguments of the most
+    frequent ones are packed in flat arrays, with one fixed size record per
+    call:
+
+    * `draws`: texture id, source rect and position of the texture draws,
+      `DRAW_STRIDE` items each;
+    * `uniforms`: shader, location and value of the vector uniform uploads,
+      `UNIFORM_STRIDE` items each;
+    * `stages`: id of the entered render stages.
+
+    Records of all the frames drawn are kept until `reset()` is called.
+    """
+
+    DRAW_STRIDE = 7
+    UNIFORM_STRIDE = 4
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.frames = 0
+        self.ops = array('B')
+        self.draws = array('f')
+        self.uniforms = array('f')
+        self.stages = array('B')
+
+    def reset(self):
+        """
+        Discard the records, keeping the loaded textures and shaders.
+        """
+        self.frames = 0
+        del self.ops[:]
+        del self.draws[:]
+        del self.uniforms[:]
+        del self.stages[:]
+
+    def count(self, op: Op) -> int:
+        return self.ops.count(op)
+
+    def set_shader_vec2(self, shader: int, loc: int, value: Tuple[float, float]):
+        self.ops.append(Op.UNIFORM)
+        self.uniforms.extend((shader, loc, *value))
+
+    def set_shader_texture(self, shader: int, loc: int, texture: Texture):
+        self.ops.append(Op.UNIFORM_TEXTURE)
+
+    def begin_drawing(self, clear_color: Color):
+        self.ops.append(Op.BEGIN_DRAWING)
+
+    def end_drawing(self):
+        self.ops.append(Op.END_DRAWING)
+        self.frames += 1
+
+    def set_stage(self, stage: int):
+        self.ops.append(Op.STAGE)
+        self.stages.append(stage)
+
+    def begin_mode2d(self, camera: Camera):
+        self.ops.append(Op.BEGIN_MODE2D)
+
+    def end_mode2d(self):
+        self.ops.append(Op.END_MODE2D)
+
+    def begin_shader_mode(self, shader: int):
+        self.ops.append(Op.BEGIN_SHADER)
+
+    def end_shader_mode(self):
+        self.ops.append(Op.END_SHADER)
+
+    def draw_texture_rect(self, texture: Texture, rect: Rect, position: Position):
+        self.ops.append(Op.DRAW_TEXTURE)
+        self.draws.append(texture.id)
+        self.draws.extend(rect)
+        self.draws.extend(position)
+
+    def draw_rect(self, rect: Rect, color: Color):
+        self.ops.append(Op.DRAW_RECT)
+
+    def draw_rect_outline(self, rect: Rect, color: Color):
+        self.ops.append(Op.DRAW_RECT_OUTLINE)
+
+    def draw_text(self, text: str, position: Position, font_size: float, spacing: float, color: Color):
+        self.ops.append(Op.DRAW_TEXT)
@@ -0,0 +1,100 @@
+import struct
+from ctypes import c_ubyte, c_void_p, cast
+from typing import Tuple
+
+from raylibpy.consts import (PIXELFORMAT_UNCOMPRESSED_GRAYSCALE,
+                             SHADER_UNIFORM_VEC2)
+from raylibpy.core import Camera2D, Image
+from raylibpy.spartan import (Shader, Texture2D, begin_drawing, begin_mode2d,
+                              begin_shader_mode, clear_background,
+                              close_window, draw_rectangle,
+                              draw_rectangle_lines, draw_text_ex,
+                              draw_texture_rec, end_drawing, end_mode2d,
+                              end_shader_mode, get_font_default,
+                              get_shader_location, init_window, load_shader,
+                              load_texture, load_texture_from_image,
+                              measure_text_ex, set_shader_value,
+                              set_shader_value_texture, window_should_close)
+
+from ucs.foundation import Position, Rect, Size
+from ucs.gfx.backend import Backend, Color
+
+_WHITE = (255, 255, 255, 255)
+
+
+class RaylibBackend(Backend):
+    """
+    Backend drawing in a raylib window.
+    """
+
+    def open_window(self, size: Size, title: str):
+        init_window(*size, title)
+
+    def close_window(self):
+        close_window()
+
+    def window_should_close(self) -> bool:
+        return window_should_close()
+
+    def create_camera(self, zoom: float) -> Camera2D:
+        return Camera2D(zoom=zoom)
+
+    def load_texture(self, filename: str) -> Texture2D:
+        return load_texture(filename)
+
+    def load_mask_texture(self, size: Size, pixels: bytes) -> Texture2D:
+        width, height = size
+        data = (c_ubyte * len(pixels)).from_buffer_copy(pixels)
+        # the image borrows the buffer, which is copied to the GPU memory
+        img = Image(cast(data, c_void_p), width, height, 1, PIXELFORMAT_UNCOMPRESSED_GRAYSCALE)
+        return load_texture_from_image(img)
+
+    def load_shader(self, vs_filename: str, fs_filename: str) -> Shader:
+        return load_shader(vs_filename, fs_filename)
+
+    def get_shader_location(self, shader: Shader, name: str) -> int:
+        return get_shader_location(shader, name)
+
+    def set_shader_vec2(self, shader: Shader, loc: int, value: Tuple[float, float]):
+        set_shader_value(shader, loc, struct.pack('=ff', *value), SHADER_UNIFORM_VEC2)
+
+    def set_shader_texture(self, shader: Shader, loc: int, texture: Texture2D):
+        set_shader_value_texture(shader, loc, texture)
+
+    def begin_drawing(self, clear_color: Color):
+        begin_drawing()
+        clear_background(clear_color)
+
+    def end_drawing(self):
+        end_drawing()
+
+    def set_stage(self, stage: int):
+        pass
+
+    def begin_mode2d(self, camera: Camera2D):
+        begin_mode2d(camera)
+
+    def end_mode2d(self):
+        end_mode2d()
+
+    def begin_shader_mode(self, shader: Shader):
+        begin_shader_mode(shader)
+
+    def end_shader_mode(self):
+        end_shader_mode()
+
+    def draw_texture_rect(self, texture: Texture2D, rect: Rect, position: Position):
+        draw_texture_rec(texture, rect, position, _WHITE)
+
+    def draw_rect(self, rect: Rect, color: Color):
+        draw_rectangle(*rect, color)
+
+    def draw_rect_outline(self, rect: Rect, color: Color):
+        draw_rectangle_lines(*rect, color)
+
+    def draw_text(self, text: str, position: Position, font_size: float, spacing: float, color: Color):
+        draw_text_ex(get_font_default(), text, position, font_size, spacing, color)
+
+    def measure_text(self, text: str, font_size: float, spacing: float) -> Tuple[float, float]:
+        size = measure_text_ex(get_font_default(), text, font_size, spacing)
+        return size.x, size.y
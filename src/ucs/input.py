@@ -0,0 +1,131 @@
+from abc import ABCMeta, abstractmethod
+from typing import AbstractSet, Iterable, Mapping, Optional, Set
+
+
+class Input(metaclass=ABCMeta):
+    """
+    Source of the keyboard state.
+    """
+
+    def poll(self):
+        """
+        Collect the events of the last frame, to be called once per frame.
+        """
+
+    def update(self):
+        """
+        Advance to the state of the next simulation step.
+        """
+
+    @abstractmethod
+    def is_key_down(self, key: int) -> bool:
+        pass
+
+    @abstractmethod
+    def is_key_pressed(self, key: int) -> bool:
+        """
+        Return whether the key went down since the previous step.
+        """
+
+    @abstractmethod
+    def get_key_pressed(self) -> int:
+        """
+        Return a key which went down since the previous step, or 0.
+        """
+
+
+class RaylibInput(Input):
+    """
+    Keyboard state of the raylib window, polled when the frame is drawn.
+
+    Frames and simulation steps don't match one to one, hence the keys
+    pressed during the frames drawn since the previous step are collected,
+    so that none is missed or seen by several steps.
+    """
+
+    def __init__(self) -> None:
+        from raylibpy import spartan
+        self._spartan = spartan
+        self._pending: Set[int] = set()
+        self._pressed: AbstractSet[int] = frozenset()
+
+    def poll(self):
+        key = self._spartan.get_key_pressed()
+        while key:
+            self._pending.add(key)
+            key = self._spartan.get_key_pressed()
+
+    def update(self):
+        self._pressed = self._pending
+        self._pending = set()
+
+    def is_key_down(self, key: int) -> bool:
+        return self._spartan.is_key_down(key)
+
+    def is_key_pressed(self, key: int) -> bool:
+        return key in self._pressed
+
+    def get_key_pressed(self) -> int:
+        return min(self._pressed, default=0)
+
+
+class ScriptedInput(Input):
+    """
+    Input replaying a script, for running simulations without a window.
+
+    The script maps step numbers, starting from 0, to the keys held down from
+    that step on, until the next scripted step.
+    """
+
+    def __init__(self, script: Optional[Mapping[int, Iterable[int]]]=None) -> None:
+        self.script = {step: frozenset(keys) for step, keys in (script or {}).items()}
+        self.step = -1
+        self.down: AbstractSet[int] = frozenset()
+        self.pressed: AbstractSet[int] = frozenset()
+
+    def update(self):
+        self.step += 1
+        down = self.script.get(self.step, self.down)
+        self.pressed = down - self.down
+        self.down = down
+
+    def is_key_down(self, key: int) -> bool:
+        return key in self.down
+
+    def is_key_pressed(self, key: int) -> bool:
+        return key in self.pressed
+
+    def get_key_pressed(self) -> int:
+        return min(self.pressed, default=0)
+
+
+_input: Input = None
+
+
+def input_init(source: Optional[Input]=None):
+    """
+    Initialize the input system, reading the keyboard state from the given
+    source, which defaults to the raylib window.
+    """
+    global _input
+    _input = source if source is not None else RaylibInput()
+
+
+def input_poll():
+    _input.poll()
+
+
+def input_update():
+    _input.update()
+
+
+def input_is_key_down(key: int) -> bool:
+    return _input.is_key_down(key)
+
+
+def input_is_key_pressed(key: int) -> bool:
+    return _input.is_key_pressed(key)
+
+
+def input_get_key_pressed() -> int:
+    return _input.get_key_pressed()
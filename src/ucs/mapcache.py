@@ -0,0 +1,165 @@
+"""
+Binary cache of the static content of the tilemaps.
+
+Parsing a TMX map and computing its walkability and foreground mask takes
+time proportional to the map area, hence the results are saved in a compact
+binary file, named after the hash of the TMX and TSX files. Later loads of the
+same map content memory-map that file instead of parsing the map again.
+
+A cache file is made of a header, the texture filenames, the walkability
+bitset, the foreground mask pixels and the tile records, in this order.
+"""
+import hashlib
+import mmap
+import os
+import pathlib
+import struct
+import xml.etree.ElementTree as ElementTree
+from array import array
+from typing import List, NamedTuple, Optional, Sequence, Union
+
+from ucs.foundation import Position
+
+#: Bumped on every change of the file layout, invalidating existing caches.
+CACHE_VERSION = 1
+#: Default cache directory, relative to the directory of the map.
+CACHE_DIRNAME = '__mapcache__'
+#: Items of each tile record: texture index, source rect, column and row.
+TILE_STRIDE = 7
+
+_MAGIC = b'UCSM'
+# magic, version, width, height, tile width, tile height, entry x and y,
+# number of textures, number of tiles
+_HEADER = struct.Struct('=4sHIIHHddHI')
+_NAME_LENGTH = struct.Struct('=H')
+
+PathLike = Union[str, os.PathLike]
+
+
+class MapData(NamedTuple):
+    """
+    Static content of a map.
+
+    `walkable` and `mask` have one byte per tile, row by row: 1 for walkable
+    tiles, and 0 for the tiles covered by the foreground. `tiles` holds the
+    tiles to draw, as flat records of `TILE_STRIDE` items, in layer order.
+    """
+
+    width: int
+    height: int
+    tile_width: int
+    tile_height: int
+    entry: Position
+    walkable: bytes
+    mask: bytes
+    textures: List[str]
+    tiles: Sequence[int]
+
+
+def cache_path(filename: PathLike, cache_dir: Optional[PathLike]=None) -> pathlib.Path:
+    """
+    Return the path of the cache file of given map, according to the content
+    of the map and of its external tilesets.
+    """
+    filename = pathlib.Path(filename)
+    digest = hashlib.sha256(str(CACHE_VERSION).encode())
+    digest.update(filename.read_bytes())
+    for tileset in ElementTree.parse(filename).getroot().iter('tileset'):
+        source = tileset.get('source')
+        if source is not None:
+            digest.update(filename.parent.joinpath(source).read_bytes())
+
+    if cache_dir is None:
+        cache_dir = filename.parent.joinpath(CACHE_DIRNAME)
+    return pathlib.Path(cache_dir, f'{filename.stem}-{digest.hexdigest()[:16]}.map')
+
+
+def read_cache(path: PathLike) -> MapData:
+    """
+    Read a cache file, raising `ValueError` if it's not a valid one.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < _HEADER.size:
+            raise ValueError(f'truncated map cache {path}')
+        magic, version, width, height, tile_width, tile_height, entry_x, entry_y, textures_count, tiles_count = (
+            _HEADER.unpack_from(mm))
+        if magic != _MAGIC or version != CACHE_VERSION:
+            raise ValueError(f'invalid map cache {path}')
+
+        offset = _HEADER.size
+        textures = []
+        for _ in range(textures_count):
+            length, = _NAME_LENGTH.unpack_from(mm, offset)
+            offset += _NAME_LENGTH.size
+            textures.append(mm[offset:offset + length].decode())
+            offset += length
+
+        area = width * height
+        bits_size = (area + 7) // 8
+        tiles_size = tiles_count * TILE_STRIDE * array('I').itemsize
+        if len(mm) != offset + bits_size + area + tiles_size:
+            raise ValueError(f'truncated map cache {path}')
+
+        walkable = unpack_bits(mm[offset:offset + bits_size], area)
+        offset += bits_size
+        mask = mm[offset:offset + area]
+        offset += area
+        tiles = array('I')
+        tiles.frombytes(mm[offset:offset + tiles_size])
+
+    # texture filenames are stored relative to the cache file
+    base = pathlib.Path(path).parent
+    return MapData(
+        width, height, tile_width, tile_height, (entry_x, entry_y), walkable, mask,
+        [os.path.normpath(base.joinpath(name)) for name in textures], tiles)
+
+
+def write_cache(path: PathLike, data: MapData):
+    """
+    Write a cache file, replacing the ones of previous versions of the map.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tiles = array('I', data.tiles)
+    entry_x, entry_y = data.entry
+
+    chunks = [_HEADER.pack(
+        _MAGIC, CACHE_VERSION, data.width, data.height, data.tile_width, data.tile_height,
+        entry_x, entry_y, len(data.textures), len(tiles) // TILE_STRIDE)]
+    for name in data.textures:
+        name = os.path.relpath(name, path.parent).encode()
+        chunks.append(_NAME_LENGTH.pack(len(name)))
+        chunks.append(name)
+    chunks.append(pack_bits(data.walkable))
+    chunks.append(bytes(data.mask))
+    chunks.append(tiles.tobytes())
+
+    # write to a temporary file first, for not leaving a truncated cache
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_bytes(b''.join(chunks))
+    os.replace(tmp_path, path)
+
+    stem = path.stem.rsplit('-', 1)[0]
+    for stale in path.parent.glob(f'{stem}-*.map'):
+        if stale != path and stale.stem.rsplit('-', 1)[0] == stem:
+            stale.unlink()
+
+
+def pack_bits(values: bytes) -> bytes:
+    """
+    Pack a sequence of 0/1 bytes in a bitset, least significant bit first.
+    """
+    padded = bytes(values) + bytes(-len(values) % 8)
+    return bytes(
+        sum(bit << i for i, bit in enumerate(padded[start:start + 8]))
+        for start in range(0, len(padded), 8))
+
+
+def unpack_bits(bits: bytes, count: int) -> bytes:
+    """
+    Unpack the first `count` bits of a bitset in 0/1 bytes.
+    """
+    return b''.join(map(_UNPACKED.__getitem__, bits))[:count]
+
+
+_UNPACKED = [bytes((byte >> i) & 1 for i in range(8)) for byte in range(256)]
@@ -0,0 +1,289 @@
+"""
+Pathfinding over the tile grid of the active tilemap.
+
+Two services are provided: A* searches, for single walkers heading to a given
+tile, and flow fields, shared by any number of walkers chasing the same
+target actor. A flow field holds the walking distance of the tiles around
+its target, hence walkers just step to the adjacent tile closest to it.
+
+Both work on the walkability of the tiles, regardless of their occupants,
+which move all the time: walkers are expected to wait or step aside when
+their next tile is occupied. Results are cached, and invalidated only by
+walkability changes affecting them, or by their target changing tile.
+"""
+import heapq
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from ucs.foundation import Actor, Position
+from ucs.tilegrid import TileGrid
+from ucs.tilemap import TileMap
+
+#: Walking distance in tiles covered by the flow fields, walkers further away
+#: from a target don't chase it.
+DEFAULT_FIELD_RADIUS = 32
+#: Number of A* paths kept in the cache.
+PATH_CACHE_SIZE = 256
+#: Distance of the tiles not reached by a flow field.
+UNREACHED = -1
+
+
+class FlowField:
+    """
+    Walking distance to a target tile, for the tiles within `radius`.
+    """
+
+    def __init__(self, grid: TileGrid, radius: int) -> None:
+        self.grid = grid
+        self.radius = radius
+        self.target: Optional[Position] = None
+        self.distances = array('i', [UNREACHED]) * (grid.width * grid.height)
+        # indices of the tiles reached by the last computation, the only ones
+        # to reset for the next one
+        self.reached: List[int] = []
+        # number of walkability changes taken into account
+        self.changes_seen = len(grid.walkable_changes)
+
+    def update(self, target: Position):
+        """
+        Recompute the field if the target moved or the walkability of a tile
+        within reach changed since the last update.
+        """
+        changes = self.grid.walkable_changes
+        stale = target != self.target
+        if not stale and len(changes) > self.changes_seen:
+            width = self.grid.width
+            target_col, target_row = target
+            radius = self.radius
+            stale = any(
+                abs(index % width - target_col) + abs(index // width - target_row) <= radius
+                for index in changes[self.changes_seen:])
+        self.changes_seen = len(changes)
+
+        if stale:
+            self.target = target
+            self._compute()
+
+    def distance_at(self, col: int, row: int) -> int:
+        index = self.grid.index(col, row)
+        return self.distances[index] if index >= 0 else UNREACHED
+
+    def next_tile(self, col: int, row: int) -> Optional[Position]:
+        """
+        Return the adjacent tile to step on for getting closer to the target,
+        skipping the occupied ones, or None if there's none.
+        """
+        distance = self.distance_at(col, row)
+        if distance <= 0:
+            return None
+
+        best = None
+        for tile in ((col - 1, row), (col + 1, row), (col, row - 1), (col, row + 1)):
+            tile_distance = self.distance_at(*tile)
+            if UNREACHED < tile_distance < distance and self.grid.is_walkable_at(*tile):
+                best = tile
+                distance = tile_distance
+        return best
+
+    def _compute(self):
+        # breadth-first visit from the target, all steps costing the same
+        grid = self.grid
+        width = grid.width
+        area = grid.width * grid.height
+        walkable = grid.walkable
+        distances = self.distances
+        reached = self.reached
+        for index in reached:
+            distances[index] = UNREACHED
+        reached.clear()
+
+        start = grid.index(*self.target)
+        if start < 0:
+            return
+        distances[start] = 0
+        reached.append(start)
+        frontier = [start]
+        for distance in range(1, self.radius + 1):
+            next_frontier = []
+            for index in frontier:
+                col = index % width
+                for neighbor in (
+                        index - 1 if col > 0 else -1,
+                        index + 1 if col < width - 1 else -1,
+                        index - width,
+                        index + width if index + width < area else -1):
+                    if neighbor >= 0 and distances[neighbor] == UNREACHED and walkable[neighbor]:
+                        distances[neighbor] = distance
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            reached.extend(next_frontier)
+            frontier = next_frontier
+
+
+def find_path(grid: TileGrid, start: Position, goal: Position) -> Optional[List[Position]]:
+    """
+    Return the tiles to walk from `start` to `goal`, both excluded and
+    included respectively, or None if the goal can't be reached.
+    """
+    width = grid.width
+    walkable = grid.walkable
+    start_index = grid.index(*start)
+    goal_index = grid.index(*goal)
+    if start_index < 0 or goal_index < 0 or not walkable[goal_index]:
+        return None
+
+    goal_col, goal_row = goal
+    came_from: Dict[int, int] = {start_index: -1}
+    costs = {start_index: 0}
+    # (estimated total cost, cost, tile index), ties broken by the lowest cost
+    queue: List[Tuple[int, int, int]] = [(0, 0, start_index)]
+    while queue:
+        _, cost, index = heapq.heappop(queue)
+        if index == goal_index:
+            break
+        if cost > costs[index]:
+            continue
+
+        col, row = index % width, index // width
+        for next_col, next_row in ((col - 1, row), (col + 1, row), (col, row - 1), (col, row + 1)):
+            neighbor = grid.index(next_col, next_row)
+            if neighbor < 0 or not walkable[neighbor]:
+                continue
+            next_cost = cost + 1
+            if next_cost < costs.get(neighbor, next_cost + 1):
+                costs[neighbor] = next_cost
+                came_from[neighbor] = index
+                estimate = next_cost + abs(goal_col - next_col) + abs(goal_row - next_row)
+                heapq.heappush(queue, (estimate, next_cost, neighbor))
+    else:
+        return None
+
+    path = []
+    index = goal_index
+    while index != start_index:
+        path.append((index % width, index // width))
+        index = came_from[index]
+    path.reverse()
+    return path
+
+
+_radius: int = DEFAULT_FIELD_RADIUS
+_grid: Optional[TileGrid] = None
+_fields: Dict[Actor, FlowField] = {}
+_paths: Dict[Tuple[Position, Position], Optional[List[Position]]] = {}
+# number of walkability changes when the cached paths were computed
+_paths_changes_seen = 0
+
+
+def pathfinding_init(field_radius: int=DEFAULT_FIELD_RADIUS):
+    """
+    Initialize the pathfinding system, with flow fields covering the given
+    walking distance around their targets.
+    """
+    global _radius
+    global _grid
+    global _fields
+    global _paths
+    global _paths_changes_seen
+
+    _radius = field_radius
+    _grid = None
+    _fields = {}
+    _paths = {}
+    _paths_changes_seen = 0
+
+
+def pathfinding_add_target(actor: Actor):
+    """
+    Maintain a flow field towards the given actor, until it's removed from
+    its scene.
+    """
+    _fields[actor] = None
+
+
+def pathfinding_update(tilemap: TileMap):
+    """
+    Update the flow fields of the targets which changed tile, and drop the
+    cached paths if walkability changed.
+    """
+    global _grid
+    global _paths_changes_seen
+
+    if tilemap is None:
+        return
+
+    grid = tilemap.grid
+    if grid is not _grid:
+        _grid = grid
+        _paths.clear()
+        _paths_changes_seen = len(grid.walkable_changes)
+        for actor in _fields:
+            _fields[actor] = None
+
+    if len(grid.walkable_changes) != _paths_changes_seen:
+        _paths.clear()
+        _paths_changes_seen = len(grid.walkable_changes)
+
+    for actor, field in list(_fields.items()):
+        if actor.scene is None or actor.state is Actor.State.INACTIVE:
+            del _fields[actor]
+            continue
+        if field is None:
+            field = _fields[actor] = FlowField(grid, _radius)
+        field.update(tilemap.pixels_to_coords(actor.position))
+
+
+def pathfinding_get_distance(col: int, row: int) -> int:
+    """
+    Return the walking distance to the closest target within reach, or
+    `UNREACHED` if there's none.
+    """
+    _, distance = _closest_target(col, row)
+    return distance
+
+
+def pathfinding_get_next_tile(col: int, row: int) -> Optional[Tuple[Position, Any]]:
+    """
+    Return the tile to step on for chasing the closest target, along with the
+    target, or None if no target is within reach or the way is blocked.
+    """
+    closest, distance = _closest_target(col, row)
+    if distance <= 0:
+        return None
+    tile = _fields[closest].next_tile(col, row)
+    return None if tile is None else (tile, closest)
+
+
+def _closest_target(col: int, row: int) -> Tuple[Optional[Actor], int]:
+    closest = None
+    closest_distance = UNREACHED
+    for actor, field in _fields.items():
+        if field is None:
+            continue
+        distance = field.distance_at(col, row)
+        if distance >= 0 and (closest is None or distance < closest_distance):
+            closest = actor
+            closest_distance = distance
+    return closest, closest_distance
+
+
+def pathfinding_find_path(start: Position, goal: Position) -> Optional[List[Position]]:
+    """
+    Return the tiles to walk from `start` to `goal`, as in `find_path()`, on
+    the grid of the tilemap of the last update. Paths are cached until
+    walkability changes.
+    """
+    if _grid is None:
+        raise RuntimeError('pathfinding_find_path() requires a tilemap, set by pathfinding_update()')
+
+    key = start, goal
+    if key in _paths:
+        return _paths[key]
+
+    path = find_path(_grid, start, goal)
+    if len(_paths) >= PATH_CACHE_SIZE:
+        # evict the oldest entry
+        del _paths[next(iter(_paths))]
+    _paths[key] = path
+    return path
@@ -0,0 +1,109 @@
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+
+from ucs.clock import clock_get, clock_get_time
+from ucs.components.collision import collision_update
+from ucs.components.movement import movement_update
+from ucs.components.walk import walk_update
+from ucs.foundation import Game, batch_changes
+from ucs.input import input_update
+from ucs.pathfinding import pathfinding_update
+from ucs.tilemap import tilemap_get_active
+from ucs.ui import UI
+
+#: Names of the parts of a step timed by profiling simulations.
+SYSTEMS = ('collision', 'movement', 'walk', 'pathfinding', 'tick', 'actions')
+
+
+class Simulation:
+    """
+    Fixed-step driver of a game, which doesn't render anything.
+
+    Each step reads the input and updates the UI, if any. Unless the UI is
+    waiting for a prompt, it then runs the component systems on the active
+    tilemap, updates the pathfinding fields, ticks the scene and runs the
+    pending actions. Changes of reactive props during these are batched, and
+    their handlers run once each at the end. Finally, the clock is advanced
+    by one time step, hence the game sees the same times however fast the
+    steps are run, and runs are reproducible given the input and the random
+    state.
+
+    With `profile`, the time spent in each of the `SYSTEMS` is accumulated
+    in `timings`, in seconds.
+    """
+
+    def __init__(self, game: Game, time_step: float, ui: Optional[UI]=None, profile: bool=False) -> None:
+        self.game = game
+        self.time_step = time_step
+        self.ui = ui
+        self.steps = 0
+        self.timings: Optional[Dict[str, float]] = dict.fromkeys(SYSTEMS, 0.0) if profile else None
+
+    def step(self):
+        input_update()
+        pause = self.ui is not None and self.ui.update()
+
+        if not pause:
+            tilemap = tilemap_get_active()
+            with batch_changes():
+                self._call('collision', collision_update, tilemap)
+                self._call('movement', movement_update, tilemap)
+                self._call('walk', walk_update, tilemap)
+                self._call('pathfinding', pathfinding_update, tilemap)
+                self._call('tick', self._tick)
+                self._call('actions', self._run_actions)
+
+        clock_get().advance(self.time_step)
+        self.steps += 1
+
+    def run(self, steps: int):
+        for _ in range(steps):
+            self.step()
+
+    def _tick(self):
+        self.game.actions.extend(self.game.scene.tick())
+
+    def _run_actions(self):
+        self.game.actions.run(clock_get_time())
+
+    def _call(self, name: str, func: Callable, *args: Any):
+        if self.timings is None:
+            func(*args)
+        else:
+            start = perf_counter()
+            func(*args)
+            self.timings[name] += perf_counter() - start
+
+
+class StepScheduler:
+    """
+    Converts the elapsed wall clock time into fixed simulation steps.
+
+    Time left over is carried to the next frame, and its fraction of a step
+    is the `alpha` by which rendering interpolates the last two steps. At
+    most `max_steps` steps are run per frame: when falling further behind,
+    the excess time is dropped, so that a slow frame doesn't turn into even
+    slower catch-up frames.
+    """
+
+    def __init__(self, time_step: float, max_steps: int) -> None:
+        self.time_step = time_step
+        self.max_steps = max_steps
+        self.time_acc = 0.0
+
+    @property
+    def alpha(self) -> float:
+        return self.time_acc / self.time_step
+
+    def advance(self, elapsed: float) -> int:
+        """
+        Account for the elapsed seconds, returning the number of steps to run.
+        """
+        self.time_acc += elapsed
+        steps = int(self.time_acc // self.time_step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.time_acc %= self.time_step
+        else:
+            self.time_acc = max(self.time_acc - steps * self.time_step, 0.0)
+        return steps
@@ -0,0 +1,211 @@
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: Occupant id of the tiles with no occupant.
+FREE = -1
+
+
+class TileGrid:
+    """
+    Walkability and occupancy of the tiles of a map, row by row.
+
+    Walkability is kept as one byte per tile, and occupancy as the int32 id
+    of the occupant of each tile, indexing a side table of occupants, or
+    `FREE`. Ids are reused once no tile references their occupant anymore.
+
+    Besides single tile accessors, batched queries over many tiles are
+    provided, for callers to make one call instead of one per tile. They take
+    sequences of columns and rows, which can be NumPy arrays.
+
+    Walkability changes are logged in `walkable_changes`, as tile indices,
+    for the structures derived from it to update themselves incrementally.
+    """
+
+    def __init__(self, width: int, height: int, walkable: bytes) -> None:
+        if len(walkable) != width * height:
+            raise ValueError(f'expected {width * height} walkability values, got {len(walkable)}')
+
+        self.width = width
+        self.height = height
+        self.walkable = bytearray(walkable)
+        self.walkable_changes: List[int] = []
+        self.occupant_ids = array('i', [FREE]) * (width * height)
+        # occupants by id, with the number of tiles referencing them
+        self.occupants: List[Any] = []
+        self._refcounts: List[int] = []
+        self._ids: Dict[Any, int] = {}
+        self._free_ids: List[int] = []
+        self._table: Optional['numpy.ndarray'] = None
+        self._table_changes = 0
+
+    def index(self, col: int, row: int) -> int:
+        """
+        Return the index of a tile in the grid, or -1 if out of bounds.
+        """
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return row * self.width + col
+        return -1
+
+    def is_walkable_at(self, col: int, row: int) -> bool:
+        """
+        Return whether the tile is walkable and not occupied.
+        """
+        index = self.index(col, row)
+        return index >= 0 and self.walkable[index] == 1 and self.occupant_ids[index] == FREE
+
+    def set_walkable_at(self, col: int, row: int, walkable: bool):
+        """
+        Change the walkability of a tile, logging the change.
+        """
+        index = self.index(col, row)
+        if index >= 0 and self.walkable[index] != walkable:
+            self.walkable[index] = walkable
+            self.walkable_changes.append(index)
+
+    def get_occupant_at(self, col: int, row: int) -> Any:
+        index = self.index(col, row)
+        if index < 0:
+            return None
+        occupant_id = self.occupant_ids[index]
+        return None if occupant_id == FREE else self.occupants[occupant_id]
+
+    def set_occupant_at(self, col: int, row: int, occupant: Any):
+        index = self.index(col, row)
+        if index < 0:
+            return
+
+        ids = self.occupant_ids
+        old_id = ids[index]
+        if old_id != FREE:
+            if self.occupants[old_id] is occupant:
+                return
+            self._release(old_id)
+
+        if occupant is None:
+            ids[index] = FREE
+            return
+
+        occupant_id = self._ids.get(occupant)
+        if occupant_id is None:
+            if self._free_ids:
+                occupant_id = self._free_ids.pop()
+                self.occupants[occupant_id] = occupant
+            else:
+                occupant_id = len(self.occupants)
+                self.occupants.append(occupant)
+                self._refcounts.append(0)
+            self._ids[occupant] = occupant_id
+        self._refcounts[occupant_id] += 1
+        ids[index] = occupant_id
+
+    def indices(self, cols: Sequence[int], rows: Sequence[int]) -> List[int]:
+        """
+        Return the index of each tile, or -1 for tiles out of bounds.
+        """
+        width = self.width
+        height = self.height
+        return [
+            row * width + col if 0 <= col < width and 0 <= row < height else -1
+            for col, row in zip(cols, rows)
+        ]
+
+    def are_walkable_at(self, cols: Sequence[int], rows: Sequence[int]) -> Sequence[bool]:
+        """
+        Return for each tile whether it's walkable and not occupied, as a
+        boolean array for NumPy arrays arguments.
+        """
+        if numpy is not None and isinstance(cols, numpy.ndarray):
+            inside, indices = self._array_indices(cols, rows)
+            walkable = numpy.frombuffer(self.walkable, dtype=numpy.uint8)[indices] == 1
+            free = numpy.frombuffer(self.occupant_ids, dtype=numpy.int32)[indices] == FREE
+            return inside & walkable & free
+
+        walkable = self.walkable
+        ids = self.occupant_ids
+        return [
+            index >= 0 and walkable[index] == 1 and ids[index] == FREE
+            for index in self.indices(cols, rows)
+        ]
+
+    def occupants_at(self, cols: Sequence[int], rows: Sequence[int]) -> List[Any]:
+        """
+        Return the occupant of each tile, None for free tiles and tiles out of
+        bounds.
+        """
+        occupants = self.occupants
+        ids = self.occupant_ids
+        result = []
+        for index in self.indices(cols, rows):
+            occupant_id = ids[index] if index >= 0 else FREE
+            result.append(None if occupant_id == FREE else occupants[occupant_id])
+        return result
+
+    def is_area_walkable(self, col0: int, row0: int, col1: int, row1: int) -> bool:
+        """
+        Return whether all the tiles in the given inclusive range are
+        walkable, regardless of their occupants. Areas not entirely within the
+        grid aren't walkable.
+        """
+        if col0 < 0 or row0 < 0 or col1 >= self.width or row1 >= self.height:
+            return False
+        walkable = self.walkable
+        width = self.width
+        for row in range(row0, row1 + 1):
+            start = row * width
+            # scan the whole row span at once
+            if 0 in walkable[start + col0:start + col1 + 1]:
+                return False
+        return True
+
+    def are_areas_walkable(
+            self, cols0: Sequence[int], rows0: Sequence[int],
+            cols1: Sequence[int], rows1: Sequence[int]) -> Sequence[bool]:
+        """
+        Return for each inclusive range of tiles whether it's walkable, as in
+        `is_area_walkable()`, as a boolean array for NumPy arrays arguments.
+
+        With NumPy, all the areas are tested at once, by means of a table of
+        the number of obstacles above and on the left of each tile, which is
+        rebuilt when walkability changes.
+        """
+        if numpy is None or not isinstance(cols0, numpy.ndarray):
+            return [
+                self.is_area_walkable(col0, row0, col1, row1)
+                for col0, row0, col1, row1 in zip(cols0, rows0, cols1, rows1)
+            ]
+
+        inside = (cols0 >= 0) & (rows0 >= 0) & (cols1 < self.width) & (rows1 < self.height)
+        cols0 = numpy.where(inside, cols0, 0)
+        rows0 = numpy.where(inside, rows0, 0)
+        cols1 = numpy.where(inside, cols1, 0) + 1
+        rows1 = numpy.where(inside, rows1, 0) + 1
+        table = self._obstacles_table()
+        obstacles = table[rows1, cols1] - table[rows0, cols1] - table[rows1, cols0] + table[rows0, cols0]
+        return inside & (obstacles == 0)
+
+    def _obstacles_table(self) -> 'numpy.ndarray':
+        if self._table is None or self._table_changes != len(self.walkable_changes):
+            # summed-area table, with a leading row and column of zeros
+            blocked = numpy.frombuffer(self.walkable, dtype=numpy.uint8).reshape(self.height, self.width) == 0
+            table = numpy.zeros((self.height + 1, self.width + 1), dtype=numpy.int32)
+            table[1:, 1:] = blocked.cumsum(axis=0).cumsum(axis=1)
+            self._table = table
+            self._table_changes = len(self.walkable_changes)
+        return self._table
+
+    def _array_indices(self, cols: 'numpy.ndarray', rows: 'numpy.ndarray'):
+        inside = (cols >= 0) & (cols < self.width) & (rows >= 0) & (rows < self.height)
+        indices = numpy.where(inside, rows * self.width + cols, 0)
+        return inside, indices
+
+    def _release(self, occupant_id: int):
+        self._refcounts[occupant_id] -= 1
+        if not self._refcounts[occupant_id]:
+            del self._ids[self.occupants[occupant_id]]
+            self.occupants[occupant_id] = None
+            self._free_ids.append(occupant_id)
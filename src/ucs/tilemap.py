@@ -1,129 +1,143 @@
-from typing import Any, Sequence
-
-import pytmx
-from raylibpy.colors import BLACK, WHITE
-from raylibpy.consts import PIXELFORMAT_UNCOMPRESSED_GRAYSCALE
-from raylibpy.spartan import (gen_image_color, image_draw_pixel, image_format,
-                              load_texture, load_texture_from_image,
-                              unload_image)
+from array import array
+from itertools import chain, compress
+from typing import Any, Dict, List, Sequence, Tuple
 
 from ucs.foundation import Position
-from ucs.gfx import DrawTextureRectCommand, RenderContext, gfx_set_map_params
+from ucs.gfx import (DrawCommand, DrawTextureRectCommand, RenderContext,
+                     gfx_get_view_rect, gfx_load_mask_texture,
+                     gfx_load_texture, gfx_set_map_params)
+from ucs.mapcache import (TILE_STRIDE, MapData, cache_path, read_cache,
+                          write_cache)
+from ucs.tilegrid import TileGrid
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: Size in tiles of the square chunks the static layers are baked into, which
+#: is also the granularity of horizontal view culling.
+CHUNK_SIZE = 8
 
 
 class TileMap:
+    """
+    Tile grid of a level, loaded from a TMX map.
 
-    def __init__(self, filename) -> None:
-        self.textures = {}
-        self.map = pytmx.TiledMap(filename, self._image_loader)
+    The static content of the map is cached in the `ucs.mapcache` format,
+    hence only the first load of a given map parses it. `cache_dir` defaults
+    to a directory next to the map, and `use_cache` can disable the cache.
+    """
+
+    def __init__(self, filename, cache_dir=None, use_cache: bool=True) -> None:
         self.x = 0
         self.y = 0
 
-        try:
-            entry = self.map.objects_by_name['entry']
-            entry_x = entry.x // self.map.tilewidth * self.map.tilewidth
-            entry_y = entry.y // self.map.tileheight * self.map.tileheight
-            self.entry = entry_x, entry_y
-
-        except KeyError:
-            raise ValueError(f'no entry point defined for map {filename}')
-
-        non_walkable_tiles = {
-            k for k, props in self.map.tile_properties.items()
-            if props.get('type') == 'obstacle'
-        }
-
-        # walkability matrix
-        self.walk_matrix = [True] * self.map.width * self.map.height
-
-        # map of occupants for each tile
-        self.occupants = [None] * self.map.width * self.map.height
-
-        # image for foreground mask texture
-        img = gen_image_color(self.map.width, self.map.height, WHITE)
-
-        # iterate over the layers and initialize the walkability matrix and the
-        # foreground mask
-        for row in range(self.map.height):
-            for col in range(self.map.width):
-                for layer in self.map.layers:
-                    if 'meta' in layer.name:
-                        continue
-
-                    tile_id = layer.data[row][col]
-                    tile = self.map.images[tile_id]
-
-                    # draw a black pixel on the mask if there's a tile on the
-                    # foreground layer
-                    if layer.properties.get('foreground', False) and tile is not None:
-                        image_draw_pixel(img, col, row, BLACK)
-
-                    # flag the current cell in the walk matrix as non-walkable
-                    # if the tile id is in the set of non-walkable tiles
-                    if tile_id in non_walkable_tiles:
-                        self.walk_matrix[row * self.map.width + col] = False
-
-        # convert the mask image to 1-byte grayscale format and create a texture
-        # from it for the shader
-        image_format(img, PIXELFORMAT_UNCOMPRESSED_GRAYSCALE)
-        tex = load_texture_from_image(img)
-        unload_image(img)
-        self.foreground_mask_texture = tex
+        data = None
+        if use_cache:
+            path = cache_path(filename, cache_dir)
+            try:
+                data = read_cache(path)
+            except (OSError, ValueError):
+                pass
+
+        if data is None:
+            data = _parse_map(filename)
+            if use_cache:
+                try:
+                    write_cache(path, data)
+                except OSError:
+                    # the cache is just an optimization, read-only locations
+                    # are fine
+                    pass
+
+        self.width = data.width
+        self.height = data.height
+        self.tile_width = data.tile_width
+        self.tile_height = data.tile_height
+        self.entry = data.entry
+        self.textures = [gfx_load_texture(name) for name in data.textures]
+        self.tiles = data.tiles
+
+        # walkability and occupants of the tiles
+        self.grid = TileGrid(self.width, self.height, data.walkable)
+
+        # create the mask texture for the shader
+        self.foreground_mask_texture = gfx_load_mask_texture((self.width, self.height), data.mask)
+
+        # draw commands of the static layers, for each chunk
+        self.chunks_width = -(-self.width // CHUNK_SIZE)
+        self.chunks_height = -(-self.height // CHUNK_SIZE)
+        self.chunks: List[List[List[DrawCommand]]] = []
+        self.bake()
 
     def pixels_to_coords(self, pixels_pos: Position) -> Position:
-        col = int((pixels_pos[0] - self.x) // self.map.tilewidth)
-        row = int((pixels_pos[1] - self.y) // self.map.tileheight)
+        col = int((pixels_pos[0] - self.x) // self.tile_width)
+        row = int((pixels_pos[1] - self.y) // self.tile_height)
         return col, row
 
     def is_walkable_at(self, col, row) -> bool:
-        if col >= 0 and col < self.map.width and row >= 0 and row < self.map.height:
-            index = row * self.map.width + col
-            return self.walk_matrix[index] and not self.occupants[index]
-        return False
+        return self.grid.is_walkable_at(col, row)
 
     def set_occupant_at(self, col: int, row: int, occupant: Any):
-        if col >= 0 and col < self.map.width and row >= 0 and row < self.map.height:
-            self.occupants[row * self.map.width + col] = occupant
+        self.grid.set_occupant_at(col, row, occupant)
 
     def get_occupant_at(self, col: int, row: int) -> Any:
-        if col >= 0 and col < self.map.width and row >= 0 and row < self.map.height:
-            return self.occupants[row * self.map.width + col]
-        return None
+        return self.grid.get_occupant_at(col, row)
 
     def get_nearest_occupants(self, col, row) -> Sequence[Any]:
-        adjacent_coords = [(col - 1, row), (col + 1, row), (col, row - 1), (col, row + 1)]
-        for coord in adjacent_coords:
-            actor = self.get_occupant_at(*coord)
-            if actor is not None:
-                yield actor
+        # left, right, top, bottom
+        cols = (col - 1, col + 1, col, col)
+        rows = (row, row, row - 1, row + 1)
+        return [actor for actor in self.grid.occupants_at(cols, rows) if actor is not None]
+
+    def bake(self):
+        """
+        Build the draw commands of the static layers, once for all frames.
+
+        Commands are split in square chunks of tiles, and each chunk holds
+        one list of commands per tile row, sorted by draw order. Needs to be
+        called again if the map position changes.
+        """
+        tile_width = self.tile_width
+        tile_height = self.tile_height
+
+        self.chunks = [
+            [[] for _ in range(CHUNK_SIZE)]
+            for _ in range(self.chunks_width * self.chunks_height)
+        ]
+
+        tiles = self.tiles
+        for i in range(0, len(tiles), TILE_STRIDE):
+            texture, rect_x, rect_y, rect_w, rect_h, c, r = tiles[i:i + TILE_STRIDE]
+            position = self.x + c * tile_width, self.y + r * tile_height
+            chunk = self.chunks[(r // CHUNK_SIZE) * self.chunks_width + c // CHUNK_SIZE]
+            chunk[r % CHUNK_SIZE].append(DrawTextureRectCommand(
+                r * self.width + c, self.textures[texture], (rect_x, rect_y, rect_w, rect_h), position))
+
+        # the sort is stable, hence tiles of different layers at the same
+        # coordinates are still drawn in layer order
+        for chunk in self.chunks:
+            for commands in chunk:
+                commands.sort(key=lambda cmd: cmd.order)
 
     def draw(self, ctx: RenderContext):
-        tile_width = self.map.tilewidth
-        tile_height = self.map.tileheight
-
-        for layer in self.map.layers:
-            name = layer.name.lower()
-            if any(skip in name for skip in ('meta', 'obstacles')):
-                continue
-
-            for r, row in enumerate(layer.data):
-                y_offset = self.y + r * tile_width
-                for c, col in enumerate(row):
-                    x_offset = self.x + c * tile_height
-                    if self.map.images[col] is not None:
-                        filename, rect, _ = self.map.images[col]
-                        tex = self.textures[filename]
-                        ctx.append(DrawTextureRectCommand(
-                            r * self.map.width + c, tex, rect, (x_offset, y_offset)))
-
-    def _image_loader(self, filename, flags, **kwargs):
-        if filename not in self.textures:
-            self.textures[filename] = load_texture(filename)
-
-        def load(rect=None, flags=None):
-            return filename, rect, flags
-
-        return load
+        # compute the range of tile rows and chunk columns covered by the
+        # camera view
+        view_x, view_y, view_w, view_h = gfx_get_view_rect()
+        chunk_width = self.tile_width * CHUNK_SIZE
+        col0 = max(int((view_x - self.x) // chunk_width), 0)
+        col1 = min(int((view_x + view_w - self.x) // chunk_width), self.chunks_width - 1)
+        row0 = max(int((view_y - self.y) // self.tile_height), 0)
+        row1 = min(int((view_y + view_h - self.y) // self.tile_height), self.height - 1)
+
+        # emitting the rows top to bottom, and the chunks of each row left to
+        # right, yields commands already sorted by draw order
+        for row in range(row0, row1 + 1):
+            first_chunk = (row // CHUNK_SIZE) * self.chunks_width
+            chunk_row = row % CHUNK_SIZE
+            for chunk in self.chunks[first_chunk + col0:first_chunk + col1 + 1]:
+                ctx.extend_sorted(chunk[chunk_row])
 
 
 _active_tilemap: TileMap = None
@@ -135,9 +149,112 @@ def tilemap_set_active(tilemap: TileMap):
 
     gfx_set_map_params(
         tilemap.foreground_mask_texture,
-        (tilemap.map.tilewidth, tilemap.map.tileheight),
-        (tilemap.map.width, tilemap.map.height))
+        (tilemap.tile_width, tilemap.tile_height),
+        (tilemap.width, tilemap.height))
 
 
 def tilemap_get_active() -> TileMap:
     return _active_tilemap
+
+
+def _parse_map(filename) -> MapData:
+    import pytmx
+
+    textures: Dict[str, int] = {}
+
+    def image_loader(filename, flags, **kwargs):
+        if filename not in textures:
+            textures[filename] = len(textures)
+
+        def load(rect=None, flags=None):
+            return textures[filename], rect
+
+        return load
+
+    tmx = pytmx.TiledMap(filename, image_loader)
+    width = tmx.width
+    height = tmx.height
+
+    try:
+        entry = tmx.objects_by_name['entry']
+        entry_x = entry.x // tmx.tilewidth * tmx.tilewidth
+        entry_y = entry.y // tmx.tileheight * tmx.tileheight
+    except KeyError:
+        raise ValueError(f'no entry point defined for map {filename}')
+
+    walkable, mask, tiles = _parse_layers(tmx)
+
+    return MapData(
+        width, height, tmx.tilewidth, tmx.tileheight, (entry_x, entry_y), walkable, mask,
+        list(textures), tiles)
+
+
+def _parse_layers(tmx) -> Tuple[bytes, bytes, array]:
+    """
+    Compute the walkability, the foreground mask and the tile records of the
+    map layers.
+
+    Tile properties are turned into lookup tables indexed by tile id, which
+    are applied to whole layers at once, with NumPy if available.
+    """
+    width = tmx.width
+    area = width * tmx.height
+
+    obstacles = bytearray(len(tmx.images))
+    for tile_id, props in tmx.tile_properties.items():
+        if props.get('type') == 'obstacle':
+            obstacles[tile_id] = 1
+    has_image = bytes(image is not None for image in tmx.images)
+    # texture index and rect of each tile
+    records = [(0, 0, 0, 0, 0) if image is None else (image[0], *image[1]) for image in tmx.images]
+
+    # layers contributing to walkability and foreground mask, and the ones
+    # being drawn
+    layers = [layer for layer in tmx.layers if 'meta' not in layer.name]
+    drawn = [not any(skip in layer.name.lower() for skip in ('meta', 'obstacles')) for layer in layers]
+    foreground = [layer.properties.get('foreground', False) for layer in layers]
+
+    if numpy is not None:
+        walkable = numpy.ones(area, dtype=numpy.uint8)
+        # 1-byte grayscale pixels of the foreground mask texture, all white
+        mask = numpy.full(area, 0xff, dtype=numpy.uint8)
+        obstacles = numpy.frombuffer(obstacles, dtype=numpy.uint8).astype(bool)
+        has_image = numpy.frombuffer(has_image, dtype=numpy.uint8).astype(bool)
+        records = numpy.array(records, dtype=numpy.uint32)
+
+        tiles = []
+        for layer, is_drawn, is_foreground in zip(layers, drawn, foreground):
+            tile_ids = numpy.array(layer.data, dtype=numpy.intp).ravel()
+            walkable[obstacles[tile_ids]] = 0
+            with_image = has_image[tile_ids]
+            if is_foreground:
+                mask[with_image] = 0
+            if is_drawn:
+                indices = numpy.flatnonzero(with_image)
+                tiles.append(numpy.column_stack((
+                    records[tile_ids[indices]],
+                    indices % width,
+                    indices // width,
+                )).astype(numpy.uint32))
+
+        tiles = array('I', numpy.concatenate(tiles).tobytes() if tiles else b'')
+        return walkable.tobytes(), mask.tobytes(), tiles
+
+    walkable = bytearray(b'\x01') * area
+    mask = bytearray(b'\xff') * area
+    tiles = array('I')
+    for layer, is_drawn, is_foreground in zip(layers, drawn, foreground):
+        tile_ids = array('I', chain.from_iterable(layer.data))
+        for i in compress(range(area), map(obstacles.__getitem__, tile_ids)):
+            walkable[i] = 0
+        with_image = list(compress(range(area), map(has_image.__getitem__, tile_ids)))
+        if is_foreground:
+            for i in with_image:
+                mask[i] = 0
+        if is_drawn:
+            for i in with_image:
+                tiles.extend(records[tile_ids[i]])
+                tiles.append(i % width)
+                tiles.append(i // width)
+
+    return walkable, mask, tiles
@@ -1,8 +1,7 @@
-from raylibpy.colors import BLACK, WHITE
-from raylibpy.spartan import (draw_rectangle, draw_text_ex, get_font_default,
-                              get_key_pressed, get_time, measure_text_ex)
-
-from ucs.gfx import DrawCommand, StageID, RenderContext
+from ucs.clock import clock_get_time
+from ucs.gfx import (BLACK, WHITE, DrawCommand, RenderContext, StageID,
+                     gfx_get_backend)
+from ucs.input import input_get_key_pressed
 
 
 MESSAGE_TIMEOUT = 3.0
@@ -18,16 +17,16 @@ class MessageDrawCommand(DrawCommand):
         self.anchor_y = anchor_y
 
     def draw(self):
-        font = get_font_default()
-        tw, th = measure_text_ex(font, self.message, 14.0, 1.0)
+        backend = gfx_get_backend()
+        tw, th = backend.measure_text(self.message, 14.0, 1.0)
         tx = self.anchor_x - tw / 2
         ty = self.anchor_y - th / 2
         rx = tx - 10
         ry = ty - 10
         rw = tw + 20
         rh = th + 10
-        draw_rectangle(rx, ry, rw, rh, WHITE)
-        draw_text_ex(font, self.message, (tx, ty), 14.0, 1.0, BLACK)
+        backend.draw_rect((rx, ry, rw, rh), WHITE)
+        backend.draw_text(self.message, (tx, ty), 14.0, 1.0, BLACK)
 
 
 class UI:
@@ -43,8 +42,8 @@ class UI:
 
     def update(self) -> bool:
         has_message = self.message is not None
-        timeout_elapsed = (get_time() - self.message_show_time) > MESSAGE_TIMEOUT
-        any_key_pressed = get_key_pressed() != 0
+        timeout_elapsed = (clock_get_time() - self.message_show_time) > MESSAGE_TIMEOUT
+        any_key_pressed = input_get_key_pressed() != 0
         if has_message and (timeout_elapsed or any_key_pressed):
             self.message = None
 
@@ -53,7 +52,7 @@ class UI:
 
     def show_message(self, message: str) -> None:
         self.message = message
-        self.message_show_time = get_time()
+        self.message_show_time = clock_get_time()
 
     def draw(self, ctx: RenderContext):
         if self.message is not None: